@@ -0,0 +1,516 @@
+"""Analytics endpoints served from rollups, sketches and the columnar store."""
+
+import asyncio
+import uuid
+from collections import defaultdict
+from datetime import UTC, datetime, time
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import desc, func, null, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.conditional import make_etag, not_modified, set_validators
+from app.api.names import roster_version
+from app.config import settings
+from app.database import VersionedRead, get_versioned_read_db
+from app.models.fairness import FairnessCount
+from app.models.name import Name
+from app.models.roster_snapshot import RosterSnapshot
+from app.models.spin_rollup import (
+    ClientRollupDaily,
+    ClientRollupHourly,
+    SessionRollup,
+    SpinRollupDaily,
+    SpinRollupHourly,
+)
+from app.models.spin_sketch import SpinSketchDaily, SpinSketchHourly
+from app.models.user_agent import UserAgent
+from app.schemas.analytics import (
+    ClientSpinCount,
+    DistinctCounts,
+    DurationPercentiles,
+    FairnessAudit,
+    FairnessReport,
+    NameSelectionCount,
+    NameSelectionStats,
+    SessionStats,
+    SpinHeatmap,
+    VolumeBucket,
+)
+from app.services.columnar import ColumnarSnapshot, columnar_analytics
+from app.services.export import MEDIA_TYPES, ExportFormat, export_query, stream_export
+from app.services.fairness import audit_snapshots, name_fits
+from app.services.rollups import rollup_watermark
+from app.services.sketches import (
+    BucketSketches,
+    compression_for_error,
+    merge_all,
+    precision_for_error,
+)
+
+router = APIRouter(prefix="/api/analytics", tags=["analytics"])
+
+Granularity = Literal["hour", "day"]
+ClientDimension = Literal["browser", "os", "device"]
+
+
+def rollup_range(
+    granularity: Granularity,
+    start: datetime | None,
+    end: datetime | None,
+    hourly=SpinRollupHourly,
+    daily=SpinRollupDaily,
+):
+    """Pick the rollup table and its bucket filters for a time range."""
+    if granularity == "hour":
+        table, bucket = hourly, hourly.bucket_start
+        bounds = (start, end)
+    else:
+        table, bucket = daily, daily.bucket_date
+        bounds = tuple(value.astimezone(UTC).date() if value else None for value in (start, end))
+    
+    filters = []
+    if bounds[0] is not None:
+        filters.append(bucket >= bounds[0])
+    if bounds[1] is not None:
+        filters.append(bucket < bounds[1])
+    return table, bucket, filters
+
+
+async def analytics_etag(read: VersionedRead, *parts) -> str:
+    """ETag for a rollup-backed response under the current rollup watermark.
+    
+    The watermark advances after rollups commit on the primary, so ``read``
+    is told to open its session where those commits are visible.
+    """
+    watermark = await rollup_watermark.current()
+    read.depends_on(("rollups", watermark))
+    return make_etag("analytics", watermark, *parts)
+
+
+def columnar_snapshot() -> ColumnarSnapshot:
+    """The latest columnar snapshot, or 503 while the store is disabled or loading."""
+    if not settings.columnar_analytics:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Columnar analytics is disabled",
+        )
+    if not columnar_analytics.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Columnar analytics is loading",
+            headers={"Retry-After": str(int(settings.columnar_refresh_interval) or 1)},
+        )
+    return columnar_analytics.store.snapshot
+
+
+def columnar_etag(snapshot: ColumnarSnapshot, *parts) -> str:
+    """ETag for a columnar response under the snapshot's size and watermark."""
+    return make_etag("columnar", len(snapshot), snapshot.watermark, *parts)
+
+
+async def load_sketches(
+    db: AsyncSession,
+    granularity: Granularity,
+    start: datetime | None,
+    end: datetime | None,
+    error: float,
+    *,
+    distinct: bool = False,
+    durations: bool = False,
+) -> BucketSketches:
+    """Merge the stored sketches of a range at the accuracy asked for.
+    
+    Only the requested sketch columns are fetched and decoded. Merging cost
+    grows with the number of buckets, so prefer day granularity for ranges
+    spanning months.
+    """
+    table, _, filters = rollup_range(
+        granularity, start, end, SpinSketchHourly, SpinSketchDaily
+    )
+    hll = (table.users, table.ips, table.sessions) if distinct else (null(), null(), null())
+    stmt = select(*hll, table.durations if durations else null()).where(*filters)
+    rows = (await db.execute(stmt)).tuples().all()
+    return await asyncio.to_thread(
+        merge_all,
+        rows,
+        precision_for_error(error, settings.sketch_hll_precision),
+        compression_for_error(error, settings.sketch_digest_compression),
+    )
+
+
+def summed_stats(table) -> list:
+    """Aggregate expressions over the additive rollup columns."""
+    return [
+        func.sum(table.spin_count).label("spin_count"),
+        func.sum(table.duration_count).label("duration_count"),
+        func.sum(table.duration_sum).label("duration_sum"),
+        func.sum(table.duration_sq_sum).label("duration_sq_sum"),
+        func.min(table.duration_min).label("duration_min"),
+        func.max(table.duration_max).label("duration_max"),
+    ]
+
+
+@router.get("/names", response_model=list[NameSelectionStats])
+async def name_selection_stats(
+    request: Request,
+    response: Response,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    granularity: Granularity = "hour",
+    read: VersionedRead = Depends(get_versioned_read_db),
+) -> list[NameSelectionStats] | Response:
+    """Selection counts and spin durations per name."""
+    # Rows carry the current name, so renames must change the tag as well
+    etag = await analytics_etag(read, "names", await roster_version(read), granularity, start, end)
+    cached = not_modified(request, etag, settings.analytics_cache_control)
+    if cached is not None:
+        return cached
+    
+    db = await read.open()
+    table, _, filters = rollup_range(granularity, start, end)
+    total = func.sum(table.spin_count)
+    stmt = (
+        select(table.name_id, Name.name, *summed_stats(table))
+        .outerjoin(Name, Name.id == table.name_id)
+        .where(*filters)
+        .group_by(table.name_id, Name.name)
+        .order_by(desc(total), table.name_id)
+    )
+    rows = (await db.execute(stmt)).mappings()
+    set_validators(response, etag, settings.analytics_cache_control)
+    return [NameSelectionStats.from_sums(**row) for row in rows]
+
+
+@router.get("/volume", response_model=list[VolumeBucket])
+async def spin_volume(
+    request: Request,
+    response: Response,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    granularity: Granularity = "hour",
+    read: VersionedRead = Depends(get_versioned_read_db),
+) -> list[VolumeBucket] | Response:
+    """Spin volume and durations per time bucket."""
+    etag = await analytics_etag(read, "volume", granularity, start, end)
+    cached = not_modified(request, etag, settings.analytics_cache_control)
+    if cached is not None:
+        return cached
+    
+    db = await read.open()
+    table, bucket, filters = rollup_range(granularity, start, end)
+    stmt = (
+        select(bucket.label("bucket"), *summed_stats(table))
+        .where(*filters)
+        .group_by(bucket)
+        .order_by(bucket)
+    )
+    rows = (await db.execute(stmt)).mappings()
+    set_validators(response, etag, settings.analytics_cache_control)
+    return [
+        VolumeBucket.from_sums(bucket_start=_bucket_start(row["bucket"]), **_stats(row))
+        for row in rows
+    ]
+
+
+@router.get("/sessions/{session_id}", response_model=SessionStats)
+async def session_stats(
+    session_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    read: VersionedRead = Depends(get_versioned_read_db),
+) -> SessionStats | Response:
+    """Spin statistics for a single session."""
+    etag = await analytics_etag(read, "session", session_id)
+    cached = not_modified(request, etag, settings.analytics_cache_control)
+    if cached is not None:
+        return cached
+    
+    db = await read.open()
+    rollup = await db.get(SessionRollup, session_id)
+    if rollup is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
+    set_validators(response, etag, settings.analytics_cache_control)
+    return SessionStats.from_sums(
+        rollup.spin_count,
+        rollup.duration_count,
+        rollup.duration_sum,
+        rollup.duration_sq_sum,
+        rollup.duration_min,
+        rollup.duration_max,
+        session_id=rollup.session_id,
+        first_spin_at=rollup.first_spin_at,
+        last_spin_at=rollup.last_spin_at,
+    )
+
+
+@router.get("/selections", response_model=list[NameSelectionCount])
+async def selection_counts(
+    request: Request,
+    response: Response,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    session_id: uuid.UUID | None = None,
+    snapshot: ColumnarSnapshot = Depends(columnar_snapshot),
+    read: VersionedRead = Depends(get_versioned_read_db),
+) -> list[NameSelectionCount] | Response:
+    """Spins per name over an exact time range, from the columnar store."""
+    etag = columnar_etag(
+        snapshot, "selections", await roster_version(read), start, end, session_id
+    )
+    cached = not_modified(request, etag, settings.analytics_cache_control)
+    if cached is not None:
+        return cached
+    
+    counts = await asyncio.to_thread(snapshot.selection_counts, start, end, session_id)
+    labels: dict[uuid.UUID, str] = {}
+    if counts:
+        db = await read.open()
+        stmt = select(Name.id, Name.name).where(Name.id.in_([name_id for name_id, _ in counts]))
+        labels = dict((await db.execute(stmt)).tuples().all())
+    set_validators(response, etag, settings.analytics_cache_control)
+    return [
+        NameSelectionCount(name_id=name_id, name=labels.get(name_id), spin_count=count)
+        for name_id, count in counts
+    ]
+
+
+@router.get("/heatmap", response_model=SpinHeatmap)
+async def spin_heatmap(
+    request: Request,
+    response: Response,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    name_id: uuid.UUID | None = None,
+    snapshot: ColumnarSnapshot = Depends(columnar_snapshot),
+) -> SpinHeatmap | Response:
+    """Spins by UTC weekday and hour of day, from the columnar store."""
+    etag = columnar_etag(snapshot, "heatmap", start, end, name_id)
+    cached = not_modified(request, etag, settings.analytics_cache_control)
+    if cached is not None:
+        return cached
+    
+    counts = await asyncio.to_thread(snapshot.heatmap, start, end, name_id)
+    set_validators(response, etag, settings.analytics_cache_control)
+    return SpinHeatmap(counts=counts.tolist())
+
+
+@router.get("/durations", response_model=DurationPercentiles)
+async def duration_percentiles(
+    request: Request,
+    response: Response,
+    p: list[float] = Query(default=[50.0, 90.0, 99.0]),
+    start: datetime | None = None,
+    end: datetime | None = None,
+    name_id: uuid.UUID | None = None,
+    session_id: uuid.UUID | None = None,
+    snapshot: ColumnarSnapshot = Depends(columnar_snapshot),
+) -> DurationPercentiles | Response:
+    """Spin duration percentiles, from the columnar store."""
+    if not all(0 <= value <= 100 for value in p):
+        raise HTTPException(status_code=422, detail="Percentiles must be between 0 and 100")
+    etag = columnar_etag(snapshot, "durations", p, start, end, name_id, session_id)
+    cached = not_modified(request, etag, settings.analytics_cache_control)
+    if cached is not None:
+        return cached
+    
+    count, values = await asyncio.to_thread(
+        snapshot.duration_percentiles, p, start, end, name_id, session_id
+    )
+    set_validators(response, etag, settings.analytics_cache_control)
+    return DurationPercentiles(duration_count=count, percentiles=p, values_ms=values)
+
+
+@router.get("/distinct", response_model=DistinctCounts)
+async def distinct_counts(
+    request: Request,
+    response: Response,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    granularity: Granularity = "hour",
+    error: float = Query(default=0.01, gt=0, le=0.5, description="Target relative error"),
+    read: VersionedRead = Depends(get_versioned_read_db),
+) -> DistinctCounts | Response:
+    """Approximate distinct users, IPs and sessions from HyperLogLog sketches."""
+    etag = await analytics_etag(read, "distinct", granularity, start, end, error)
+    cached = not_modified(request, etag, settings.analytics_cache_control)
+    if cached is not None:
+        return cached
+    
+    db = await read.open()
+    sketches = await load_sketches(db, granularity, start, end, error, distinct=True)
+    set_validators(response, etag, settings.analytics_cache_control)
+    return DistinctCounts(
+        users=round(sketches.users.count()),
+        ips=round(sketches.ips.count()),
+        sessions=round(sketches.sessions.count()),
+        precision=sketches.users.precision,
+        standard_error=sketches.users.standard_error,
+    )
+
+
+@router.get("/durations/approximate", response_model=DurationPercentiles)
+async def approximate_duration_percentiles(
+    request: Request,
+    response: Response,
+    p: list[float] = Query(default=[50.0, 90.0, 99.0]),
+    start: datetime | None = None,
+    end: datetime | None = None,
+    granularity: Granularity = "hour",
+    error: float = Query(default=0.01, gt=0, le=0.5, description="Target quantile error"),
+    read: VersionedRead = Depends(get_versioned_read_db),
+) -> DurationPercentiles | Response:
+    """Spin duration percentiles from t-digest sketches."""
+    if not all(0 <= value <= 100 for value in p):
+        raise HTTPException(status_code=422, detail="Percentiles must be between 0 and 100")
+    etag = await analytics_etag(read, "durations", granularity, start, end, error, p)
+    cached = not_modified(request, etag, settings.analytics_cache_control)
+    if cached is not None:
+        return cached
+    
+    db = await read.open()
+    digest = (await load_sketches(db, granularity, start, end, error, durations=True)).durations
+    set_validators(response, etag, settings.analytics_cache_control)
+    return DurationPercentiles(
+        duration_count=digest.count,
+        percentiles=p,
+        values_ms=digest.quantiles([value / 100 for value in p]) if digest.count else None,
+    )
+
+
+async def observed_counts(
+    db: AsyncSession, keys: list[str]
+) -> dict[str, dict[uuid.UUID, int]]:
+    """Fairness counters of the given snapshots, by snapshot and name."""
+    stmt = select(
+        FairnessCount.snapshot_key, FairnessCount.name_id, FairnessCount.observed
+    ).where(FairnessCount.snapshot_key.in_(keys))
+    observed: dict[str, dict[uuid.UUID, int]] = defaultdict(dict)
+    for key, name_id, count in (await db.execute(stmt)).tuples():
+        observed[key][name_id] = count
+    return observed
+
+
+@router.get("/fairness", response_model=list[FairnessAudit])
+async def fairness_audits(
+    request: Request,
+    response: Response,
+    limit: int = Query(default=20, ge=1, le=200),
+    read: VersionedRead = Depends(get_versioned_read_db),
+) -> list[FairnessAudit] | Response:
+    """Goodness-of-fit audits of the most recent roster snapshots."""
+    etag = await analytics_etag(read, "fairness", limit)
+    cached = not_modified(request, etag, settings.analytics_cache_control)
+    if cached is not None:
+        return cached
+    
+    db = await read.open()
+    stmt = (
+        select(RosterSnapshot.key, RosterSnapshot.entries)
+        .order_by(desc(RosterSnapshot.created_at), RosterSnapshot.key)
+        .limit(limit)
+    )
+    snapshots = (await db.execute(stmt)).tuples().all()
+    observed = await observed_counts(db, [key for key, _ in snapshots])
+    audits = await asyncio.to_thread(audit_snapshots, snapshots, observed)
+    set_validators(response, etag, settings.analytics_cache_control)
+    return [FairnessAudit.model_validate(audit) for audit in audits]
+
+
+@router.get("/fairness/{snapshot_key}", response_model=FairnessReport)
+async def fairness_report(
+    snapshot_key: str,
+    request: Request,
+    response: Response,
+    read: VersionedRead = Depends(get_versioned_read_db),
+) -> FairnessReport | Response:
+    """Audit of one roster snapshot with observed and expected spins per name."""
+    etag = await analytics_etag(read, "fairness", snapshot_key)
+    cached = not_modified(request, etag, settings.analytics_cache_control)
+    if cached is not None:
+        return cached
+    
+    db = await read.open()
+    snapshot = await db.get(RosterSnapshot, snapshot_key)
+    if snapshot is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Snapshot not found")
+    observed = (await observed_counts(db, [snapshot_key])).get(snapshot_key, {})
+    audit, = audit_snapshots([(snapshot.key, snapshot.entries)], {snapshot_key: observed})
+    set_validators(response, etag, settings.analytics_cache_control)
+    return FairnessReport(
+        **FairnessAudit.model_validate(audit).model_dump(),
+        alpha=settings.fairness_alpha,
+        created_at=snapshot.created_at,
+        fits=name_fits(snapshot.entries, observed),
+    )
+
+
+@router.get("/clients", response_model=list[ClientSpinCount])
+async def client_spin_counts(
+    request: Request,
+    response: Response,
+    by: ClientDimension = "browser",
+    start: datetime | None = None,
+    end: datetime | None = None,
+    granularity: Granularity = "hour",
+    read: VersionedRead = Depends(get_versioned_read_db),
+) -> list[ClientSpinCount] | Response:
+    """Spins per browser, operating system or device class.
+    
+    Summed from the per-agent rollups joined to the agent dimension.
+    Results without an agent id (written before agents were interned, sent
+    without the header or whose interning failed) are counted under a null
+    value, together with agents whose field could not be parsed.
+    """
+    etag = await analytics_etag(read, "clients", by, granularity, start, end)
+    cached = not_modified(request, etag, settings.analytics_cache_control)
+    if cached is not None:
+        return cached
+    
+    db = await read.open()
+    table, _, filters = rollup_range(
+        granularity, start, end, ClientRollupHourly, ClientRollupDaily
+    )
+    value = getattr(UserAgent, by)
+    total = func.sum(table.spin_count)
+    stmt = (
+        select(value, total)
+        .select_from(table)
+        .outerjoin(UserAgent, UserAgent.id == table.user_agent_id)
+        .where(*filters)
+        .group_by(value)
+        .order_by(desc(total), value)
+    )
+    rows = (await db.execute(stmt)).tuples().all()
+    set_validators(response, etag, settings.analytics_cache_control)
+    return [ClientSpinCount(value=label, spin_count=int(count)) for label, count in rows]
+
+
+@router.get("/export")
+async def export_results(
+    format: ExportFormat = "csv",
+    start: datetime | None = None,
+    end: datetime | None = None,
+    session_id: uuid.UUID | None = None,
+) -> StreamingResponse:
+    """Stream game history as CSV or NDJSON with constant memory."""
+    stmt = export_query(start=start, end=end, session_id=session_id)
+    return StreamingResponse(
+        stream_export(stmt, format),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="game_results.{format}"'
+        },
+    )
+
+
+def _stats(row) -> dict:
+    return {key: value for key, value in row.items() if key != "bucket"}
+
+
+def _bucket_start(bucket) -> datetime:
+    if isinstance(bucket, datetime):
+        return bucket
+    return datetime.combine(bucket, time.min, tzinfo=UTC)
@@ -0,0 +1,157 @@
+"""Registration, login and the authenticated-user dependencies."""
+
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer, OAuth2PasswordRequestForm
+from sqlalchemy import Select, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.models.user import User
+from app.schemas.auth import Token, UserCreate, UserRead
+from app.services.auth import (
+    AuthenticatedUser,
+    HashingBusy,
+    InvalidToken,
+    create_access_token,
+    decode_access_token,
+    password_hasher,
+    token_cache,
+)
+
+router = APIRouter(prefix="/api/auth", tags=["auth"])
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+HASHING_RETRY_AFTER = "1"
+
+# Verified against when the username is unknown, so response time does not
+# reveal which usernames exist
+_dummy_hash: str | None = None
+
+
+def unauthorized(detail: str = "Could not validate credentials") -> HTTPException:
+    """401 response asking for a bearer token."""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def hashing_busy() -> HTTPException:
+    """503 response for a saturated password hashing pool."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many concurrent logins, try again shortly",
+        headers={"Retry-After": HASHING_RETRY_AFTER},
+    )
+
+
+def user_query(user_id: uuid.UUID) -> Select:
+    """Columns of a user needed to authorize a request."""
+    return select(User.id, User.username, User.role, User.is_active).where(User.id == user_id)
+
+
+async def resolve_token(token: str, db: AsyncSession) -> AuthenticatedUser:
+    """User for a bearer token, verifying and looking it up only on a cache miss."""
+    user = token_cache.get(token)
+    if user is not None:
+        return user
+    
+    try:
+        user_id, expires_at = decode_access_token(token)
+    except InvalidToken as exc:
+        raise unauthorized() from exc
+    row = (await db.execute(user_query(user_id))).first()
+    if row is None or not row.is_active:
+        raise unauthorized()
+    
+    user = AuthenticatedUser(id=row.id, username=row.username, role=row.role, is_active=True)
+    token_cache.put(token, user, expires_at)
+    return user
+
+
+async def get_optional_user(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> AuthenticatedUser | None:
+    """The authenticated user, or None for anonymous requests."""
+    if credentials is None:
+        return None
+    return await resolve_token(credentials.credentials, db)
+
+
+async def get_current_user(
+    user: AuthenticatedUser | None = Depends(get_optional_user),
+) -> AuthenticatedUser:
+    """The authenticated user; anonymous requests are rejected."""
+    if user is None:
+        raise unauthorized("Not authenticated")
+    return user
+
+
+@router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
+async def register(payload: UserCreate, db: AsyncSession = Depends(get_db)) -> User:
+    """Create a user account."""
+    try:
+        password_hash = await password_hasher.hash(payload.password)
+    except HashingBusy as exc:
+        raise hashing_busy() from exc
+    try:
+        user = User(username=payload.username, email=payload.email, password_hash=password_hash)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    db.add(user)
+    try:
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Username or email already registered"
+        ) from exc
+    await db.refresh(user)
+    return user
+
+
+@router.post("/token", response_model=Token)
+async def login(
+    form: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_db),
+) -> Token:
+    """Exchange a username and password for an access token."""
+    global _dummy_hash
+    user = await db.scalar(select(User).where(User.username == form.username))
+    try:
+        if user is None:
+            if _dummy_hash is None:
+                _dummy_hash = await password_hasher.hash("not a real password")
+            await password_hasher.verify(form.password, _dummy_hash)
+            raise unauthorized("Incorrect username or password")
+        valid, new_hash = await password_hasher.verify(form.password, user.password_hash)
+    except HashingBusy as exc:
+        raise hashing_busy() from exc
+    if not valid or not user.is_active:
+        raise unauthorized("Incorrect username or password")
+    if new_hash is not None:
+        # Upgrade hashes made with an outdated scheme or cost
+        user.password_hash = new_hash
+        await db.commit()
+    
+    token, expires_at = create_access_token(user.id)
+    return Token(access_token=token, expires_at=expires_at)
+
+
+@router.get("/me", response_model=UserRead)
+async def read_me(
+    current: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """The authenticated user's account."""
+    user = await db.get(User, current.id)
+    if user is None:
+        token_cache.invalidate_user(current.id)
+        raise unauthorized()
+    return user
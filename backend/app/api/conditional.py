@@ -0,0 +1,48 @@
+"""Conditional GET: strong ETags from cheap version counters and 304 responses."""
+
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag identifying a representation by the values it depends on.
+    
+    Callers pass a data version (roster version, rollup watermark) together
+    with every parameter that shapes the response, so the tag is known
+    before any query runs.
+    """
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=16)
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header covers ``etag``.
+    
+    If-None-Match uses weak comparison, so a ``W/`` prefix added by a proxy
+    still matches.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def set_validators(response: Response, etag: str, cache_control: str) -> Response:
+    """Attach the ETag and Cache-Control headers to a response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return response
+
+
+def not_modified(request: Request, etag: str, cache_control: str) -> Response | None:
+    """A 304 response if the client already holds ``etag``, else None."""
+    if not etag_matches(request.headers.get("if-none-match"), etag):
+        return None
+    return set_validators(
+        Response(status_code=status.HTTP_304_NOT_MODIFIED), etag, cache_control
+    )
@@ -0,0 +1,252 @@
+"""Name management endpoints."""
+
+import uuid
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from sqlalchemy import Select, delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.conditional import make_etag, not_modified, set_validators
+from app.api.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    Page,
+    keyset_paginate,
+    page_from_rows,
+)
+from app.config import settings
+from app.database import VersionedRead, get_db, get_versioned_read_db
+from app.models.name import Name
+from app.schemas.name import (
+    NameCreate,
+    NameImportError,
+    NameImportResult,
+    NameRead,
+    NameUpdate,
+)
+from app.serialization import page_response
+from app.services.broadcast import WHEEL_CHANNEL, hub
+from app.services.name_import import (
+    ConflictMode,
+    ImportFileError,
+    detect_format,
+    parse_csv,
+    parse_json,
+    upsert_names,
+    validate_rows,
+)
+from app.services.roster import roster_cache
+
+router = APIRouter(prefix="/api/names", tags=["names"])
+
+LISTING_COLUMNS = (
+    Name.id,
+    Name.name,
+    Name.description,
+    Name.is_active,
+    Name.weight,
+    Name.created_by,
+    Name.created_at,
+    Name.updated_at,
+)
+
+# Labels match NameRead, so rows can be serialized without the model
+LISTING_FIELDS = tuple(column.key for column in LISTING_COLUMNS)
+
+
+async def get_name_or_404(db: AsyncSession, name_id: uuid.UUID) -> Name:
+    """Load a name by id or raise 404."""
+    name = await db.get(Name, name_id)
+    if name is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Name not found")
+    return name
+
+
+async def commit_roster_change(db: AsyncSession, name: Name | None = None) -> None:
+    """Commit a change to the names table and publish a new roster version."""
+    try:
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="A name with this name already exists"
+        ) from exc
+    version = await roster_cache.bump()
+    await hub.publish([WHEEL_CHANNEL], {"type": "roster_changed", "version": version})
+    if name is not None:
+        await db.refresh(name)
+
+
+def apply_changes(name: Name, changes: dict) -> None:
+    """Assign fields through the model validators, mapping errors to 422."""
+    try:
+        for field, value in changes.items():
+            setattr(name, field, value)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=422, detail=str(exc)
+        ) from exc
+
+
+def names_query(active: bool | None, cursor: str | None, limit: int) -> Select:
+    """One page of the name listing as plain rows."""
+    stmt = select(*LISTING_COLUMNS)
+    if active is not None:
+        stmt = stmt.where(Name.is_active.is_(active))
+    return keyset_paginate(stmt, Name.created_at, Name.id, cursor, limit)
+
+
+async def roster_version(read: VersionedRead) -> int:
+    """Latest roster version, recorded on ``read``.
+    
+    Every write to the names table bumps the version after committing, so
+    it is re-read rather than taken from the worker's cache: a cached
+    version could revalidate a response the write already changed.
+    """
+    version = await roster_cache.current_version(fresh=True)
+    read.depends_on(("names", version))
+    return version
+
+
+async def roster_etag(read: VersionedRead, *parts) -> str:
+    """ETag for a names response under the current roster version."""
+    return make_etag("names", await roster_version(read), *parts)
+
+
+@router.get("", response_model=Page[NameRead])
+async def list_names(
+    request: Request,
+    active: bool | None = None,
+    cursor: str | None = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    read: VersionedRead = Depends(get_versioned_read_db),
+) -> Response:
+    """List names oldest first, optionally filtered by active status."""
+    etag = await roster_etag(read, active, cursor, limit)
+    cached = not_modified(request, etag, settings.names_cache_control)
+    if cached is not None:
+        return cached
+    
+    db = await read.open()
+    stmt = names_query(active, cursor, limit)
+    rows, next_cursor = page_from_rows(list(await db.execute(stmt)), limit)
+    return set_validators(
+        page_response(LISTING_FIELDS, rows, next_cursor), etag, settings.names_cache_control
+    )
+
+
+@router.post("", response_model=NameRead, status_code=status.HTTP_201_CREATED)
+async def create_name(payload: NameCreate, db: AsyncSession = Depends(get_db)) -> Name:
+    """Create a name."""
+    name = Name()
+    apply_changes(name, payload.model_dump())
+    db.add(name)
+    await commit_roster_change(db, name)
+    return name
+
+
+@router.post("/import", response_model=NameImportResult)
+async def import_names(
+    file: UploadFile = File(description="CSV with a header row, or a JSON array"),
+    on_conflict: ConflictMode = "update",
+    db: AsyncSession = Depends(get_db),
+) -> NameImportResult:
+    """Create or update names in bulk, reporting invalid rows individually.
+    
+    Names match existing ones ignoring case. With ``on_conflict=update`` the
+    columns present in the upload overwrite the existing values; with
+    ``skip`` existing names are left untouched.
+    """
+    data = await file.read(settings.max_import_bytes + 1)
+    if len(data) > settings.max_import_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Upload exceeds {settings.max_import_bytes} bytes",
+        )
+    try:
+        fmt = detect_format(file.filename, file.content_type)
+        raw_rows, fields = parse_csv(data) if fmt == "csv" else parse_json(data)
+    except ImportFileError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    if len(raw_rows) > settings.max_import_rows:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Upload exceeds {settings.max_import_rows} rows",
+        )
+    
+    batch = validate_rows(raw_rows, fields)
+    counts = await upsert_names(db, batch.rows, batch.fields, on_conflict)
+    if counts.inserted or counts.updated:
+        await commit_roster_change(db)
+    return NameImportResult(
+        received=batch.received,
+        inserted=counts.inserted,
+        updated=counts.updated,
+        unchanged=len(batch.rows) - counts.inserted - counts.updated,
+        duplicates=batch.duplicates,
+        errors=[
+            NameImportError(row=error.row, name=error.name, error=error.error)
+            for error in batch.errors
+        ],
+    )
+
+
+@router.get("/{name_id}", response_model=NameRead)
+async def get_name(
+    name_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    read: VersionedRead = Depends(get_versioned_read_db),
+) -> Name | Response:
+    """Get a single name."""
+    etag = await roster_etag(read, name_id)
+    cached = not_modified(request, etag, settings.names_cache_control)
+    if cached is not None:
+        return cached
+    
+    name = await get_name_or_404(await read.open(), name_id)
+    set_validators(response, etag, settings.names_cache_control)
+    return name
+
+
+@router.patch("/{name_id}", response_model=NameRead)
+async def update_name(
+    name_id: uuid.UUID, payload: NameUpdate, db: AsyncSession = Depends(get_db)
+) -> Name:
+    """Update a name's fields."""
+    name = await get_name_or_404(db, name_id)
+    apply_changes(name, payload.model_dump(exclude_unset=True))
+    await commit_roster_change(db, name)
+    return name
+
+
+@router.post("/{name_id}/toggle", response_model=NameRead)
+async def toggle_name(name_id: uuid.UUID, db: AsyncSession = Depends(get_db)) -> Name:
+    """Flip a name between active and inactive."""
+    name = await get_name_or_404(db, name_id)
+    name.is_active = not name.is_active
+    await commit_roster_change(db, name)
+    return name
+
+
+@router.delete("/{name_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_name(name_id: uuid.UUID, db: AsyncSession = Depends(get_db)) -> Response:
+    """Delete a name; past results keep their snapshot and lose the reference."""
+    # Core delete lets the FK's ON DELETE SET NULL handle game results instead
+    # of the ORM loading every related result row.
+    result = await db.execute(delete(Name).where(Name.id == name_id))
+    if result.rowcount == 0:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Name not found")
+    await commit_roster_change(db)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,75 @@
+"""Keyset pagination over (created_at, id)."""
+
+import base64
+import binascii
+import uuid
+from datetime import datetime
+from typing import Any, Generic, TypeVar
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import Select, tuple_
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class Page(BaseModel, Generic[T]):
+    """One page of results plus the cursor for the next page."""
+    
+    items: list[T]
+    next_cursor: str | None = None
+
+
+def encode_cursor(created_at: datetime, id_: uuid.UUID) -> str:
+    """Opaque cursor pointing just past the given row."""
+    raw = f"{created_at.isoformat()}|{id_}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Parse a cursor produced by ``encode_cursor``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id_ = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(id_)
+    except (ValueError, binascii.Error, UnicodeDecodeError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        ) from exc
+
+
+def keyset_paginate(
+    stmt: Select,
+    created_at_column: Any,
+    id_column: Any,
+    cursor: str | None,
+    limit: int,
+    descending: bool = False,
+) -> Select:
+    """Order by (created_at, id) and seek past the cursor.
+    
+    The row-value comparison lets PostgreSQL walk a composite index on
+    (..., created_at, id) directly, so every page costs the same as the first.
+    One extra row is fetched to tell whether another page exists.
+    """
+    key = tuple_(created_at_column, id_column)
+    if cursor is not None:
+        position = tuple_(*decode_cursor(cursor))
+        stmt = stmt.where(key < position if descending else key > position)
+    if descending:
+        stmt = stmt.order_by(created_at_column.desc(), id_column.desc())
+    else:
+        stmt = stmt.order_by(created_at_column, id_column)
+    return stmt.limit(limit + 1)
+
+
+def page_from_rows(rows: list[Any], limit: int) -> tuple[list[Any], str | None]:
+    """Trim the look-ahead row and build the next cursor."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
@@ -0,0 +1,63 @@
+"""Spin history endpoints."""
+
+import uuid
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    Page,
+    keyset_paginate,
+    page_from_rows,
+)
+from app.database import get_read_db
+from app.models.game_result import GameResult
+from app.schemas.game_result import GameResultRead
+from app.serialization import page_response
+
+router = APIRouter(prefix="/api/results", tags=["results"])
+
+HISTORY_COLUMNS = (
+    GameResult.id,
+    GameResult.session_id,
+    GameResult.selected_name_id,
+    GameResult.selected_name_snapshot["name"].astext.label("selected_name"),
+    GameResult.roster_snapshot_key,
+    GameResult.spin_duration_ms,
+    GameResult.spin_mode,
+    GameResult.created_at,
+)
+
+# Labels match GameResultRead, so rows can be serialized without the model
+HISTORY_FIELDS = tuple(column.key for column in HISTORY_COLUMNS)
+
+
+def history_query(
+    session_id: uuid.UUID | None, name_id: uuid.UUID | None, cursor: str | None, limit: int
+) -> Select:
+    """One page of spin history, newest first."""
+    stmt = select(*HISTORY_COLUMNS)
+    if session_id is not None:
+        stmt = stmt.where(GameResult.session_id == session_id)
+    if name_id is not None:
+        stmt = stmt.where(GameResult.selected_name_id == name_id)
+    return keyset_paginate(
+        stmt, GameResult.created_at, GameResult.id, cursor, limit, descending=True
+    )
+
+
+@router.get("", response_model=Page[GameResultRead])
+async def list_results(
+    session_id: uuid.UUID | None = None,
+    name_id: uuid.UUID | None = None,
+    cursor: str | None = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """List spin history newest first, by session or selected name."""
+    stmt = history_query(session_id, name_id, cursor, limit)
+    rows, next_cursor = page_from_rows(list(await db.execute(stmt)), limit)
+    return page_response(HISTORY_FIELDS, rows, next_cursor)
@@ -0,0 +1,200 @@
+"""Spin endpoints."""
+
+import uuid
+from datetime import UTC, datetime
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.auth import get_optional_user
+from app.database import get_db
+from app.schemas.spin import (
+    BatchSpinRequest,
+    BatchSpinResponse,
+    NameTally,
+    SelectedName,
+    SpinRequest,
+    SpinResponse,
+)
+from app.services.auth import AuthenticatedUser
+from app.services.broadcast import WHEEL_CHANNEL, hub, session_channel
+from app.services.elimination import (
+    ELIMINATION_MODE,
+    EliminationExhausted,
+    elimination_store,
+)
+from app.services.result_writer import (
+    ResultRecord,
+    build_result_record,
+    commit_results,
+    copy_results,
+    result_writer,
+)
+from app.services.rollups import RECORD_CREATED_AT
+from app.services.roster import Roster, RosterEntry, roster_cache
+from app.services.user_agents import user_agent_cache
+
+router = APIRouter(prefix="/api/spin", tags=["spin"])
+
+
+async def get_active_roster(db: AsyncSession) -> Roster:
+    """Load the active roster, rejecting spins when it is empty."""
+    roster = await roster_cache.get(db)
+    if len(roster) == 0:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="No active names available",
+        )
+    return roster
+
+
+async def client_info(request: Request) -> tuple[str | None, int | None]:
+    """Client IP and the id of the normalized user agent for analytics."""
+    return (
+        request.client.host if request.client else None,
+        await user_agent_cache.intern(request.headers.get("user-agent")),
+    )
+
+
+@router.post("", response_model=SpinResponse, status_code=status.HTTP_201_CREATED)
+async def spin(
+    payload: SpinRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    user: AuthenticatedUser | None = Depends(get_optional_user),
+) -> SpinResponse:
+    """Spin the wheel once over the active roster."""
+    roster = await get_active_roster(db)
+    user_ip, user_agent_id = await client_info(request)
+    
+    def make_record(entry: RosterEntry, created_at: datetime) -> ResultRecord:
+        return build_result_record(
+            session_id=payload.session_id,
+            selected_name_id=entry.id,
+            selected_name_snapshot=entry.snapshot(),
+            roster_snapshot_key=roster.snapshot_key,
+            spin_duration_ms=payload.spin_duration_ms,
+            user_id=user.id if user else None,
+            user_ip=user_ip,
+            user_agent_id=user_agent_id,
+            spin_mode=payload.mode,
+            created_at=created_at,
+        )
+    
+    remaining = None
+    if payload.mode == ELIMINATION_MODE:
+        records: list[ResultRecord] = []
+        
+        async def persist(entry: RosterEntry, picked_at: datetime) -> None:
+            # Written synchronously, on the connection holding the session
+            # lock: recovering the session replays these rows
+            records.append(make_record(entry, picked_at))
+            await commit_results(db, records)
+        
+        try:
+            entry, remaining = await elimination_store.draw(
+                db, payload.session_id, roster, persist
+            )
+        except EliminationExhausted as exc:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="All names have been eliminated; reset the session to start over",
+            ) from exc
+        record = records[0]
+    else:
+        entry = roster.spin()
+        record = make_record(entry, datetime.now(UTC))
+        # Persisted asynchronously by the write-behind buffer
+        await result_writer.submit(record)
+    
+    response = SpinResponse(
+        id=record[0],
+        session_id=payload.session_id,
+        selected=SelectedName(id=entry.id, name=entry.name, weight=entry.weight),
+        roster_size=len(roster),
+        mode=payload.mode,
+        remaining=remaining,
+        created_at=record[RECORD_CREATED_AT],
+    )
+    await hub.publish(
+        [WHEEL_CHANNEL, session_channel(payload.session_id)],
+        {"type": "spin", **response.model_dump(mode="json")},
+    )
+    return response
+
+
+@router.delete(
+    "/sessions/{session_id}/elimination", status_code=status.HTTP_204_NO_CONTENT
+)
+async def reset_elimination(
+    session_id: uuid.UUID, db: AsyncSession = Depends(get_db)
+) -> Response:
+    """Put every eliminated name of a session back into play."""
+    await elimination_store.reset(db, session_id)
+    await hub.publish(
+        [session_channel(session_id)],
+        {"type": "elimination_reset", "session_id": session_id},
+    )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.post(
+    "/batch", response_model=BatchSpinResponse, status_code=status.HTTP_201_CREATED
+)
+async def spin_batch(
+    payload: BatchSpinRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    user: AuthenticatedUser | None = Depends(get_optional_user),
+) -> BatchSpinResponse:
+    """Spin the wheel many times and persist every result with one COPY."""
+    roster = await get_active_roster(db)
+    picks = roster.spin_many(payload.count)
+    snapshots = roster.snapshot()
+    user_ip, user_agent_id = await client_info(request)
+    now = datetime.now(UTC)
+    
+    # Inputs were validated by the request schema and snapshots come from the
+    # roster itself, so the rows go straight to COPY without building
+    # GameResult objects or running their per-instance validators.
+    records = [
+        build_result_record(
+            session_id=payload.session_id,
+            selected_name_id=roster.entries[index].id,
+            selected_name_snapshot=snapshots[index],
+            roster_snapshot_key=roster.snapshot_key,
+            spin_duration_ms=payload.spin_duration_ms,
+            user_id=user.id if user else None,
+            user_ip=user_ip,
+            user_agent_id=user_agent_id,
+            created_at=now,
+        )
+        for index in picks.tolist()
+    ]
+    await copy_results(records)
+    
+    counts = np.bincount(picks, minlength=len(roster))
+    tallies = [
+        NameTally(id=entry.id, name=entry.name, weight=entry.weight, count=count)
+        for entry, count in zip(roster.entries, counts.tolist(), strict=True)
+        if count
+    ]
+    await hub.publish(
+        [WHEEL_CHANNEL, session_channel(payload.session_id)],
+        {
+            "type": "batch_spin",
+            "session_id": payload.session_id,
+            "count": payload.count,
+            "tallies": [tally.model_dump(mode="json") for tally in tallies],
+            "created_at": now,
+        },
+    )
+    return BatchSpinResponse(
+        session_id=payload.session_id,
+        count=payload.count,
+        roster_size=len(roster),
+        selected_name_ids=[roster.entries[index].id for index in picks.tolist()],
+        tallies=tallies,
+        created_at=now,
+    )
@@ -0,0 +1,41 @@
+"""WebSocket endpoints for live spin and roster events."""
+
+import asyncio
+import uuid
+
+from fastapi import APIRouter, WebSocket
+
+from app.services.broadcast import WHEEL_CHANNEL, Subscriber, hub, session_channel
+
+router = APIRouter(prefix="/ws", tags=["websocket"])
+
+
+async def serve_channel(websocket: WebSocket, channel: str) -> None:
+    """Stream a channel's events to one client until either side stops."""
+    await websocket.accept()
+    subscriber = Subscriber()
+    hub.subscribe(channel, subscriber)
+    sender = asyncio.create_task(subscriber.pump(websocket))
+    try:
+        # Client frames are ignored; reading them is how disconnects surface,
+        # including the close handshake after a slow consumer is dropped.
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+    finally:
+        hub.unsubscribe(channel, subscriber)
+        sender.cancel()
+        await asyncio.gather(sender, return_exceptions=True)
+
+
+@router.websocket("/wheel")
+async def wheel_events(websocket: WebSocket) -> None:
+    """All spins and roster changes."""
+    await serve_channel(websocket, WHEEL_CHANNEL)
+
+
+@router.websocket("/sessions/{session_id}")
+async def session_events(websocket: WebSocket, session_id: uuid.UUID) -> None:
+    """Spins of a single game session."""
+    await serve_channel(websocket, session_channel(session_id))
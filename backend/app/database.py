@@ -1,18 +1,126 @@
 """Database connection and session management."""
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import declarative_base
-from sqlalchemy.pool import NullPool
+import itertools
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 from typing import AsyncGenerator
 
 from app.config import settings
+from app.metrics import Counter, Gauge, Histogram, request_db_time
+from app.models.base import Base
+
+POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection.",
+    ["pool"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts",
+    "Checkouts that gave up after pool_timeout.",
+    ["pool"],
+)
+POOL_IN_USE = Gauge("db_pool_connections_in_use", "Connections checked out.", ["pool"])
+POOL_IDLE = Gauge("db_pool_connections_idle", "Connections idle in the pool.", ["pool"])
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Connections open beyond pool_size (negative when below).", ["pool"]
+)
+STATEMENT_SECONDS = Histogram(
+    "db_statement_duration_seconds",
+    "Statement execution latency by statement type.",
+    ["pool", "statement"],
+)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long checkouts wait."""
+    
+    metrics_label = "primary"
+    
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.inc(pool=self.metrics_label)
+            raise
+        finally:
+            POOL_CHECKOUT_SECONDS.observe(
+                time.perf_counter() - start, pool=self.metrics_label
+            )
+
+
+def engine_options(url: str) -> dict[str, Any]:
+    """Pool and driver options from settings for an engine on ``url``."""
+    if "sqlite" in url:
+        return {"poolclass": NullPool}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "connect_args": {
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+        },
+    }
+
+
+def statement_type(statement: str) -> str:
+    """Leading SQL keyword, used as a low-cardinality statement label."""
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    if keyword in {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}:
+        return keyword
+    return "OTHER"
+
+
+def instrument_engine(target: AsyncEngine, label: str) -> AsyncEngine:
+    """Attach pool gauges and statement timing to an engine."""
+    pool = target.sync_engine.pool
+    if isinstance(pool, InstrumentedQueuePool):
+        pool.metrics_label = label
+        POOL_IN_USE.set_function(pool.checkedout, pool=label)
+        POOL_IDLE.set_function(pool.checkedin, pool=label)
+        POOL_OVERFLOW.set_function(pool.overflow, pool=label)
+    
+    @event.listens_for(target.sync_engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("statement_start", []).append(time.perf_counter())
+    
+    @event.listens_for(target.sync_engine, "after_cursor_execute")
+    def _record_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+        elapsed = time.perf_counter() - conn.info["statement_start"].pop()
+        STATEMENT_SECONDS.observe(elapsed, pool=label, statement=statement_type(statement))
+        db_time = request_db_time.get()
+        if db_time is not None:
+            db_time.append(elapsed)
+    
+    @event.listens_for(target.sync_engine, "handle_error")
+    def _discard_timer(context) -> None:
+        connection = context.connection
+        if connection is not None and connection.info.get("statement_start"):
+            connection.info["statement_start"].pop()
+    
+    return target
+
 
 # Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    poolclass=NullPool if "sqlite" in settings.database_url else None,
-    pool_pre_ping=True,
+engine = instrument_engine(
+    create_async_engine(
+        settings.database_url,
+        echo=settings.debug,
+        pool_pre_ping=True,
+        **engine_options(settings.database_url),
+    ),
+    "primary",
 )
 
 # Create async session factory
@@ -20,10 +128,156 @@ AsyncSessionLocal = async_sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
-# Create declarative base
-Base = declarative_base()
+# Read-only sessions run in autocommit mode: no BEGIN/COMMIT round trips,
+# and nothing to roll back when the connection returns to the pool.
+ReadSessionLocal = async_sessionmaker(class_=AsyncSession, expire_on_commit=False)
+
+CONNECTION_ERRORS = (OperationalError, InterfaceError, OSError)
+
+# WAL positions in bytes; a server out of recovery has replayed everything
+PRIMARY_WAL_POSITION = text("SELECT (pg_current_wal_lsn() - '0/0'::pg_lsn)::bigint")
+REPLAYED_WAL_POSITION = text(
+    "SELECT (CASE WHEN pg_is_in_recovery() THEN pg_last_wal_replay_lsn() "
+    "ELSE pg_current_wal_lsn() END - '0/0'::pg_lsn)::bigint"
+)
+
+# Versions seen recently enough that concurrent requests may still ask for them
+MAX_VERSION_FENCES = 64
+
+
+class ReplicaRouter:
+    """Round-robin over read replicas, ejecting ones that fail.
+    
+    A replica that raises a connection error is skipped for
+    ``ejection_seconds``. When no replica is healthy (or none are
+    configured) reads fall back to the primary.
+    """
+    
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: list[AsyncEngine],
+        ejection_seconds: float = settings.replica_ejection_seconds,
+    ) -> None:
+        self.primary = primary.execution_options(isolation_level="AUTOCOMMIT")
+        self.replicas = replicas
+        self._ejection_seconds = ejection_seconds
+        self._ejected_until: dict[int, float] = {}
+        self._cycle = itertools.cycle(range(len(replicas)))
+        self._fences: dict[Any, int] = {}
+        self._replayed: dict[int, int] = {}
+    
+    def healthy_replicas(self) -> list[AsyncEngine]:
+        """Replicas currently eligible for reads."""
+        now = time.monotonic()
+        return [
+            replica for index, replica in enumerate(self.replicas)
+            if self._ejected_until.get(index, 0.0) <= now
+        ]
+    
+    def choose(self) -> AsyncEngine:
+        """Next healthy replica, or the primary if none are available."""
+        now = time.monotonic()
+        for _ in range(len(self.replicas)):
+            index = next(self._cycle)
+            if self._ejected_until.get(index, 0.0) <= now:
+                return self.replicas[index]
+        return self.primary
+    
+    def eject(self, replica: AsyncEngine) -> None:
+        """Take a failing replica out of rotation for a while."""
+        for index, candidate in enumerate(self.replicas):
+            if candidate is replica:
+                self._ejected_until[index] = time.monotonic() + self._ejection_seconds
+    
+    async def choose_after(self, versions: Any) -> AsyncEngine:
+        """Healthy replica holding every commit behind ``versions``, else the primary.
+        
+        ``versions`` are counters bumped after the primary commits (roster
+        version, rollup watermark), read before calling. The primary's WAL
+        position taken after first seeing them bounds those commits, so a
+        replica that has replayed up to it serves rows at least as new as
+        the versions. Both positions are cached: versions only change with
+        the data, and a replica never replays backwards.
+        """
+        fence = None
+        for _ in range(len(self.replicas)):
+            target = self.choose()
+            if target is self.primary:
+                break
+            if fence is None:
+                fence = await self._fence(versions)
+            if await self._replayed_to(target, fence):
+                return target
+        return self.primary
+    
+    async def _fence(self, versions: Any) -> int:
+        fence = self._fences.get(versions)
+        if fence is None:
+            fence = await self._wal_position(self.primary, PRIMARY_WAL_POSITION)
+            if len(self._fences) >= MAX_VERSION_FENCES:
+                del self._fences[next(iter(self._fences))]
+            self._fences[versions] = fence
+        return fence
+    
+    async def _replayed_to(self, replica: AsyncEngine, fence: int) -> bool:
+        index = next(i for i, candidate in enumerate(self.replicas) if candidate is replica)
+        if self._replayed.get(index, -1) < fence:
+            try:
+                async with self.reading(replica):
+                    replayed = await self._wal_position(replica, REPLAYED_WAL_POSITION)
+            except (*CONNECTION_ERRORS, DBAPIError):
+                return False
+            self._replayed[index] = max(self._replayed.get(index, -1), replayed)
+        return self._replayed[index] >= fence
+    
+    async def _wal_position(self, target: AsyncEngine, statement: Any) -> int:
+        async with target.connect() as conn:
+            return await conn.scalar(statement)
+    
+    def eject_if_lost(self, target: AsyncEngine, exc: BaseException) -> None:
+        """Eject ``target`` if ``exc`` means a read lost its connection."""
+        if isinstance(exc, CONNECTION_ERRORS) or (
+            isinstance(exc, DBAPIError) and exc.connection_invalidated
+        ):
+            self.eject(target)
+    
+    @asynccontextmanager
+    async def reading(self, target: AsyncEngine | None = None) -> AsyncIterator[AsyncEngine]:
+        """Engine for a read, ejected if the read loses its connection.
+        
+        ``target`` defaults to the next healthy replica.
+        """
+        target = target if target is not None else self.choose()
+        try:
+            yield target
+        except Exception as exc:
+            self.eject_if_lost(target, exc)
+            raise
+
+
+def create_replica_engine(url: str, label: str = "replica") -> AsyncEngine:
+    """Engine for a read replica, always in autocommit mode."""
+    return instrument_engine(
+        create_async_engine(
+            url,
+            echo=settings.debug,
+            pool_pre_ping=True,
+            isolation_level="AUTOCOMMIT",
+            **engine_options(url),
+        ),
+        label,
+    )
 
 
+replica_router = ReplicaRouter(
+    engine,
+    [
+        create_replica_engine(url, f"replica-{index}")
+        for index, url in enumerate(settings.database_replica_urls)
+    ],
+)
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Get database session."""
     async with AsyncSessionLocal() as session:
@@ -37,16 +291,79 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get a read-only session routed to a replica, without a transaction."""
+    async with replica_router.reading() as target, ReadSessionLocal(bind=target) as session:
+        yield session
+
+
 async def init_db() -> None:
     """Initialize database tables."""
     async with engine.begin() as conn:
         # Import all models to register them
-        from app.models import user, name, game_result  # noqa
+        from app.models import (  # noqa
+            user, name, user_agent, game_result, roster_snapshot, spin_rollup, spin_sketch,
+            elimination_round, fairness,
+        )
+        
+        from app.services.fairness import ensure_audit_state
+        from app.services.partitions import ensure_partitions
         
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
+        await ensure_audit_state(conn)
+        
+        # game_results is partitioned and rejects rows until partitions exist
+        await ensure_partitions(conn)
 
 
 async def close_db() -> None:
     """Close database connections."""
-    await engine.dispose()
\ No newline at end of file
+    for replica in replica_router.replicas:
+        await replica.dispose()
+    await engine.dispose()
+
+
+class VersionedRead:
+    """Read session for a response tagged with data versions.
+    
+    Validators record the versions their tag is built from; the session is
+    opened afterwards, on a replica that has caught up with them, so the
+    tag is never newer than the rows. Requests answered with a 304 never
+    open it.
+    """
+    
+    def __init__(self, router: ReplicaRouter) -> None:
+        self._router = router
+        self._versions: list[Any] = []
+        self.target: AsyncEngine | None = None
+        self.session: AsyncSession | None = None
+    
+    def depends_on(self, *versions: Any) -> None:
+        """Record labelled versions the response is tagged with."""
+        self._versions.extend(versions)
+    
+    async def open(self) -> AsyncSession:
+        """Session on an engine holding every commit behind the recorded versions."""
+        if self.session is None:
+            self.target = await self._router.choose_after(tuple(self._versions))
+            self.session = ReadSessionLocal(bind=self.target)
+        return self.session
+    
+    async def close(self) -> None:
+        """Close the session if one was opened."""
+        if self.session is not None:
+            await self.session.close()
+
+
+async def get_versioned_read_db() -> AsyncGenerator[VersionedRead, None]:
+    """Get a versioned read whose session is opened after its validators."""
+    read = VersionedRead(replica_router)
+    try:
+        yield read
+    except Exception as exc:
+        if read.target is not None:
+            replica_router.eject_if_lost(read.target, exc)
+        raise
+    finally:
+        await read.close()
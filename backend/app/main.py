@@ -1,10 +1,70 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app.api import analytics, auth, names, results, spin, ws
+from app.config import settings
+from app.database import close_db, engine
+from app.metrics import MultiprocessCollector, render, snapshot
+from app.middleware import RequestMetricsMiddleware
+from app.serialization import ORJSONResponse
+from app.services.auth import password_hasher
+from app.services.broadcast import hub
+from app.services.cache import cache_backend
+from app.services.columnar import columnar_analytics
+from app.services.partitions import PartitionMaintainer
+from app.services.result_writer import result_writer
+from app.warmup import readiness
+
+
+metrics_collector = (
+    MultiprocessCollector(settings.metrics_dir, settings.metrics_write_interval)
+    if settings.metrics_dir
+    else None
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Start background services and drain them on shutdown.
+    
+    Warm-up runs in the background so liveness checks are answered while
+    the worker prepares; /health reports ready once it has finished.
+    """
+    async with AsyncExitStack() as shutdown:
+        # Callbacks run in reverse and each one runs even if an earlier one
+        # raised, so a failed drain cannot leave the pools open.
+        shutdown.push_async_callback(close_db)
+        shutdown.callback(password_hasher.shutdown)
+        shutdown.push_async_callback(cache_backend.close)
+        partition_maintainer = PartitionMaintainer(engine)
+        await partition_maintainer.start()
+        shutdown.push_async_callback(partition_maintainer.stop)
+        await result_writer.start()
+        shutdown.push_async_callback(result_writer.stop)
+        await hub.start()
+        shutdown.push_async_callback(hub.stop)
+        if metrics_collector is not None:
+            await metrics_collector.start()
+            shutdown.push_async_callback(metrics_collector.stop)
+        await readiness.start()
+        shutdown.push_async_callback(readiness.stop)
+        if settings.columnar_analytics:
+            await columnar_analytics.start()
+        shutdown.push_async_callback(columnar_analytics.stop)
+        yield
+
 
 app = FastAPI(
     title="Roulette API",
     description="A roulette application API for random name selection",
     version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -15,6 +75,14 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(RequestMetricsMiddleware)
+
+app.include_router(analytics.router)
+app.include_router(auth.router)
+app.include_router(names.router)
+app.include_router(results.router)
+app.include_router(spin.router)
+app.include_router(ws.router)
 
 
 @app.get("/")
@@ -25,5 +93,22 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy"}
\ No newline at end of file
+    """Readiness check: healthy once the worker has warmed up."""
+    if not readiness.ready:
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    return {"status": "healthy"}
+
+
+@app.get("/health/live")
+async def liveness_check():
+    """Liveness check: the process is up and serving requests."""
+    return {"status": "alive"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """Prometheus metrics, summed across workers when metrics_dir is set."""
+    data = snapshot()
+    if metrics_collector is not None:
+        data = await asyncio.to_thread(metrics_collector.collect, data)
+    return PlainTextResponse(render(data), media_type="text/plain; version=0.0.4")
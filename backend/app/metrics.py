@@ -0,0 +1,344 @@
+"""In-process metric primitives for operational telemetry.
+
+Metrics are updated from the event loop thread only, so plain attribute
+updates are safe without locks. Each worker process keeps its own values;
+with ``settings.metrics_dir`` set, workers periodically dump snapshots there
+and any worker can render the sum across all of them.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator, Sequence
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Accumulated database time of the current request, set by the middleware
+request_db_time: ContextVar[list[float] | None] = ContextVar("request_db_time", default=None)
+
+LabelKey = tuple[str, ...]
+
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+class Metric:
+    """Base class for named metrics with optional labels."""
+    
+    kind = "untyped"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: "Registry | None" = None,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        (registry if registry is not None else REGISTRY).register(self)
+    
+    def _key(self, labels: dict[str, str]) -> LabelKey:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+
+class Counter(Metric):
+    """Monotonically increasing value."""
+    
+    kind = "counter"
+    
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.values: dict[LabelKey, float] = {}
+    
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increase the counter."""
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+    
+    def samples(self) -> Iterator[tuple[str, LabelKey, float]]:
+        """Current samples as (suffix, label values, value)."""
+        for key, value in self.values.items():
+            yield "_total", key, value
+
+
+class Gauge(Metric):
+    """Value that can go up and down, or be read from a callback."""
+    
+    kind = "gauge"
+    
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.values: dict[LabelKey, float] = {}
+        self.functions: dict[LabelKey, Callable[[], float]] = {}
+    
+    def set(self, value: float, **labels: str) -> None:
+        """Set the gauge."""
+        self.values[self._key(labels)] = value
+    
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increase the gauge."""
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+    
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        """Decrease the gauge."""
+        self.inc(-amount, **labels)
+    
+    def set_function(self, function: Callable[[], float], **labels: str) -> None:
+        """Compute the gauge from ``function`` whenever it is collected."""
+        self.functions[self._key(labels)] = function
+    
+    def samples(self) -> Iterator[tuple[str, LabelKey, float]]:
+        """Current samples as (suffix, label values, value)."""
+        yield from (("", key, value) for key, value in self.values.items())
+        for key, function in self.functions.items():
+            yield "", key, float(function())
+
+
+class Histogram(Metric):
+    """Distribution of observations in cumulative buckets."""
+    
+    kind = "histogram"
+    
+    def __init__(
+        self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        bounds = sorted(buckets)
+        if not bounds or bounds[-1] != math.inf:
+            bounds.append(math.inf)
+        self.buckets = tuple(bounds)
+        self.counts: dict[LabelKey, list[int]] = {}
+        self.sums: dict[LabelKey, float] = {}
+    
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation."""
+        key = self._key(labels)
+        counts = self.counts.get(key)
+        if counts is None:
+            counts = self.counts[key] = [0] * len(self.buckets)
+            self.sums[key] = 0.0
+        counts[bisect_left(self.buckets, value)] += 1
+        self.sums[key] += value
+    
+    def samples(self) -> Iterator[tuple[str, LabelKey, float]]:
+        """Cumulative bucket, sum and count samples.
+        
+        Bucket samples carry the upper bound as an extra trailing label value.
+        """
+        for key, counts in self.counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts, strict=True):
+                cumulative += count
+                yield "_bucket", (*key, format_bound(bound)), cumulative
+            yield "_sum", key, self.sums[key]
+            yield "_count", key, cumulative
+
+
+def format_bound(bound: float) -> str:
+    """Render a bucket bound the way Prometheus expects."""
+    return "+Inf" if bound == math.inf else repr(float(bound))
+
+
+class Registry:
+    """Collection of metrics exposed together."""
+    
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+    
+    def register(self, metric: Metric) -> None:
+        """Add a metric, rejecting duplicate names."""
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+    
+    def get(self, name: str) -> Metric:
+        """Look up a metric by name."""
+        return self._metrics[name]
+    
+    def __iter__(self) -> Iterator[Metric]:
+        return iter(self._metrics.values())
+
+
+REGISTRY = Registry()
+
+
+Snapshot = dict[str, dict[str, Any]]
+
+
+def snapshot(registry: Registry = REGISTRY) -> Snapshot:
+    """JSON-serializable copy of every metric's current samples."""
+    return {
+        metric.name: {
+            "kind": metric.kind,
+            "help": metric.documentation,
+            "labelnames": list(metric.labelnames),
+            "samples": [
+                [suffix, list(labels), value] for suffix, labels, value in metric.samples()
+            ],
+        }
+        for metric in registry
+    }
+
+
+def merge_snapshots(snapshots: Sequence[Snapshot]) -> Snapshot:
+    """Sum samples with identical names and labels across worker snapshots."""
+    merged: Snapshot = {}
+    totals: dict[str, dict[tuple[str, tuple[str, ...]], float]] = {}
+    for worker in snapshots:
+        for name, metric in worker.items():
+            if name not in merged:
+                merged[name] = {key: metric[key] for key in ("kind", "help", "labelnames")}
+                totals[name] = {}
+            for suffix, labels, value in metric["samples"]:
+                key = (suffix, tuple(labels))
+                totals[name][key] = totals[name].get(key, 0.0) + value
+    for name, samples in totals.items():
+        merged[name]["samples"] = [
+            [suffix, list(labels), value] for (suffix, labels), value in samples.items()
+        ]
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render(data: Snapshot) -> str:
+    """Render a snapshot in the Prometheus text exposition format."""
+    lines = []
+    for name, metric in sorted(data.items()):
+        lines.append(f"# HELP {name} {_escape(metric['help'])}")
+        lines.append(f"# TYPE {name} {metric['kind']}")
+        for suffix, labels, value in metric["samples"]:
+            names = list(metric["labelnames"])
+            if suffix == "_bucket":
+                names.append("le")
+            label_text = ",".join(
+                f'{label}="{_escape(str(item))}"' for label, item in zip(names, labels, strict=True)
+            )
+            series = f"{name}{suffix}{{{label_text}}}" if label_text else f"{name}{suffix}"
+            lines.append(f"{series} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MultiprocessCollector:
+    """Shares metric snapshots between worker processes through a directory.
+    
+    Each worker writes ``<pid>-<started>.json`` every ``interval`` seconds, so
+    a worker that is given the pid of an exited one starts a file of its own
+    instead of overwriting the old totals. Counters and histograms from exited
+    workers are kept so totals never go backwards; gauges are only summed
+    over live workers.
+    
+    Registry snapshots are taken on the event loop, which owns the metrics;
+    only the file I/O is meant to run in a thread.
+    """
+    
+    def __init__(
+        self, directory: str | Path, interval: float, registry: Registry = REGISTRY
+    ) -> None:
+        self.directory = Path(directory)
+        self.interval = interval
+        self.registry = registry
+        self._task: asyncio.Task[None] | None = None
+        self._owner: tuple[int, int] | None = None
+    
+    @property
+    def path(self) -> Path:
+        """Snapshot file of this worker."""
+        pid = os.getpid()
+        # Set per process rather than at import, since workers may be forked
+        if self._owner is None or self._owner[0] != pid:
+            self._owner = (pid, time.time_ns())
+        return self.directory / f"{pid}-{self._owner[1]}.json"
+    
+    def write(self, data: Snapshot | None = None) -> None:
+        """Atomically replace this worker's snapshot file."""
+        if data is None:
+            data = snapshot(self.registry)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(data))
+        os.replace(temporary, self.path)
+    
+    def collect(self, data: Snapshot | None = None) -> Snapshot:
+        """Merged snapshot of every worker, including a fresh one for this one."""
+        self.write(data)
+        files = []
+        for path in self.directory.glob("*.json"):
+            pid, _, started = path.stem.partition("-")
+            try:
+                files.append((int(pid), int(started or 0), path))
+            except ValueError:
+                continue
+        # Only the newest file of a pid can belong to a live worker
+        newest: dict[int, int] = {}
+        for pid, started, _ in files:
+            newest[pid] = max(started, newest.get(pid, started))
+        snapshots = []
+        for pid, started, path in files:
+            try:
+                data = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            if started != newest[pid] or not _pid_alive(pid):
+                data = {
+                    name: metric for name, metric in data.items()
+                    if metric["kind"] != "gauge"
+                }
+            snapshots.append(data)
+        return merge_snapshots(snapshots)
+    
+    async def start(self) -> None:
+        """Start writing snapshots periodically."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="metrics-writer")
+    
+    async def stop(self) -> None:
+        """Stop writing and leave a final snapshot behind."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await asyncio.to_thread(self.write, snapshot(self.registry))
+    
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.write, snapshot(self.registry))
+            except OSError:
+                logger.exception("Failed to write metrics snapshot")
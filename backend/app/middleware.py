@@ -0,0 +1,74 @@
+"""ASGI middleware for request telemetry."""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics import Gauge, Histogram, request_db_time
+
+REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being served.")
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template.",
+    ["method", "route", "status"],
+)
+RESPONSE_BYTES = Histogram(
+    "http_response_size_bytes",
+    "Response body size by route template.",
+    ["method", "route"],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000),
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Time spent executing database statements per request.",
+    ["method", "route"],
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestMetricsMiddleware:
+    """Record latency, response size and database time for every HTTP request.
+    
+    Implemented as plain ASGI rather than ``BaseHTTPMiddleware`` to avoid the
+    extra task and body buffering per request. Routes are labelled by their
+    template (``/api/names/{name_id}``) to keep label cardinality bounded.
+    """
+    
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status_code = 500
+        body_size = 0
+        
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status_code, body_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                body_size += len(message.get("body", b""))
+            await send(message)
+        
+        db_time: list[float] = []
+        token = request_db_time.set(db_time)
+        REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            elapsed = time.perf_counter() - start
+            REQUESTS_IN_FLIGHT.dec()
+            request_db_time.reset(token)
+            
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            REQUEST_SECONDS.observe(
+                elapsed, method=method, route=route, status=str(status_code)
+            )
+            RESPONSE_BYTES.observe(body_size, method=method, route=route)
+            REQUEST_DB_SECONDS.observe(sum(db_time), method=method, route=route)
@@ -3,7 +3,19 @@
 from app.models.base import Base, BaseModel
 from app.models.user import User
 from app.models.name import Name
+from app.models.user_agent import UserAgent
 from app.models.game_result import GameResult
+from app.models.roster_snapshot import RosterSnapshot
+from app.models.elimination_round import EliminationRound
+from app.models.spin_rollup import (
+    ClientRollupDaily,
+    ClientRollupHourly,
+    SessionRollup,
+    SpinRollupDaily,
+    SpinRollupHourly,
+)
+from app.models.spin_sketch import SpinSketchDaily, SpinSketchHourly
+from app.models.fairness import FairnessAuditState, FairnessCount
 
 # Import all models to ensure they're registered with SQLAlchemy
 __all__ = [
@@ -11,5 +23,17 @@ __all__ = [
     "BaseModel", 
     "User",
     "Name",
+    "UserAgent",
     "GameResult",
+    "RosterSnapshot",
+    "EliminationRound",
+    "SpinRollupHourly",
+    "SpinRollupDaily",
+    "SessionRollup",
+    "ClientRollupHourly",
+    "ClientRollupDaily",
+    "SpinSketchHourly",
+    "SpinSketchDaily",
+    "FairnessCount",
+    "FairnessAuditState",
 ]
\ No newline at end of file
@@ -1,7 +1,9 @@
 """Base model with common fields and utilities."""
 
 import uuid
+from collections.abc import Callable
 from datetime import datetime
+from operator import attrgetter
 from typing import Any
 
 from sqlalchemy import Column, DateTime, UUID
@@ -39,12 +41,20 @@ class BaseModel(Base, UUIDMixin, TimestampMixin):
     
     __abstract__ = True
     
+    @classmethod
+    def column_accessor(cls) -> tuple[tuple[str, ...], Callable[[Any], tuple[Any, ...]]]:
+        """Column names and a getter returning their values, built once per class."""
+        accessor = cls.__dict__.get("_column_accessor")
+        if accessor is None:
+            names = tuple(column.name for column in cls.__table__.columns)
+            accessor = (names, attrgetter(*names))
+            cls._column_accessor = accessor
+        return accessor
+    
     def to_dict(self) -> dict[str, Any]:
         """Convert model instance to dictionary."""
-        return {
-            column.name: getattr(self, column.name)
-            for column in self.__table__.columns
-        }
+        names, getter = self.column_accessor()
+        return dict(zip(names, getter(self)))
     
     def __repr__(self) -> str:
         """String representation of model."""
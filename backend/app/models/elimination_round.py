@@ -0,0 +1,22 @@
+"""Start of the current elimination round per session."""
+
+from sqlalchemy import Column, DateTime, UUID
+
+from app.models.base import Base
+
+
+class EliminationRound(Base):
+    """When a session last reset its elimination wheel.
+    
+    Elimination picks made before ``started_at`` no longer remove names, so
+    recovering a session only replays the results of the current round.
+    """
+    
+    __tablename__ = "elimination_rounds"
+    
+    session_id = Column(UUID(as_uuid=True), primary_key=True)
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    
+    def __repr__(self) -> str:
+        """String representation of an elimination round."""
+        return f"<EliminationRound(session={self.session_id}, started_at={self.started_at})>"
@@ -0,0 +1,42 @@
+"""Observed selection counts per roster snapshot for fairness audits."""
+
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String, UUID
+
+from app.models.base import Base
+
+
+class FairnessCount(Base):
+    """Standard spins that selected one name out of one roster snapshot.
+    
+    Expected counts follow from the snapshot weights, so only observations
+    are stored. Names are not foreign keys: deleting a name must not erase
+    the evidence of how often it was picked.
+    """
+    
+    __tablename__ = "fairness_counts"
+    
+    snapshot_key = Column(String(64), primary_key=True)
+    name_id = Column(UUID(as_uuid=True), primary_key=True)
+    observed = Column(BigInteger, nullable=False, default=0)
+    
+    def __repr__(self) -> str:
+        """String representation of a fairness count."""
+        return f"<FairnessCount(snapshot={self.snapshot_key[:12]}, name={self.name_id}, observed={self.observed})>"
+
+
+class FairnessAuditState(Base):
+    """Single row recording which history the counters cover.
+    
+    Results written from ``streaming_since`` on are counted by the writer;
+    the backfill counts older ones and advances ``backfilled_until``.
+    """
+    
+    __tablename__ = "fairness_audit_state"
+    
+    id = Column(Integer, primary_key=True, default=1)
+    streaming_since = Column(DateTime(timezone=True), nullable=False)
+    backfilled_until = Column(DateTime(timezone=True), nullable=True)
+    
+    def __repr__(self) -> str:
+        """String representation of the audit state."""
+        return f"<FairnessAuditState(since={self.streaming_since}, backfilled={self.backfilled_until})>"
@@ -1,25 +1,62 @@
 """Game result model for analytics and tracking."""
 
-from sqlalchemy import Column, String, Integer, ForeignKey, UUID, Text
+from sqlalchemy import CheckConstraint, Column, DateTime, String, Integer, ForeignKey, Index, UUID, Text
 from sqlalchemy.dialects.postgresql import JSONB, INET
 from sqlalchemy.orm import relationship, validates
+from sqlalchemy.sql import func
 
 from app.models.base import BaseModel
 
 
 class GameResult(BaseModel):
-    """Game result model for tracking roulette spins and analytics."""
+    """Game result model for tracking roulette spins and analytics.
+    
+    The table is range-partitioned by month on ``created_at`` (see
+    ``app.services.partitions``), so ``created_at`` is part of the primary key.
+    """
     
     __tablename__ = "game_results"
+    __table_args__ = (
+        CheckConstraint(
+            "roster_snapshot_key IS NOT NULL OR available_names IS NOT NULL",
+            name="ck_game_results_roster_source",
+        ),
+        # Keyset pagination over (created_at, id) per filter; the primary
+        # key already covers the unfiltered listing
+        Index("ix_game_results_session_created_at", "session_id", "created_at", "id"),
+        CheckConstraint(
+            "spin_mode IN ('standard', 'elimination')", name="ck_game_results_spin_mode"
+        ),
+        Index(
+            "ix_game_results_selected_name_created_at",
+            "selected_name_id",
+            "created_at",
+            "id",
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
     
-    session_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        primary_key=True
+    )
+    session_id = Column(UUID(as_uuid=True), nullable=False)
     selected_name_id = Column(
         UUID(as_uuid=True),
         ForeignKey("names.id", ondelete="SET NULL"),
         nullable=True
     )
     selected_name_snapshot = Column(JSONB, nullable=False)
-    available_names = Column(JSONB, nullable=False)
+    roster_snapshot_key = Column(
+        String(64),
+        ForeignKey("roster_snapshots.key", ondelete="RESTRICT"),
+        nullable=True,
+        index=True
+    )
+    # Legacy per-row copy of the candidates; new rows reference a snapshot
+    available_names = Column(JSONB, nullable=True)
     spin_duration_ms = Column(Integer, nullable=True)
     user_id = Column(
         UUID(as_uuid=True),
@@ -27,11 +64,22 @@ class GameResult(BaseModel):
         nullable=True
     )
     user_ip = Column(INET, nullable=True)
+    user_agent_id = Column(
+        Integer,
+        ForeignKey("user_agents.id", ondelete="RESTRICT"),
+        nullable=True,
+        index=True
+    )
+    # Legacy per-row copy of the agent; new rows reference user_agents
     user_agent = Column(Text, nullable=True)
+    # "standard" or "elimination"; elimination picks are replayed on recovery
+    spin_mode = Column(String(16), nullable=False, default="standard", server_default="standard")
     
     # Relationships
     selected_name = relationship("Name", back_populates="game_results")
     user = relationship("User", back_populates="game_results")
+    roster_snapshot = relationship("RosterSnapshot")
+    agent = relationship("UserAgent")
     
     @validates('session_id')
     def validate_session_id(self, key: str, session_id) -> str:
@@ -1,19 +1,54 @@
 """Name model for roulette participants."""
 
-from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, UUID
+from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, Index, UUID, func
 from sqlalchemy.orm import relationship, validates
 
 from app.models.base import BaseModel
 
 
+def clean_name(name: str) -> str:
+    """Validate name format and length, returning it stripped."""
+    if not name or not name.strip():
+        raise ValueError("Name cannot be empty")
+    name = name.strip()
+    if len(name) < 1:
+        raise ValueError("Name must be at least 1 character long")
+    if len(name) > 255:
+        raise ValueError("Name cannot exceed 255 characters")
+    return name
+
+
+def clean_weight(weight: int) -> int:
+    """Validate weight is within the allowed range."""
+    if weight < 1:
+        raise ValueError("Weight must be at least 1")
+    if weight > 1000:
+        raise ValueError("Weight cannot exceed 1000")
+    return weight
+
+
+def clean_description(description: str | None) -> str | None:
+    """Validate description length, mapping blank descriptions to None."""
+    if description is not None:
+        if len(description) > 1000:
+            raise ValueError("Description cannot exceed 1000 characters")
+        return description.strip() if description.strip() else None
+    return description
+
+
 class Name(BaseModel):
     """Name model for managing roulette participants."""
     
     __tablename__ = "names"
+    __table_args__ = (
+        # Keyset pagination over (created_at, id), with or without is_active
+        Index("ix_names_created_at_id", "created_at", "id"),
+        Index("ix_names_is_active_created_at_id", "is_active", "created_at", "id"),
+    )
     
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
-    is_active = Column(Boolean, default=True, nullable=False, index=True)
+    is_active = Column(Boolean, default=True, nullable=False)
     weight = Column(Integer, default=1, nullable=False)
     created_by = Column(
         UUID(as_uuid=True), 
@@ -28,34 +63,23 @@ class Name(BaseModel):
     @validates('name')
     def validate_name(self, key: str, name: str) -> str:
         """Validate name format and length."""
-        if not name or not name.strip():
-            raise ValueError("Name cannot be empty")
-        name = name.strip()
-        if len(name) < 1:
-            raise ValueError("Name must be at least 1 character long")
-        if len(name) > 255:
-            raise ValueError("Name cannot exceed 255 characters")
-        return name
+        return clean_name(name)
     
     @validates('weight')
     def validate_weight(self, key: str, weight: int) -> int:
         """Validate weight is positive."""
-        if weight < 1:
-            raise ValueError("Weight must be at least 1")
-        if weight > 1000:
-            raise ValueError("Weight cannot exceed 1000")
-        return weight
+        return clean_weight(weight)
     
     @validates('description')
     def validate_description(self, key: str, description: str | None) -> str | None:
         """Validate description length."""
-        if description is not None:
-            if len(description) > 1000:
-                raise ValueError("Description cannot exceed 1000 characters")
-            return description.strip() if description.strip() else None
-        return description
+        return clean_description(description)
     
     def __repr__(self) -> str:
         """String representation of name."""
         status = "active" if self.is_active else "inactive"
-        return f"<Name(id={self.id}, name='{self.name}', {status}, weight={self.weight})>"
\ No newline at end of file
+        return f"<Name(id={self.id}, name='{self.name}', {status}, weight={self.weight})>"
+
+
+# Names are unique ignoring case; also the conflict target of bulk imports
+Index("uq_names_name_lower", func.lower(Name.name), unique=True)
@@ -0,0 +1,81 @@
+"""Content-addressed roster snapshot model."""
+
+import hashlib
+import json
+from typing import Any
+
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import validates
+from sqlalchemy.sql import func
+
+from app.models.base import Base
+
+
+class RosterSnapshot(Base):
+    """Immutable set of candidate names shared by every spin over it.
+    
+    Snapshots are keyed by a SHA-256 digest of their (id, name, weight)
+    entries, so each distinct roster is stored exactly once no matter how
+    many game results reference it.
+    """
+    
+    __tablename__ = "roster_snapshots"
+    
+    key = Column(String(64), primary_key=True)
+    entries = Column(JSONB, nullable=False)
+    name_count = Column(Integer, nullable=False)
+    total_weight = Column(Integer, nullable=False)
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    
+    @staticmethod
+    def compute_key(entries: list[dict[str, Any]]) -> str:
+        """Content hash of the roster, independent of entry order."""
+        canonical = sorted(
+            (str(entry['id']), entry['name'], entry.get('weight', 1))
+            for entry in entries
+        )
+        payload = json.dumps(canonical, separators=(',', ':'), ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    @classmethod
+    def from_entries(cls, entries: list[dict[str, Any]]) -> "RosterSnapshot":
+        """Build a snapshot with its key and totals derived from the entries."""
+        return cls(
+            key=cls.compute_key(entries),
+            entries=entries,
+            name_count=len(entries),
+            total_weight=sum(entry.get('weight', 1) for entry in entries),
+        )
+    
+    @validates('key')
+    def validate_key(self, key: str, value: str) -> str:
+        """Validate key is a hex SHA-256 digest."""
+        if not isinstance(value, str) or len(value) != 64:
+            raise ValueError("Snapshot key must be a 64 character SHA-256 digest")
+        return value
+    
+    @validates('entries')
+    def validate_entries(self, key: str, entries: list) -> list:
+        """Validate entries is a non-empty list of name data."""
+        if not isinstance(entries, list):
+            raise ValueError("Snapshot entries must be a list")
+        
+        if len(entries) == 0:
+            raise ValueError("Snapshot entries cannot be empty")
+        
+        for name_data in entries:
+            if not isinstance(name_data, dict):
+                raise ValueError("Each snapshot entry must be a dictionary")
+            if 'id' not in name_data or 'name' not in name_data:
+                raise ValueError("Each snapshot entry must have 'id' and 'name' fields")
+        
+        return entries
+    
+    def __repr__(self) -> str:
+        """String representation of roster snapshot."""
+        return f"<RosterSnapshot(key={self.key[:12]}, names={self.name_count})>"
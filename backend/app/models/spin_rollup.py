@@ -0,0 +1,88 @@
+"""Pre-aggregated spin statistics maintained as results are written."""
+
+from sqlalchemy import BigInteger, Column, Date, DateTime, Float, Integer, UUID
+
+from app.models.base import Base
+
+
+class DurationStatsMixin:
+    """Additive spin count and duration statistics."""
+    
+    spin_count = Column(BigInteger, nullable=False, default=0)
+    duration_count = Column(BigInteger, nullable=False, default=0)
+    duration_sum = Column(BigInteger, nullable=False, default=0)
+    duration_sq_sum = Column(Float, nullable=False, default=0.0)
+    duration_min = Column(Integer, nullable=True)
+    duration_max = Column(Integer, nullable=True)
+
+
+class SpinRollupHourly(Base, DurationStatsMixin):
+    """Spins per name per UTC hour."""
+    
+    __tablename__ = "spin_rollups_hourly"
+    
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    name_id = Column(UUID(as_uuid=True), primary_key=True, index=True)
+    
+    def __repr__(self) -> str:
+        """String representation of hourly rollup."""
+        return f"<SpinRollupHourly(bucket={self.bucket_start}, name={self.name_id}, spins={self.spin_count})>"
+
+
+class SpinRollupDaily(Base, DurationStatsMixin):
+    """Spins per name per UTC day."""
+    
+    __tablename__ = "spin_rollups_daily"
+    
+    bucket_date = Column(Date, primary_key=True)
+    name_id = Column(UUID(as_uuid=True), primary_key=True, index=True)
+    
+    def __repr__(self) -> str:
+        """String representation of daily rollup."""
+        return f"<SpinRollupDaily(date={self.bucket_date}, name={self.name_id}, spins={self.spin_count})>"
+
+
+class SessionRollup(Base, DurationStatsMixin):
+    """Spins per game session."""
+    
+    __tablename__ = "session_rollups"
+    
+    session_id = Column(UUID(as_uuid=True), primary_key=True)
+    first_spin_at = Column(DateTime(timezone=True), nullable=False)
+    last_spin_at = Column(DateTime(timezone=True), nullable=False)
+    
+    def __repr__(self) -> str:
+        """String representation of session rollup."""
+        return f"<SessionRollup(session={self.session_id}, spins={self.spin_count})>"
+
+
+class ClientRollupHourly(Base):
+    """Spins per user agent per UTC hour.
+    
+    Results without an interned agent are counted under agent id 0, so
+    agents are not foreign keys.
+    """
+    
+    __tablename__ = "client_rollups_hourly"
+    
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    user_agent_id = Column(Integer, primary_key=True)
+    spin_count = Column(BigInteger, nullable=False, default=0)
+    
+    def __repr__(self) -> str:
+        """String representation of hourly client rollup."""
+        return f"<ClientRollupHourly(bucket={self.bucket_start}, agent={self.user_agent_id}, spins={self.spin_count})>"
+
+
+class ClientRollupDaily(Base):
+    """Spins per user agent per UTC day."""
+    
+    __tablename__ = "client_rollups_daily"
+    
+    bucket_date = Column(Date, primary_key=True)
+    user_agent_id = Column(Integer, primary_key=True)
+    spin_count = Column(BigInteger, nullable=False, default=0)
+    
+    def __repr__(self) -> str:
+        """String representation of daily client rollup."""
+        return f"<ClientRollupDaily(date={self.bucket_date}, agent={self.user_agent_id}, spins={self.spin_count})>"
@@ -0,0 +1,44 @@
+"""Mergeable approximate-analytics sketches per time bucket."""
+
+from sqlalchemy import Column, Date, DateTime, LargeBinary, SmallInteger
+
+from app.models.base import Base
+
+
+class SketchMixin:
+    """Serialized sketches of one bucket shard; NULL means nothing recorded yet.
+    
+    A bucket is the merge of all its shards. See ``app.services.sketches``
+    for the encodings.
+    """
+    
+    users = Column(LargeBinary, nullable=True)
+    ips = Column(LargeBinary, nullable=True)
+    sessions = Column(LargeBinary, nullable=True)
+    durations = Column(LargeBinary, nullable=True)
+
+
+class SpinSketchHourly(Base, SketchMixin):
+    """Distinct-count and duration sketches per UTC hour."""
+    
+    __tablename__ = "spin_sketches_hourly"
+    
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    shard = Column(SmallInteger, primary_key=True, default=0)
+    
+    def __repr__(self) -> str:
+        """String representation of hourly sketches."""
+        return f"<SpinSketchHourly(bucket={self.bucket_start}, shard={self.shard})>"
+
+
+class SpinSketchDaily(Base, SketchMixin):
+    """Distinct-count and duration sketches per UTC day."""
+    
+    __tablename__ = "spin_sketches_daily"
+    
+    bucket_date = Column(Date, primary_key=True)
+    shard = Column(SmallInteger, primary_key=True, default=0)
+    
+    def __repr__(self) -> str:
+        """String representation of daily sketches."""
+        return f"<SpinSketchDaily(date={self.bucket_date}, shard={self.shard})>"
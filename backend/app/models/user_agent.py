@@ -0,0 +1,43 @@
+"""Deduplicated user agent dimension referenced by game results."""
+
+import hashlib
+
+from sqlalchemy import Column, DateTime, Identity, Integer, String, Text
+from sqlalchemy.sql import func
+
+from app.models.base import Base
+
+
+class UserAgent(Base):
+    """One distinct user agent string with the fields parsed from it.
+    
+    Game results reference agents by their small integer id, so each
+    string and its parse are stored once however often clients repeat it.
+    Rows are never deleted; worker caches hold on to their ids.
+    """
+    
+    __tablename__ = "user_agents"
+    
+    id = Column(Integer, Identity(), primary_key=True)
+    # Unique on the digest; agent strings are too long to index reliably
+    digest = Column(String(64), nullable=False, unique=True)
+    user_agent = Column(Text, nullable=False)
+    browser = Column(String(32), nullable=True)
+    browser_version = Column(String(32), nullable=True)
+    os = Column(String(32), nullable=True)
+    os_version = Column(String(32), nullable=True)
+    device = Column(String(16), nullable=False)
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    
+    @staticmethod
+    def compute_digest(user_agent: str) -> str:
+        """SHA-256 of the agent string."""
+        return hashlib.sha256(user_agent.encode("utf-8")).hexdigest()
+    
+    def __repr__(self) -> str:
+        """String representation of a user agent."""
+        return f"<UserAgent(id={self.id}, browser={self.browser}, os={self.os})>"
@@ -0,0 +1,145 @@
+"""Schemas for analytics endpoints."""
+
+import math
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class DurationSummary(BaseModel):
+    """Spin count with spin duration statistics."""
+    
+    spin_count: int
+    avg_duration_ms: float | None = None
+    stddev_duration_ms: float | None = None
+    min_duration_ms: int | None = None
+    max_duration_ms: int | None = None
+    
+    @classmethod
+    def from_sums(
+        cls,
+        spin_count: int,
+        duration_count: int,
+        duration_sum: int,
+        duration_sq_sum: float,
+        duration_min: int | None,
+        duration_max: int | None,
+        **extra,
+    ) -> "DurationSummary":
+        """Derive mean and standard deviation from additive rollup sums.
+        
+        Database SUMs over BIGINT come back as Decimal, so values are coerced.
+        """
+        avg = stddev = None
+        if duration_count:
+            avg = float(duration_sum) / float(duration_count)
+            variance = float(duration_sq_sum) / float(duration_count) - avg * avg
+            stddev = math.sqrt(max(variance, 0.0))
+        return cls(
+            spin_count=int(spin_count or 0),
+            avg_duration_ms=avg,
+            stddev_duration_ms=stddev,
+            min_duration_ms=duration_min,
+            max_duration_ms=duration_max,
+            **extra,
+        )
+
+
+class NameSelectionStats(DurationSummary):
+    """How often a name was selected."""
+    
+    name_id: uuid.UUID
+    name: str | None = None
+
+
+class VolumeBucket(DurationSummary):
+    """Spin volume for one time bucket."""
+    
+    bucket_start: datetime
+
+
+class SessionStats(DurationSummary):
+    """Spin statistics for one session."""
+    
+    session_id: uuid.UUID
+    first_spin_at: datetime
+    last_spin_at: datetime
+
+
+class NameSelectionCount(BaseModel):
+    """Spins of one name within an exact time range."""
+    
+    name_id: uuid.UUID
+    name: str | None = None
+    spin_count: int
+
+
+class SpinHeatmap(BaseModel):
+    """Spins by UTC weekday (Monday first) and hour of day."""
+    
+    counts: list[list[int]]
+
+
+class DurationPercentiles(BaseModel):
+    """Spin duration percentiles over the spins that recorded a duration."""
+    
+    duration_count: int
+    percentiles: list[float]
+    values_ms: list[float] | None = None
+
+
+class DistinctCounts(BaseModel):
+    """Approximate distinct counts from HyperLogLog sketches."""
+    
+    users: int
+    ips: int
+    sessions: int
+    precision: int
+    standard_error: float
+
+
+class FairnessAudit(BaseModel):
+    """Goodness of fit of one roster snapshot's spins to its weights."""
+    
+    model_config = ConfigDict(from_attributes=True)
+    
+    snapshot_key: str
+    names: int
+    spins: int
+    unexpected_spins: int
+    min_expected: float | None = None
+    chi_square: float | None = None
+    degrees_of_freedom: int
+    chi_square_p: float | None = None
+    ks_statistic: float | None = None
+    ks_p: float | None = None
+    sufficient: bool
+    drift: bool
+
+
+class NameFit(BaseModel):
+    """Observed and expected selections of one name."""
+    
+    model_config = ConfigDict(from_attributes=True)
+    
+    name_id: uuid.UUID
+    name: str
+    weight: int
+    observed: int
+    expected: float
+
+
+class FairnessReport(FairnessAudit):
+    """Audit of one snapshot with its per-name breakdown."""
+    
+    alpha: float
+    created_at: datetime
+    fits: list[NameFit]
+
+
+class ClientSpinCount(BaseModel):
+    """Spins from one browser, operating system or device class."""
+    
+    value: str | None
+    spin_count: int
@@ -0,0 +1,35 @@
+"""Schemas for users and authentication."""
+
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+
+
+class UserCreate(BaseModel):
+    """Request body for registering a user."""
+    
+    username: str = Field(min_length=3, max_length=50)
+    email: EmailStr
+    password: str = Field(min_length=8, max_length=72)
+
+
+class UserRead(BaseModel):
+    """User as returned by the API."""
+    
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: uuid.UUID
+    username: str
+    email: str
+    role: str
+    is_active: bool
+    created_at: datetime
+
+
+class Token(BaseModel):
+    """Bearer access token."""
+    
+    access_token: str
+    token_type: str = "bearer"
+    expires_at: datetime
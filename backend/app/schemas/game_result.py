@@ -0,0 +1,21 @@
+"""Schemas for game results."""
+
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class GameResultRead(BaseModel):
+    """Game result as listed in spin history."""
+    
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: uuid.UUID
+    session_id: uuid.UUID
+    selected_name_id: uuid.UUID | None
+    selected_name: str | None
+    roster_snapshot_key: str | None
+    spin_duration_ms: int | None
+    spin_mode: str
+    created_at: datetime
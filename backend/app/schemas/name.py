@@ -0,0 +1,58 @@
+"""Schemas for roulette names."""
+
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class NameCreate(BaseModel):
+    """Request body for creating a name."""
+    
+    name: str = Field(min_length=1, max_length=255)
+    description: str | None = Field(default=None, max_length=1000)
+    is_active: bool = True
+    weight: int = Field(default=1, ge=1, le=1000)
+
+
+class NameUpdate(BaseModel):
+    """Request body for partially updating a name."""
+    
+    name: str | None = Field(default=None, min_length=1, max_length=255)
+    description: str | None = Field(default=None, max_length=1000)
+    is_active: bool | None = None
+    weight: int | None = Field(default=None, ge=1, le=1000)
+
+
+class NameRead(BaseModel):
+    """Name as returned by the API."""
+    
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: uuid.UUID
+    name: str
+    description: str | None
+    is_active: bool
+    weight: int
+    created_by: uuid.UUID | None
+    created_at: datetime
+    updated_at: datetime
+
+
+class NameImportError(BaseModel):
+    """A rejected row of a bulk import, numbered from 1."""
+    
+    row: int
+    name: str | None = None
+    error: str
+
+
+class NameImportResult(BaseModel):
+    """Outcome of a bulk import."""
+    
+    received: int
+    inserted: int
+    updated: int
+    unchanged: int = Field(description="Existing names that were left as they were")
+    duplicates: int = Field(description="Rows superseded by a later row with the same name")
+    errors: list[NameImportError]
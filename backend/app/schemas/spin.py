@@ -0,0 +1,71 @@
+"""Schemas for roulette spins."""
+
+import uuid
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from app.config import settings
+
+
+SpinMode = Literal["standard", "elimination"]
+
+
+class SpinRequest(BaseModel):
+    """Request body for a single spin.
+    
+    In ``elimination`` mode a picked name stays out of the session's draws
+    until the session is reset.
+    """
+    
+    session_id: uuid.UUID
+    spin_duration_ms: int | None = Field(default=None, ge=0, le=300000)
+    mode: SpinMode = "standard"
+
+
+class SelectedName(BaseModel):
+    """Name picked by a spin."""
+    
+    id: uuid.UUID
+    name: str
+    weight: int
+
+
+class SpinResponse(BaseModel):
+    """Result of a single spin."""
+    
+    id: uuid.UUID
+    session_id: uuid.UUID
+    selected: SelectedName
+    roster_size: int
+    mode: SpinMode = "standard"
+    remaining: int | None = Field(
+        default=None, description="Names left in play after an elimination spin"
+    )
+    created_at: datetime
+
+
+class BatchSpinRequest(BaseModel):
+    """Request body for many spins in one call."""
+    
+    session_id: uuid.UUID
+    count: int = Field(ge=1, le=settings.max_batch_spins)
+    spin_duration_ms: int | None = Field(default=None, ge=0, le=300000)
+
+
+class NameTally(SelectedName):
+    """Number of times a name was picked in a batch."""
+    
+    count: int
+
+
+class BatchSpinResponse(BaseModel):
+    """Result of a batch of spins."""
+    
+    session_id: uuid.UUID
+    count: int
+    roster_size: int
+    selected_name_ids: list[uuid.UUID]
+    tallies: list[NameTally]
+    created_at: datetime
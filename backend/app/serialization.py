@@ -0,0 +1,39 @@
+"""Fast JSON responses for list endpoints."""
+
+from collections.abc import Sequence
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+# UUIDs and datetimes are encoded natively by orjson; UTC renders as "Z" like
+# pydantic does, so fast-path and model-validated responses look the same.
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def dumps(content: Any) -> bytes:
+    """Encode JSON with the options shared by every response."""
+    return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded by orjson instead of the standard library."""
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def rows_to_dicts(fields: Sequence[str], rows: Sequence[Sequence[Any]]) -> list[dict[str, Any]]:
+    """Turn row tuples into dicts without touching ORM objects or models."""
+    return [dict(zip(fields, row, strict=True)) for row in rows]
+
+
+def page_response(
+    fields: Sequence[str], rows: Sequence[Sequence[Any]], next_cursor: str | None
+) -> ORJSONResponse:
+    """A ``Page`` body built straight from row tuples.
+    
+    Used by list endpoints whose columns already match their response schema,
+    skipping per-row model validation and serialization.
+    """
+    return ORJSONResponse({'items': rows_to_dicts(fields, rows), 'next_cursor': next_cursor})
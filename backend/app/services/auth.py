@@ -0,0 +1,168 @@
+"""Password hashing off the event loop and cached access-token verification."""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from jose import JWTError, jwt
+from passlib.context import CryptContext
+
+from app.config import settings
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+class HashingBusy(RuntimeError):
+    """Too many password hashes are already waiting for a worker thread."""
+
+
+class InvalidToken(ValueError):
+    """An access token is malformed, expired or has a bad signature."""
+
+
+class PasswordHasher:
+    """Runs bcrypt in a bounded thread pool so logins never block the loop.
+    
+    bcrypt releases the GIL, so ``workers`` threads hash in parallel. At most
+    ``max_pending`` calls may wait for a thread; callers that cannot get a
+    slot within ``timeout`` seconds get ``HashingBusy`` instead of queueing
+    without bound during a login burst.
+    """
+    
+    def __init__(
+        self,
+        context: CryptContext = pwd_context,
+        *,
+        workers: int = settings.password_hash_workers,
+        max_pending: int = settings.password_hash_max_pending,
+        timeout: float = settings.password_hash_timeout,
+    ) -> None:
+        self._context = context
+        self._workers = workers
+        self._timeout = timeout
+        self._slots = asyncio.Semaphore(workers + max_pending)
+        self._executor: ThreadPoolExecutor | None = None
+    
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._workers, thread_name_prefix="password-hash"
+            )
+        return self._executor
+    
+    async def _run(self, func: Any, *args: Any) -> Any:
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self._timeout)
+        except TimeoutError as exc:
+            raise HashingBusy("Password hashing is saturated") from exc
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool(), func, *args)
+        finally:
+            self._slots.release()
+    
+    async def hash(self, password: str) -> str:
+        """Hash a password with the current scheme and cost."""
+        return await self._run(self._context.hash, password)
+    
+    async def verify(self, password: str, password_hash: str) -> tuple[bool, str | None]:
+        """Check a password, returning a replacement hash if it is outdated."""
+        return await self._run(self._context.verify_and_update, password, password_hash)
+    
+    def shutdown(self) -> None:
+        """Stop the worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+@dataclass(frozen=True, slots=True)
+class AuthenticatedUser:
+    """The parts of a user needed to authorize requests."""
+    
+    id: uuid.UUID
+    username: str
+    role: str
+    is_active: bool
+
+
+def create_access_token(
+    user_id: uuid.UUID, expires_delta: timedelta | None = None
+) -> tuple[str, datetime]:
+    """Signed access token for a user and its expiry time."""
+    now = datetime.now(UTC)
+    expires_at = now + (
+        expires_delta or timedelta(minutes=settings.access_token_expire_minutes)
+    )
+    claims = {'sub': str(user_id), 'iat': now, 'exp': expires_at}
+    token = jwt.encode(claims, settings.secret_key, algorithm=settings.algorithm)
+    return token, expires_at
+
+
+def decode_access_token(token: str) -> tuple[uuid.UUID, float]:
+    """User id and expiry (epoch seconds) of a valid token."""
+    try:
+        claims = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        return uuid.UUID(claims['sub']), float(claims['exp'])
+    except (JWTError, KeyError, TypeError, ValueError) as exc:
+        raise InvalidToken("Could not validate credentials") from exc
+
+
+class TokenCache:
+    """LRU of verified tokens and the user they resolved to.
+    
+    An entry lives until the token expires or ``ttl`` seconds pass,
+    whichever comes first, so a cached user is never more than one token
+    lifetime out of date. ``invalidate_user`` drops entries early, e.g. when
+    a user is deactivated.
+    """
+    
+    def __init__(
+        self,
+        maxsize: int = settings.token_cache_size,
+        ttl: float = settings.access_token_expire_minutes * 60,
+    ) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: OrderedDict[str, tuple[AuthenticatedUser, float]] = OrderedDict()
+    
+    def __len__(self) -> int:
+        """Number of cached tokens, including ones that expired but were not evicted."""
+        return len(self._entries)
+    
+    def get(self, token: str) -> AuthenticatedUser | None:
+        """Cached user for a token, or None if absent or expired."""
+        item = self._entries.get(token)
+        if item is None:
+            return None
+        user, expires_at = item
+        if expires_at <= time.time():
+            del self._entries[token]
+            return None
+        self._entries.move_to_end(token)
+        return user
+    
+    def put(self, token: str, user: AuthenticatedUser, token_expires_at: float) -> None:
+        """Remember a verified token until it or the cache TTL expires."""
+        self._entries[token] = (user, min(token_expires_at, time.time() + self._ttl))
+        self._entries.move_to_end(token)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+    
+    def invalidate_user(self, user_id: uuid.UUID) -> None:
+        """Forget every token of one user."""
+        for token in [t for t, (user, _) in self._entries.items() if user.id == user_id]:
+            del self._entries[token]
+    
+    def clear(self) -> None:
+        """Forget all tokens."""
+        self._entries.clear()
+
+
+password_hasher = PasswordHasher()
+token_cache = TokenCache()
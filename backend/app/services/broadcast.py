@@ -0,0 +1,152 @@
+"""Fan-out of spin and roster events to WebSocket subscribers."""
+
+import asyncio
+import json
+import logging
+from collections.abc import Iterable
+from typing import Any
+
+from fastapi import WebSocket
+from redis import asyncio as aioredis
+
+from app.config import settings
+from app.services.cache import RedisCacheBackend, cache_backend
+
+logger = logging.getLogger(__name__)
+
+WHEEL_CHANNEL = "wheel"
+REDIS_CHANNEL = "roulette:events"
+
+# WebSocket close code for "try again later", sent to dropped slow consumers
+CLOSE_TRY_AGAIN_LATER = 1013
+
+
+def session_channel(session_id: Any) -> str:
+    """Channel name for events of one game session."""
+    return f"session:{session_id}"
+
+
+class Subscriber:
+    """A connected client with a bounded queue of pending messages."""
+    
+    __slots__ = ("queue", "dropped")
+    
+    def __init__(self, queue_size: int = settings.ws_send_queue_size) -> None:
+        # One extra slot guarantees room for the drop sentinel
+        self.queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=queue_size + 1)
+        self.dropped = False
+    
+    def offer(self, message: str) -> bool:
+        """Queue a message without waiting; False if the client is too slow."""
+        if self.queue.qsize() >= self.queue.maxsize - 1:
+            return False
+        self.queue.put_nowait(message)
+        return True
+    
+    def drop(self) -> None:
+        """Discard pending messages and tell the sender loop to disconnect."""
+        self.dropped = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+    
+    async def pump(self, websocket: WebSocket) -> None:
+        """Send queued messages until the subscriber is dropped."""
+        while True:
+            message = await self.queue.get()
+            if message is None:
+                await websocket.close(code=CLOSE_TRY_AGAIN_LATER, reason="Too slow")
+                return
+            await websocket.send_text(message)
+
+
+class BroadcastHub:
+    """Per-worker registry of subscribers with optional Redis fan-out.
+    
+    Events are serialized once and published to a single Redis channel; each
+    worker's listener delivers them to its local subscribers. Without Redis,
+    events are delivered locally only. Delivery never blocks on a client: a
+    subscriber whose queue is full is dropped rather than slowing others.
+    """
+    
+    def __init__(self, redis: aioredis.Redis | None = None) -> None:
+        self._redis = redis
+        self._channels: dict[str, set[Subscriber]] = {}
+        self._listener: asyncio.Task[None] | None = None
+    
+    def subscriber_count(self, channel: str | None = None) -> int:
+        """Number of local subscribers, overall or on one channel."""
+        if channel is not None:
+            return len(self._channels.get(channel, ()))
+        return sum(len(subscribers) for subscribers in self._channels.values())
+    
+    def subscribe(self, channel: str, subscriber: Subscriber) -> None:
+        """Register a subscriber on a channel."""
+        self._channels.setdefault(channel, set()).add(subscriber)
+    
+    def unsubscribe(self, channel: str, subscriber: Subscriber) -> None:
+        """Remove a subscriber from a channel."""
+        subscribers = self._channels.get(channel)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._channels[channel]
+    
+    def deliver_local(self, channels: Iterable[str], message: str) -> None:
+        """Hand a serialized message to every local subscriber of the channels."""
+        for channel in channels:
+            slow = [s for s in self._channels.get(channel, ()) if not s.offer(message)]
+            for subscriber in slow:
+                logger.info("Dropping slow WebSocket subscriber on %s", channel)
+                subscriber.drop()
+                self.unsubscribe(channel, subscriber)
+    
+    async def publish(self, channels: list[str], event: dict[str, Any]) -> None:
+        """Publish an event to all workers' subscribers of the given channels.
+        
+        Best effort: events announce changes that are already persisted, so
+        a Redis failure is logged rather than failing the request (whose
+        retry would repeat the change).
+        """
+        message = json.dumps(event, default=str)
+        if self._redis is None:
+            self.deliver_local(channels, message)
+            return
+        envelope = json.dumps({"channels": channels, "message": message})
+        try:
+            await self._redis.publish(REDIS_CHANNEL, envelope)
+        except Exception:
+            logger.exception("Failed to publish a %s event", event.get("type", "broadcast"))
+    
+    async def start(self) -> None:
+        """Start relaying events published by any worker."""
+        if self._redis is not None and self._listener is None:
+            self._listener = asyncio.create_task(self._listen(), name="broadcast-listener")
+    
+    async def stop(self) -> None:
+        """Stop relaying events."""
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+    
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(REDIS_CHANNEL)
+                    async for item in pubsub.listen():
+                        if item["type"] != "message":
+                            continue
+                        envelope = json.loads(item["data"])
+                        self.deliver_local(envelope["channels"], envelope["message"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Broadcast listener failed, reconnecting")
+                await asyncio.sleep(1.0)
+
+
+hub = BroadcastHub(
+    cache_backend.client if isinstance(cache_backend, RedisCacheBackend) else None
+)
@@ -0,0 +1,124 @@
+"""Shared cache backends for state that must agree across workers."""
+
+import time
+from typing import Protocol
+
+from redis import asyncio as aioredis
+
+from app.config import settings
+
+
+class CacheBackend(Protocol):
+    """Minimal key-value interface used by the roster and other caches."""
+    
+    async def get(self, key: str) -> bytes | None:
+        """Return the value for ``key`` or None."""
+    
+    async def set(self, key: str, value: bytes, ttl: int | None = None) -> None:
+        """Store ``value`` under ``key`` with an optional TTL in seconds."""
+    
+    async def add(self, key: str, value: bytes, ttl: int | None = None) -> bool:
+        """Store ``value`` only if ``key`` is absent; return whether it was set."""
+    
+    async def incr(self, key: str, ttl: int | None = None) -> int:
+        """Atomically increment a counter and return the new value.
+        
+        With ``ttl`` the counter expires that many seconds after its last
+        increment; without it the counter never expires.
+        """
+    
+    async def delete(self, key: str) -> None:
+        """Remove ``key`` if present."""
+    
+    async def close(self) -> None:
+        """Release backend resources."""
+
+
+class RedisCacheBackend:
+    """Cache backend shared by all workers through Redis."""
+    
+    def __init__(self, url: str) -> None:
+        self._client = aioredis.from_url(url)
+    
+    @property
+    def client(self) -> aioredis.Redis:
+        """Underlying Redis client."""
+        return self._client
+    
+    async def get(self, key: str) -> bytes | None:
+        return await self._client.get(key)
+    
+    async def set(self, key: str, value: bytes, ttl: int | None = None) -> None:
+        await self._client.set(key, value, ex=ttl)
+    
+    async def add(self, key: str, value: bytes, ttl: int | None = None) -> bool:
+        return bool(await self._client.set(key, value, ex=ttl, nx=True))
+    
+    async def incr(self, key: str, ttl: int | None = None) -> int:
+        if ttl is None:
+            return int(await self._client.incr(key))
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, ttl)
+            value, _ = await pipe.execute()
+        return int(value)
+    
+    async def delete(self, key: str) -> None:
+        await self._client.delete(key)
+    
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class MemoryCacheBackend:
+    """Process-local stand-in for Redis, intended for tests and single workers."""
+    
+    def __init__(self) -> None:
+        self._data: dict[str, tuple[bytes, float | None]] = {}
+    
+    def _live(self, key: str) -> bytes | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+    
+    async def get(self, key: str) -> bytes | None:
+        return self._live(key)
+    
+    async def set(self, key: str, value: bytes, ttl: int | None = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._data[key] = (value, expires_at)
+    
+    async def add(self, key: str, value: bytes, ttl: int | None = None) -> bool:
+        if self._live(key) is not None:
+            return False
+        await self.set(key, value, ttl)
+        return True
+    
+    async def incr(self, key: str, ttl: int | None = None) -> int:
+        value = int(self._live(key) or 0) + 1
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._data[key] = (str(value).encode(), expires_at)
+        return value
+    
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+    
+    async def close(self) -> None:
+        self._data.clear()
+
+
+def create_cache_backend(kind: str = settings.cache_backend) -> CacheBackend:
+    """Create the configured cache backend."""
+    if kind == "redis":
+        return RedisCacheBackend(settings.redis_url)
+    if kind == "memory":
+        return MemoryCacheBackend()
+    raise ValueError(f"Unknown cache backend: {kind}")
+
+
+cache_backend = create_cache_backend()
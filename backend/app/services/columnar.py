@@ -0,0 +1,430 @@
+"""In-memory columnar copy of game results for vectorized dashboard queries."""
+
+import asyncio
+import logging
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import numpy as np
+from sqlalchemy import Select, func, select, tuple_
+
+from app.config import settings
+from app.database import ReadSessionLocal, replica_router
+from app.models.game_result import GameResult
+from app.services.partitions import retention_cutoff
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+MICROSECOND = timedelta(microseconds=1)
+HOUR_US = 3_600_000_000
+
+# Sorts after every id, so a watermark at it resumes with the next microsecond
+MAX_ID = uuid.UUID(int=2**128 - 1)
+
+# Sentinels for NULLs in integer columns
+NO_NAME = -1
+NO_DURATION = -1
+
+
+def to_micros(moment: datetime) -> int:
+    """Microseconds since the epoch, exact for aware datetimes."""
+    return (moment - EPOCH) // MICROSECOND
+
+
+class GrowableColumn:
+    """Append-only NumPy column with amortized O(1) appends.
+    
+    ``view`` returns the filled prefix. Growing reallocates, so views handed
+    out earlier keep pointing at the old, still valid, buffer.
+    """
+    
+    __slots__ = ("_data", "_size")
+    
+    def __init__(self, dtype: Any, capacity: int = 1024) -> None:
+        self._data = np.empty(capacity, dtype=dtype)
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def extend(self, values: np.ndarray) -> None:
+        """Append values, doubling the capacity when full."""
+        needed = self._size + len(values)
+        if needed > len(self._data):
+            grown = np.empty(max(needed, 2 * len(self._data)), dtype=self._data.dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        self._data[self._size:needed] = values
+        self._size = needed
+    
+    def view(self) -> np.ndarray:
+        """The appended values."""
+        return self._data[:self._size]
+    
+    def replace(self, values: np.ndarray) -> None:
+        """Swap in new contents; earlier views keep the old buffer."""
+        self._data = np.array(values, dtype=self._data.dtype)
+        self._size = len(values)
+
+
+class Dictionary:
+    """Dense integer codes for UUIDs."""
+    
+    __slots__ = ("codes", "values")
+    
+    def __init__(self) -> None:
+        self.codes: dict[uuid.UUID, int] = {}
+        self.values: list[uuid.UUID] = []
+    
+    def encode(self, value: uuid.UUID) -> int:
+        """Code of ``value``, assigning the next one if it is new."""
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+    
+    def compact(self, codes: np.ndarray, missing: int) -> np.ndarray:
+        """Keep only the values still referenced by ``codes``; returns them recoded."""
+        present = codes != missing
+        used, recoded = np.unique(codes[present], return_inverse=True)
+        self.values = [self.values[code] for code in used.tolist()]
+        self.codes = {value: code for code, value in enumerate(self.values)}
+        result = np.full(len(codes), missing, dtype=codes.dtype)
+        result[present] = recoded
+        return result
+
+
+@dataclass(frozen=True, slots=True)
+class ColumnarSnapshot:
+    """Consistent read-only view of a ``ColumnarStore`` at one watermark.
+    
+    Queries run on snapshots in worker threads while the event loop keeps
+    ingesting. The columns are views of buffers the store never writes
+    again below their length, and the dictionaries only grow between
+    compactions, which build new containers, so every code in the columns
+    keeps the value it had when the snapshot was taken.
+    """
+    
+    timestamps: np.ndarray
+    names: np.ndarray
+    durations: np.ndarray
+    sessions: np.ndarray
+    name_values: list[uuid.UUID]
+    name_codes: dict[uuid.UUID, int]
+    session_codes: dict[uuid.UUID, int]
+    watermark: tuple[datetime, uuid.UUID] | None = None
+    
+    def __len__(self) -> int:
+        """Number of spins held."""
+        return len(self.timestamps)
+    
+    def _select(
+        self,
+        start: datetime | None,
+        end: datetime | None,
+        name_id: uuid.UUID | None = None,
+        session_id: uuid.UUID | None = None,
+    ) -> tuple[slice, np.ndarray | None] | None:
+        """Row range for ``[start, end)`` plus a mask for the equality filters.
+        
+        None means no row can match, e.g. an id that never spun.
+        """
+        timestamps = self.timestamps
+        low, high = 0, len(timestamps)
+        if start is not None:
+            low = int(np.searchsorted(timestamps, to_micros(start)))
+        if end is not None:
+            high = max(low, int(np.searchsorted(timestamps, to_micros(end))))
+        rows = slice(low, high)
+        
+        mask = None
+        for column, codes, value in (
+            (self.names, self.name_codes, name_id),
+            (self.sessions, self.session_codes, session_id),
+        ):
+            if value is None:
+                continue
+            code = codes.get(value)
+            if code is None:
+                return None
+            matches = column[rows] == code
+            mask = matches if mask is None else mask & matches
+        return rows, mask
+    
+    @staticmethod
+    def _column(column: np.ndarray, selection: tuple[slice, np.ndarray | None]) -> np.ndarray:
+        rows, mask = selection
+        values = column[rows]
+        return values if mask is None else values[mask]
+    
+    def selection_counts(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        session_id: uuid.UUID | None = None,
+    ) -> list[tuple[uuid.UUID, int]]:
+        """Spins per name, most selected first."""
+        selection = self._select(start, end, session_id=session_id)
+        if selection is None:
+            return []
+        codes = self._column(self.names, selection)
+        counts = np.bincount(codes[codes != NO_NAME])
+        order = np.lexsort((np.arange(len(counts)), -counts))
+        values = self.name_values
+        return [(values[code], int(counts[code])) for code in order.tolist() if counts[code]]
+    
+    def heatmap(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        name_id: uuid.UUID | None = None,
+    ) -> np.ndarray:
+        """Spins by UTC weekday (Monday first) and hour of day, as a 7x24 matrix."""
+        selection = self._select(start, end, name_id=name_id)
+        if selection is None:
+            return np.zeros((7, 24), dtype=np.int64)
+        timestamps = self._column(self.timestamps, selection)
+        hours = timestamps // HOUR_US
+        # 1970-01-01 was a Thursday, three days after a Monday
+        weekday = (hours // 24 + 3) % 7
+        return np.bincount(weekday * 24 + hours % 24, minlength=7 * 24).reshape(7, 24)
+    
+    def duration_percentiles(
+        self,
+        percentiles: Sequence[float],
+        start: datetime | None = None,
+        end: datetime | None = None,
+        name_id: uuid.UUID | None = None,
+        session_id: uuid.UUID | None = None,
+    ) -> tuple[int, list[float] | None]:
+        """Number of timed spins and the requested duration percentiles."""
+        selection = self._select(start, end, name_id, session_id)
+        if selection is None:
+            return 0, None
+        durations = self._column(self.durations, selection)
+        durations = durations[durations != NO_DURATION]
+        if not len(durations):
+            return 0, None
+        return len(durations), np.percentile(durations, percentiles).tolist()
+
+
+class ColumnarStore:
+    """Game result facts as parallel arrays ordered by ``(created_at, id)``.
+    
+    Columns are the spin time in epoch microseconds, a name code, the spin
+    duration and a session code; names and sessions are dictionary encoded.
+    Because rows arrive in time order, time filters are binary searches and
+    every aggregate is a single vectorized pass over a contiguous slice.
+    About 20 bytes per spin are held in each worker that enables the store;
+    ``trim`` releases the rows that fell out of retention.
+    
+    Only the event loop mutates the store. Each change ends by publishing a
+    new ``snapshot`` in one assignment, and queries read that snapshot alone.
+    """
+    
+    def __init__(self) -> None:
+        self._timestamps = GrowableColumn(np.int64)
+        self._names = GrowableColumn(np.int32)
+        self._durations = GrowableColumn(np.int32)
+        self._sessions = GrowableColumn(np.int32)
+        self.name_dictionary = Dictionary()
+        self.session_dictionary = Dictionary()
+        self.watermark: tuple[datetime, uuid.UUID] | None = None
+        self.snapshot = self._snapshot()
+    
+    def __len__(self) -> int:
+        """Number of spins held."""
+        return len(self._timestamps)
+    
+    def _snapshot(self) -> ColumnarSnapshot:
+        return ColumnarSnapshot(
+            timestamps=self._timestamps.view(),
+            names=self._names.view(),
+            durations=self._durations.view(),
+            sessions=self._sessions.view(),
+            name_values=self.name_dictionary.values,
+            name_codes=self.name_dictionary.codes,
+            session_codes=self.session_dictionary.codes,
+            watermark=self.watermark,
+        )
+    
+    def append(self, rows: Sequence[Sequence[Any]]) -> None:
+        """Append ``(created_at, id, name_id, duration, session_id)`` rows in key order."""
+        if not rows:
+            return
+        names, sessions = self.name_dictionary, self.session_dictionary
+        count = len(rows)
+        self._timestamps.extend(np.fromiter((to_micros(row[0]) for row in rows), np.int64, count))
+        self._names.extend(np.fromiter(
+            (NO_NAME if row[2] is None else names.encode(row[2]) for row in rows), np.int32, count
+        ))
+        self._durations.extend(np.fromiter(
+            (NO_DURATION if row[3] is None else row[3] for row in rows), np.int32, count
+        ))
+        self._sessions.extend(np.fromiter(
+            (sessions.encode(row[4]) for row in rows), np.int32, count
+        ))
+        self.watermark = (rows[-1][0], rows[-1][1])
+        self.snapshot = self._snapshot()
+    
+    def count_since(self, moment: datetime) -> int:
+        """Number of spins at or after ``moment``."""
+        timestamps = self._timestamps.view()
+        return len(timestamps) - int(np.searchsorted(timestamps, to_micros(moment)))
+    
+    def truncate(self, moment: datetime) -> None:
+        """Drop spins at or after ``moment`` and resume ingesting from there."""
+        keep = int(np.searchsorted(self._timestamps.view(), to_micros(moment)))
+        for column in (self._timestamps, self._names, self._durations, self._sessions):
+            column.replace(column.view()[:keep])
+        # Spin times have microsecond precision, so nothing falls in between
+        self.watermark = (moment - MICROSECOND, MAX_ID)
+        self.snapshot = self._snapshot()
+    
+    def trim(self, moment: datetime) -> int:
+        """Drop spins before ``moment`` and the ids only they used; returns how many."""
+        drop = int(np.searchsorted(self._timestamps.view(), to_micros(moment)))
+        if not drop:
+            return 0
+        for column in (self._timestamps, self._durations):
+            column.replace(column.view()[drop:])
+        for column, dictionary, missing in (
+            (self._names, self.name_dictionary, NO_NAME),
+            (self._sessions, self.session_dictionary, -1),
+        ):
+            column.replace(dictionary.compact(column.view()[drop:], missing))
+        self.snapshot = self._snapshot()
+        return drop
+
+
+def ingest_query(
+    watermark: tuple[datetime, uuid.UUID] | None, horizon: datetime, limit: int
+) -> Select:
+    """Next rows after the watermark, up to ``horizon``, in key order."""
+    stmt = (
+        select(
+            GameResult.created_at,
+            GameResult.id,
+            GameResult.selected_name_id,
+            GameResult.spin_duration_ms,
+            GameResult.session_id,
+        )
+        .where(GameResult.created_at <= horizon)
+        .order_by(GameResult.created_at, GameResult.id)
+        .limit(limit)
+    )
+    if watermark is not None:
+        stmt = stmt.where(tuple_(GameResult.created_at, GameResult.id) > watermark)
+    return stmt
+
+
+def window_count_query(since: datetime, watermark: tuple[datetime, uuid.UUID]) -> Select:
+    """Number of rows from ``since`` up to and including the watermark."""
+    return select(func.count()).select_from(GameResult).where(
+        GameResult.created_at >= since,
+        tuple_(GameResult.created_at, GameResult.id) <= watermark,
+    )
+
+
+class ColumnarAnalytics:
+    """Keeps a ``ColumnarStore`` caught up with ``game_results``.
+    
+    Rows are pulled in ``(created_at, id)`` order after the watermark of the
+    last ingested row. Results carry their spin time but are written behind,
+    so only rows older than ``ingest_lag`` seconds are taken; younger ones
+    could still be joined by rows with an earlier timestamp. Dashboards
+    therefore trail the live wheel by that lag.
+    
+    Writes delayed longer than that (a database outage, replica lag) land
+    behind the watermark. Each refresh counts the rows of the trailing
+    ``rescan_window`` in the database and re-ingests the window when the
+    count differs from the store's. Rows older than the partition retention
+    are trimmed, as the database has dropped them too.
+    """
+    
+    def __init__(
+        self,
+        *,
+        ingest_lag: float = settings.columnar_ingest_lag,
+        rescan_window: float = settings.columnar_rescan_window,
+        refresh_interval: float = settings.columnar_refresh_interval,
+        batch_size: int = settings.columnar_batch_size,
+        retention_months: int = settings.game_results_retention_months,
+    ) -> None:
+        self.store = ColumnarStore()
+        self.ready = False
+        self._ingest_lag = timedelta(seconds=ingest_lag)
+        self._rescan_window = timedelta(seconds=rescan_window)
+        self._refresh_interval = refresh_interval
+        self._batch_size = batch_size
+        self._retention_months = retention_months
+        self._task: asyncio.Task[None] | None = None
+    
+    async def catch_up(self, now: datetime | None = None) -> int:
+        """Ingest every row older than the lag; returns how many were added."""
+        now = now or datetime.now(UTC)
+        horizon = now - self._ingest_lag
+        kept_since = None
+        if self._retention_months > 0:
+            month = retention_cutoff(now, self._retention_months)
+            kept_since = datetime(month.year, month.month, 1, tzinfo=UTC)
+            self.store.trim(kept_since)
+        await self._rescan(kept_since)
+        
+        added = 0
+        while True:
+            async with replica_router.reading() as target, ReadSessionLocal(bind=target) as db:
+                stmt = ingest_query(self.store.watermark, horizon, self._batch_size)
+                rows = (await db.execute(stmt)).all()
+            self.store.append(rows)
+            added += len(rows)
+            if len(rows) < self._batch_size:
+                return added
+            # Let requests run between large batches of the initial load
+            await asyncio.sleep(0)
+    
+    async def _rescan(self, kept_since: datetime | None) -> None:
+        watermark = self.store.watermark
+        if watermark is None:
+            return
+        since = watermark[0] - self._rescan_window
+        if kept_since is not None:
+            since = max(since, kept_since)
+        async with replica_router.reading() as target, ReadSessionLocal(bind=target) as db:
+            expected = await db.scalar(window_count_query(since, watermark))
+        held = self.store.count_since(since)
+        if expected != held:
+            logger.warning(
+                "Columnar store holds %d of %d results since %s; re-ingesting them",
+                held, expected, since.isoformat(),
+            )
+            self.store.truncate(since)
+    
+    async def start(self) -> None:
+        """Start catching up in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="columnar-analytics")
+    
+    async def stop(self) -> None:
+        """Stop catching up."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+    
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.catch_up()
+                self.ready = True
+            except Exception:
+                logger.exception("Columnar analytics refresh failed")
+            await asyncio.sleep(self._refresh_interval)
+
+
+columnar_analytics = ColumnarAnalytics()
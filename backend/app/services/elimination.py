@@ -0,0 +1,194 @@
+"""Per-session elimination wheels: weighted sampling without replacement."""
+
+import asyncio
+import random
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.elimination_round import EliminationRound
+from app.models.game_result import GameResult
+from app.services.cache import CacheBackend, cache_backend
+from app.services.roster import Roster, RosterEntry
+from app.services.sampler import FenwickTree
+
+ELIMINATION_MODE = "elimination"
+
+LOCK_STRIPES = 64
+
+# Held until the request's transaction ends, so draws and resets of one
+# session queue up across workers
+LOCK_SESSION = text("SELECT pg_advisory_xact_lock(hashtextextended(:key, 0))")
+LOCKED_AT = text("SELECT clock_timestamp()")
+
+
+class EliminationExhausted(LookupError):
+    """Every name of the roster has been eliminated in this round."""
+
+
+class EliminationState:
+    """Names still in play for one session, over one roster snapshot."""
+    
+    __slots__ = ("snapshot_key", "entries", "eliminated", "sequence", "_tree", "_remaining")
+    
+    def __init__(
+        self, roster: Roster, eliminated: set[uuid.UUID], sequence: int = 0
+    ) -> None:
+        self.snapshot_key = roster.snapshot_key if len(roster) else None
+        self.entries = roster.entries
+        self.eliminated = eliminated
+        self.sequence = sequence
+        weights = [0 if e.id in eliminated else e.weight for e in roster.entries]
+        self._tree = FenwickTree(weights)
+        self._remaining = sum(1 for weight in weights if weight)
+    
+    @property
+    def remaining(self) -> int:
+        """Names that can still be picked."""
+        return self._remaining
+    
+    def rebase(self, roster: Roster) -> "EliminationState":
+        """Same round over a changed roster; names added since are in play."""
+        return EliminationState(roster, self.eliminated, self.sequence)
+    
+    def pick(self, rng: random.Random | None = None) -> int:
+        """Index of a weighted random remaining entry, without removing it."""
+        if self._remaining == 0:
+            raise EliminationExhausted("All names have been eliminated")
+        return self._tree.sample(rng)
+    
+    def eliminate(self, index: int) -> None:
+        """Remove an entry from play in O(log n)."""
+        if self._tree.weight(index):
+            self._tree.remove(index)
+            self._remaining -= 1
+        self.eliminated.add(self.entries[index].id)
+
+
+async def lock_session(db: AsyncSession, session_id: uuid.UUID) -> datetime:
+    """Take the session's elimination lock for the rest of the transaction.
+    
+    Returns the database time once the lock is held. Picks and resets are
+    stamped with it, so their order in time is the order they held the lock.
+    """
+    await db.execute(LOCK_SESSION, {'key': f"elimination:{session_id}"})
+    return await db.scalar(LOCKED_AT)
+
+
+async def load_eliminated(db: AsyncSession, session_id: uuid.UUID) -> set[uuid.UUID]:
+    """Names picked in elimination mode since the session's last reset."""
+    started_at = await db.scalar(
+        select(EliminationRound.started_at).where(EliminationRound.session_id == session_id)
+    )
+    stmt = select(GameResult.selected_name_id).where(
+        GameResult.session_id == session_id,
+        GameResult.spin_mode == ELIMINATION_MODE,
+        GameResult.selected_name_id.is_not(None),
+    )
+    if started_at is not None:
+        stmt = stmt.where(GameResult.created_at >= started_at)
+    return set(await db.scalars(stmt))
+
+
+class EliminationStore:
+    """In-memory elimination state per session with LRU eviction.
+    
+    State is rebuilt from persisted elimination results whenever it is
+    missing (evicted, or after a restart). A per-session sequence in the
+    shared cache backend is bumped on every pick and reset, so a worker whose
+    copy fell behind another worker's picks recovers instead of re-picking
+    an eliminated name. Picks and resets of one session are serialized
+    within a worker by a striped lock and across workers by a database
+    advisory lock held until the request's transaction ends.
+    """
+    
+    SEQUENCE_KEY = "roulette:elimination:{session_id}:sequence"
+    
+    def __init__(
+        self,
+        capacity: int = settings.elimination_sessions,
+        backend: CacheBackend | None = None,
+        sequence_ttl: int = settings.roster_cache_ttl,
+    ) -> None:
+        self._capacity = capacity
+        self._backend = backend or cache_backend
+        self._sequence_ttl = sequence_ttl
+        self._states: OrderedDict[uuid.UUID, EliminationState] = OrderedDict()
+        self._locks = [asyncio.Lock() for _ in range(LOCK_STRIPES)]
+    
+    def __len__(self) -> int:
+        """Sessions currently held in memory."""
+        return len(self._states)
+    
+    def _lock(self, session_id: uuid.UUID) -> asyncio.Lock:
+        return self._locks[session_id.int % LOCK_STRIPES]
+    
+    def _key(self, session_id: uuid.UUID) -> str:
+        return self.SEQUENCE_KEY.format(session_id=session_id)
+    
+    async def _state(
+        self, db: AsyncSession, session_id: uuid.UUID, roster: Roster
+    ) -> EliminationState:
+        raw = await self._backend.get(self._key(session_id))
+        sequence = int(raw) if raw else 0
+        state = self._states.get(session_id)
+        if state is None or state.sequence != sequence:
+            state = EliminationState(roster, await load_eliminated(db, session_id), sequence)
+        elif state.snapshot_key != roster.snapshot_key:
+            state = state.rebase(roster)
+        
+        self._states[session_id] = state
+        self._states.move_to_end(session_id)
+        while len(self._states) > self._capacity:
+            self._states.popitem(last=False)
+        return state
+    
+    async def draw(
+        self,
+        db: AsyncSession,
+        session_id: uuid.UUID,
+        roster: Roster,
+        persist: Callable[[RosterEntry, datetime], Awaitable[None]],
+        rng: random.Random | None = None,
+    ) -> tuple[RosterEntry, int]:
+        """Pick and eliminate a name, returning it and how many remain.
+        
+        ``persist`` writes the pick, stamped with the time the session lock
+        was taken, in ``db``'s transaction and commits it. The sequence is
+        bumped before that, so no worker can keep using a copy that misses a
+        recorded pick; the name is removed locally only once both have
+        succeeded. If either fails the local copy no longer matches the
+        sequence and is rebuilt from the results on the next draw.
+        """
+        async with self._lock(session_id):
+            picked_at = await lock_session(db, session_id)
+            state = await self._state(db, session_id, roster)
+            index = state.pick(rng)
+            entry = state.entries[index]
+            sequence = await self._backend.incr(self._key(session_id), ttl=self._sequence_ttl)
+            await persist(entry, picked_at)
+            state.eliminate(index)
+            state.sequence = sequence
+            return entry, state.remaining
+    
+    async def reset(self, db: AsyncSession, session_id: uuid.UUID) -> None:
+        """Start a new round in which every active name is back in play."""
+        async with self._lock(session_id):
+            started_at = await lock_session(db, session_id)
+            stmt = pg_insert(EliminationRound).values(session_id=session_id, started_at=started_at)
+            await db.execute(stmt.on_conflict_do_update(
+                index_elements=[EliminationRound.session_id],
+                set_={'started_at': stmt.excluded.started_at},
+            ))
+            await db.commit()
+            self._states.pop(session_id, None)
+            await self._backend.incr(self._key(session_id), ttl=self._sequence_ttl)
+
+
+elimination_store = EliminationStore()
@@ -0,0 +1,114 @@
+"""Streaming export of game history."""
+
+import csv
+import io
+import json
+import uuid
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+from typing import Any, Literal
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.database import replica_router
+from app.models.game_result import GameResult
+from app.models.user_agent import UserAgent
+
+ExportFormat = Literal["csv", "ndjson"]
+
+EXPORT_CHUNK_ROWS = 1000
+
+EXPORT_COLUMNS = (
+    GameResult.id,
+    GameResult.created_at,
+    GameResult.session_id,
+    GameResult.selected_name_id,
+    GameResult.selected_name_snapshot["name"].astext.label("selected_name"),
+    GameResult.roster_snapshot_key,
+    GameResult.spin_duration_ms,
+    GameResult.user_id,
+    GameResult.user_ip,
+    # Rows written before interning still carry the string themselves
+    func.coalesce(UserAgent.user_agent, GameResult.user_agent).label("user_agent"),
+)
+
+EXPORT_FIELDS = tuple(column.key for column in EXPORT_COLUMNS)
+
+MEDIA_TYPES: dict[str, str] = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def export_query(
+    start: datetime | None = None,
+    end: datetime | None = None,
+    session_id: uuid.UUID | None = None,
+) -> Select:
+    """Build the export query with every filter pushed down into SQL."""
+    stmt = (
+        select(*EXPORT_COLUMNS)
+        .outerjoin(UserAgent, UserAgent.id == GameResult.user_agent_id)
+        .order_by(GameResult.created_at, GameResult.id)
+    )
+    if start is not None:
+        stmt = stmt.where(GameResult.created_at >= start)
+    if end is not None:
+        stmt = stmt.where(GameResult.created_at < end)
+    if session_id is not None:
+        stmt = stmt.where(GameResult.session_id == session_id)
+    return stmt
+
+
+def _text(value: Any) -> Any:
+    if value is None or isinstance(value, int | str):
+        return value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def format_csv(rows: Sequence[Sequence[Any]], header: bool = False) -> bytes:
+    """Encode rows as CSV, optionally preceded by the header line."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    writer.writerows([_text(value) for value in row] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def format_ndjson(rows: Sequence[Sequence[Any]]) -> bytes:
+    """Encode rows as newline-delimited JSON objects."""
+    lines = [
+        json.dumps(dict(zip(EXPORT_FIELDS, (_text(value) for value in row), strict=True)))
+        for row in rows
+    ]
+    return ("\n".join(lines) + "\n").encode("utf-8") if lines else b""
+
+
+async def stream_export(
+    stmt: Select, fmt: ExportFormat, bind: AsyncEngine | None = None
+) -> AsyncIterator[bytes]:
+    """Yield encoded chunks from a server-side cursor.
+    
+    The connection is owned by the generator rather than a request
+    dependency, since the response body is produced after the endpoint has
+    returned. Memory use is bounded by ``EXPORT_CHUNK_ROWS`` regardless of
+    export size. ``bind`` defaults to a read replica.
+    """
+    if fmt == "csv":
+        yield format_csv([], header=True)
+    
+    async with replica_router.reading(bind) as target, target.connect() as conn:
+        # Read engines run in autocommit, but a server-side cursor only lives
+        # inside a transaction; the override lasts until the connection is
+        # returned to the pool
+        await conn.execution_options(
+            isolation_level=conn.default_isolation_level, postgresql_readonly=True
+        )
+        async with conn.begin():
+            result = await conn.stream(stmt.execution_options(yield_per=EXPORT_CHUNK_ROWS))
+            async for rows in result.partitions():
+                yield format_csv(rows) if fmt == "csv" else format_ndjson(rows)
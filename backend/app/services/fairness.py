@@ -0,0 +1,319 @@
+"""Goodness-of-fit audits of spin outcomes against the roster weights.
+
+The result writer counts standard spins per ``(roster snapshot, name)`` in
+``fairness_counts`` (see ``app.services.rollups``); a snapshot fixes the
+weights every one of its spins was drawn with, so its expected counts are
+``spins * weight / total_weight``. Audits compare the two with a
+chi-square test and a Kolmogorov-Smirnov test over the snapshot's names in
+canonical (id) order, for many snapshots at once. Results written before
+the counters existed are added by ``backfill``::
+    
+    python -m app.services.fairness --window-hours 24
+"""
+
+import argparse
+import asyncio
+import logging
+import math
+import uuid
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.config import settings
+from app.database import close_db, engine
+from app.services.rollups import AUDITED_SPIN_MODE, rollup_watermark
+
+logger = logging.getLogger(__name__)
+
+ENSURE_STATE = text("""
+    INSERT INTO fairness_audit_state (id, streaming_since)
+    VALUES (1, now())
+    ON CONFLICT (id) DO NOTHING
+""")
+
+LOCK_STATE = text("""
+    SELECT streaming_since, backfilled_until
+    FROM fairness_audit_state
+    WHERE id = 1
+    FOR UPDATE
+""")
+
+OLDEST_RESULT = text("SELECT min(created_at) FROM game_results WHERE created_at < :before")
+
+# Counts by the name recorded in the snapshot, which survives name deletion
+BACKFILL_COUNTS = text("""
+    INSERT INTO fairness_counts AS f (snapshot_key, name_id, observed)
+    SELECT roster_snapshot_key, (selected_name_snapshot->>'id')::uuid, count(*)
+    FROM game_results
+    WHERE created_at >= :lower AND created_at < :upper
+      AND spin_mode = :spin_mode AND roster_snapshot_key IS NOT NULL
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+    ON CONFLICT (snapshot_key, name_id) DO UPDATE SET observed = f.observed + EXCLUDED.observed
+""")
+
+ADVANCE_BACKFILL = text("UPDATE fairness_audit_state SET backfilled_until = :until WHERE id = 1")
+
+_TINY = 1e-300
+_KOLMOGOROV_TERMS = np.arange(1, 101)
+
+
+def chi2_sf(statistic: float, dof: int) -> float:
+    """Upper tail probability of the chi-square distribution.
+    
+    The regularized upper incomplete gamma function Q(dof/2, statistic/2),
+    by its power series below the mean and a continued fraction above it.
+    """
+    a, x = dof / 2, statistic / 2
+    if x <= 0:
+        return 1.0
+    log_prefactor = a * math.log(x) - x - math.lgamma(a)
+    if x < a + 1:
+        term = total = 1 / a
+        n = a
+        while abs(term) > abs(total) * 1e-15:
+            n += 1
+            term *= x / n
+            total += term
+        return max(0.0, 1 - total * math.exp(log_prefactor))
+    # Modified Lentz evaluation of the continued fraction
+    b = x + 1 - a
+    c, d = 1 / _TINY, 1 / b
+    fraction = d
+    for i in range(1, 10_000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = 1 / (d if abs(d) > _TINY else _TINY)
+        c = b + an / c
+        c = c if abs(c) > _TINY else _TINY
+        fraction *= d * c
+        if abs(d * c - 1) < 1e-15:
+            break
+    return math.exp(log_prefactor) * fraction
+
+
+def kolmogorov_sf(statistic: np.ndarray, samples: np.ndarray) -> np.ndarray:
+    """Asymptotic p-values of KS statistics, with Stephens' small-sample correction.
+    
+    Over a discrete distribution the test is conservative: p-values are too
+    large, never too small, so it cannot raise false alarms on its own.
+    """
+    root = np.sqrt(np.maximum(samples, 1))
+    lam = (root + 0.12 + 0.11 / root) * statistic
+    signs = np.where(_KOLMOGOROV_TERMS % 2, 2.0, -2.0)
+    series = (signs * np.exp(-2 * np.outer(lam * lam, _KOLMOGOROV_TERMS ** 2))).sum(axis=1)
+    # The series converges slowly for tiny statistics, where the tail is 1
+    return np.where(lam < 0.2, 1.0, np.clip(series, 0.0, 1.0))
+
+
+@dataclass(slots=True)
+class SnapshotAudit:
+    """Goodness of fit of one roster snapshot's outcomes to its weights."""
+    
+    snapshot_key: str
+    names: int
+    spins: int
+    unexpected_spins: int
+    min_expected: float | None
+    chi_square: float | None
+    degrees_of_freedom: int
+    chi_square_p: float | None
+    ks_statistic: float | None
+    ks_p: float | None
+    sufficient: bool
+    drift: bool
+
+
+@dataclass(slots=True)
+class NameFit:
+    """Observed and expected selections of one name within a snapshot."""
+    
+    name_id: uuid.UUID
+    name: str
+    weight: int
+    observed: int
+    expected: float
+
+
+def ordered_entries(entries: Sequence[Mapping[str, Any]]) -> list[tuple[uuid.UUID, str, int]]:
+    """Snapshot entries as ``(id, name, weight)`` in the canonical id order.
+    
+    The KS statistic depends on the order of the categories; this is the
+    order ``RosterSnapshot.compute_key`` hashes, so it is fixed per snapshot.
+    """
+    return sorted(
+        (uuid.UUID(str(entry['id'])), entry['name'], entry.get('weight', 1))
+        for entry in entries
+    )
+
+
+def name_fits(
+    entries: Sequence[Mapping[str, Any]], observed: Mapping[uuid.UUID, int]
+) -> list[NameFit]:
+    """Per-name observed and expected counts for one snapshot."""
+    ordered = ordered_entries(entries)
+    spins = sum(observed.get(name_id, 0) for name_id, _, _ in ordered)
+    total_weight = sum(weight for _, _, weight in ordered)
+    return [
+        NameFit(
+            name_id=name_id,
+            name=name,
+            weight=weight,
+            observed=observed.get(name_id, 0),
+            expected=spins * weight / total_weight,
+        )
+        for name_id, name, weight in ordered
+    ]
+
+
+def audit_snapshots(
+    snapshots: Sequence[tuple[str, Sequence[Mapping[str, Any]]]],
+    observed: Mapping[str, Mapping[uuid.UUID, int]],
+    *,
+    alpha: float = settings.fairness_alpha,
+    min_expected: float = settings.fairness_min_expected,
+) -> list[SnapshotAudit]:
+    """Chi-square and KS tests of every snapshot against its weights.
+    
+    All snapshots are laid out back to back in flat arrays and reduced per
+    segment, so the cost is a handful of vectorized passes over the total
+    number of names. A snapshot is ``sufficient`` once every expected count
+    reaches ``min_expected``, where the chi-square approximation holds. It
+    is flagged as ``drift`` when either test rejects at ``alpha`` or when
+    spins selected a name that is not part of the snapshot at all.
+    """
+    if not snapshots:
+        return []
+    weights: list[int] = []
+    counts: list[int] = []
+    sizes: list[int] = []
+    unexpected: list[int] = []
+    for key, entries in snapshots:
+        seen = observed.get(key, {})
+        ordered = ordered_entries(entries)
+        weights.extend(weight for _, _, weight in ordered)
+        counts.extend(seen.get(name_id, 0) for name_id, _, _ in ordered)
+        sizes.append(len(ordered))
+        members = {name_id for name_id, _, _ in ordered}
+        unexpected.append(sum(n for name_id, n in seen.items() if name_id not in members))
+    
+    size = np.array(sizes)
+    starts = np.concatenate(([0], np.cumsum(size)[:-1]))
+    w = np.array(weights, dtype=np.int64)
+    o = np.array(counts, dtype=np.int64)
+    spins = np.add.reduceat(o, starts)
+    total_weight = np.add.reduceat(w, starts)
+    
+    expected = w * np.repeat(spins / total_weight, size)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cells = np.where(expected > 0, (o - expected) ** 2 / expected, 0.0)
+    chi_square = np.add.reduceat(cells, starts)
+    smallest = np.minimum.reduceat(expected, starts)
+    
+    # Cumulative distributions restart at every snapshot boundary
+    cum_o, cum_w = np.cumsum(o), np.cumsum(w)
+    observed_cdf = (cum_o - np.repeat(cum_o[starts] - o[starts], size)) / np.repeat(
+        np.maximum(spins, 1), size
+    )
+    expected_cdf = (cum_w - np.repeat(cum_w[starts] - w[starts], size)) / np.repeat(
+        total_weight, size
+    )
+    ks = np.maximum.reduceat(np.abs(observed_cdf - expected_cdf), starts)
+    ks_p = kolmogorov_sf(ks, spins)
+    
+    audits = []
+    for i, (key, _) in enumerate(snapshots):
+        dof = sizes[i] - 1
+        tested = bool(spins[i])
+        chi_p = chi2_sf(float(chi_square[i]), dof) if tested and dof else None
+        sufficient = chi_p is not None and smallest[i] >= min_expected
+        rejected = sufficient and (chi_p < alpha or ks_p[i] < alpha)
+        audits.append(SnapshotAudit(
+            snapshot_key=key,
+            names=sizes[i],
+            spins=int(spins[i]),
+            unexpected_spins=unexpected[i],
+            min_expected=float(smallest[i]) if tested else None,
+            chi_square=float(chi_square[i]) if tested else None,
+            degrees_of_freedom=dof,
+            chi_square_p=chi_p,
+            ks_statistic=float(ks[i]) if tested else None,
+            ks_p=float(ks_p[i]) if tested else None,
+            sufficient=bool(sufficient),
+            drift=bool(rejected or unexpected[i]),
+        ))
+    return audits
+
+
+async def ensure_audit_state(conn: AsyncConnection) -> None:
+    """Record when the writer started counting, unless already recorded."""
+    await conn.execute(ENSURE_STATE)
+
+
+async def backfill(target: AsyncEngine, window: timedelta = timedelta(days=1)) -> int:
+    """Count results older than the streaming counters, one time window at a time.
+    
+    Each window is aggregated by the database and merged into the counters
+    in its own transaction, together with the progress marker, so memory
+    stays bounded by the names spun within a window and an interrupted run
+    resumes where it stopped without counting anything twice. The state
+    row is locked for each window, which serializes concurrent runs.
+    Returns the number of windows processed.
+    """
+    windows = 0
+    while True:
+        async with target.begin() as conn:
+            state = (await conn.execute(LOCK_STATE)).one_or_none()
+            if state is None:
+                raise RuntimeError("fairness_audit_state is missing; run the migrations first")
+            streaming_since, lower = state
+            if lower is None:
+                lower = (await conn.execute(
+                    OLDEST_RESULT, {'before': streaming_since}
+                )).scalar() or streaming_since
+            if lower >= streaming_since:
+                await conn.execute(ADVANCE_BACKFILL, {'until': streaming_since})
+                return windows
+            upper = min(lower + window, streaming_since)
+            await conn.execute(BACKFILL_COUNTS, {
+                'lower': lower, 'upper': upper, 'spin_mode': AUDITED_SPIN_MODE
+            })
+            await conn.execute(ADVANCE_BACKFILL, {'until': upper})
+        windows += 1
+        logger.info("Fairness counters backfilled up to %s", upper.isoformat())
+        try:
+            await rollup_watermark.advance()
+        except Exception:
+            logger.exception("Failed to advance the rollup watermark")
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the backfill from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--window-hours", type=float, default=24.0,
+        help="history aggregated per transaction",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
+    async def run() -> int:
+        try:
+            return await backfill(engine, timedelta(hours=args.window_hours))
+        finally:
+            await close_db()
+    
+    windows = asyncio.run(run())
+    print(f"Backfilled {windows} windows")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
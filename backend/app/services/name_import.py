@@ -0,0 +1,230 @@
+"""Bulk import of names from CSV or JSON uploads."""
+
+import csv
+import io
+import json
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any, Literal
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.name import clean_description, clean_name, clean_weight
+
+ImportFormat = Literal["csv", "json"]
+ConflictMode = Literal["update", "skip"]
+
+IMPORT_FIELDS = ("name", "description", "is_active", "weight")
+UPDATABLE_FIELDS = ("description", "is_active", "weight")
+
+TRUE_VALUES = frozenset({"1", "true", "t", "yes", "y"})
+FALSE_VALUES = frozenset({"0", "false", "f", "no", "n"})
+
+# One statement for the whole batch: rows travel as five array parameters,
+# so the batch size is not bounded by the driver's parameter limit.
+_INSERT = """
+INSERT INTO names AS n (id, name, description, is_active, weight, created_at, updated_at)
+SELECT t.id, t.name, t.description, t.is_active, t.weight, $6, $6
+FROM unnest($1::uuid[], $2::varchar[], $3::text[], $4::boolean[], $5::integer[])
+    AS t (id, name, description, is_active, weight)
+"""
+
+
+class ImportFileError(ValueError):
+    """The upload as a whole cannot be parsed."""
+
+
+@dataclass(frozen=True, slots=True)
+class ImportRow:
+    """A validated row ready for the upsert."""
+    
+    name: str
+    description: str | None = None
+    is_active: bool = True
+    weight: int = 1
+
+
+@dataclass(frozen=True, slots=True)
+class RowError:
+    """Why one input row was rejected; rows are numbered from 1."""
+    
+    row: int
+    error: str
+    name: str | None = None
+
+
+@dataclass(slots=True)
+class ImportBatch:
+    """Outcome of validating an upload."""
+    
+    rows: list[ImportRow] = field(default_factory=list)
+    errors: list[RowError] = field(default_factory=list)
+    fields: frozenset[str] = frozenset()
+    duplicates: int = 0
+    received: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class UpsertCounts:
+    """Rows written by the upsert."""
+    
+    inserted: int
+    updated: int
+
+
+def detect_format(filename: str | None, content_type: str | None) -> ImportFormat:
+    """Infer the upload format from its extension or content type."""
+    name = (filename or "").lower()
+    kind = (content_type or "").lower()
+    if name.endswith(".json") or "json" in kind:
+        return "json"
+    if name.endswith((".csv", ".txt")) or "csv" in kind or kind.startswith("text/"):
+        return "csv"
+    raise ImportFileError("Cannot tell the file format; upload a .csv or .json file")
+
+
+def parse_csv(data: bytes) -> tuple[list[dict[str, Any]], frozenset[str]]:
+    """Rows of a CSV file with a header line containing at least ``name``."""
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError as exc:
+        raise ImportFileError("CSV file must be UTF-8 encoded") from exc
+    reader = csv.DictReader(io.StringIO(text, newline=""))
+    header = {column.strip().lower() for column in reader.fieldnames or ()}
+    if "name" not in header:
+        raise ImportFileError("CSV header must include a 'name' column")
+    try:
+        rows = [
+            {key.strip().lower(): value for key, value in row.items() if key is not None}
+            for row in reader
+        ]
+    except csv.Error as exc:
+        raise ImportFileError(f"Invalid CSV: {exc}") from exc
+    return rows, frozenset(header & set(IMPORT_FIELDS))
+
+
+def parse_json(data: bytes) -> tuple[list[dict[str, Any]], frozenset[str]]:
+    """Rows of a JSON array of objects, or of strings as bare names."""
+    try:
+        payload = json.loads(data)
+    except (UnicodeDecodeError, ValueError) as exc:
+        raise ImportFileError(f"Invalid JSON: {exc}") from exc
+    if not isinstance(payload, list):
+        raise ImportFileError("JSON upload must be an array of names")
+    rows = [{'name': item} if isinstance(item, str) else item for item in payload]
+    fields = {key for row in rows if isinstance(row, dict) for key in row}
+    return rows, frozenset(fields & set(IMPORT_FIELDS))
+
+
+def _parse_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in TRUE_VALUES:
+            return True
+        if lowered in FALSE_VALUES:
+            return False
+    raise ValueError(f"Invalid is_active value: {value!r}")
+
+
+def _parse_weight(value: Any) -> int:
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid weight: {value!r}")
+    if isinstance(value, int):
+        return clean_weight(value)
+    if isinstance(value, str) and value.strip().lstrip("-").isdigit():
+        return clean_weight(int(value))
+    raise ValueError(f"Invalid weight: {value!r}")
+
+
+def validate_row(raw: Any) -> ImportRow:
+    """Validate one input row with the same rules as the ``Name`` model."""
+    if not isinstance(raw, dict):
+        raise ValueError("Row must be an object")
+    name = raw.get("name")
+    if not isinstance(name, str):
+        raise ValueError("Name cannot be empty")
+    description = raw.get("description")
+    if description is not None and not isinstance(description, str):
+        raise ValueError("Description must be a string")
+    is_active = raw.get("is_active")
+    weight = raw.get("weight")
+    return ImportRow(
+        name=clean_name(name),
+        description=clean_description(description),
+        # Blank CSV cells take the column default
+        is_active=True if is_active in (None, "") else _parse_bool(is_active),
+        weight=1 if weight in (None, "") else _parse_weight(weight),
+    )
+
+
+def validate_rows(raw_rows: Iterable[Any], fields: frozenset[str]) -> ImportBatch:
+    """Validate every row, collecting errors instead of stopping at the first.
+    
+    Names are deduplicated ignoring case and the last occurrence wins, which
+    is also required by the upsert: one statement cannot update a row twice.
+    """
+    batch = ImportBatch(fields=fields)
+    by_name: dict[str, ImportRow] = {}
+    for number, raw in enumerate(raw_rows, start=1):
+        batch.received += 1
+        try:
+            row = validate_row(raw)
+        except ValueError as exc:
+            name = raw.get("name") if isinstance(raw, dict) else None
+            batch.errors.append(
+                RowError(number, str(exc), name if isinstance(name, str) else None)
+            )
+            continue
+        key = row.name.lower()
+        if key in by_name:
+            batch.duplicates += 1
+            del by_name[key]
+        by_name[key] = row
+    batch.rows = list(by_name.values())
+    return batch
+
+
+def upsert_sql(fields: frozenset[str], on_conflict: ConflictMode) -> str:
+    """Upsert statement that only overwrites columns present in the upload."""
+    columns = [column for column in UPDATABLE_FIELDS if column in fields]
+    if on_conflict == "skip" or not columns:
+        return _INSERT + "ON CONFLICT (lower(name)) DO NOTHING\nRETURNING true AS inserted\n"
+    assignments = ", ".join(f"{column} = EXCLUDED.{column}" for column in columns)
+    current = ", ".join(f"n.{column}" for column in columns)
+    incoming = ", ".join(f"EXCLUDED.{column}" for column in columns)
+    # Unchanged rows are neither rewritten nor returned
+    return (
+        _INSERT
+        + f"ON CONFLICT (lower(name)) DO UPDATE SET {assignments}, "
+        + "updated_at = EXCLUDED.updated_at\n"
+        + f"WHERE ROW({current}) IS DISTINCT FROM ROW({incoming})\n"
+        + "RETURNING (xmax = 0) AS inserted\n"
+    )
+
+
+async def upsert_names(
+    db: AsyncSession,
+    rows: list[ImportRow],
+    fields: frozenset[str],
+    on_conflict: ConflictMode = "update",
+) -> UpsertCounts:
+    """Write validated rows in one statement inside the session's transaction."""
+    if not rows:
+        return UpsertCounts(0, 0)
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    records = await raw.driver_connection.fetch(
+        upsert_sql(fields, on_conflict),
+        [uuid.uuid4() for _ in rows],
+        [row.name for row in rows],
+        [row.description for row in rows],
+        [row.is_active for row in rows],
+        [row.weight for row in rows],
+        datetime.now(UTC),
+    )
+    inserted = sum(1 for record in records if record["inserted"])
+    return UpsertCounts(inserted, len(records) - inserted)
@@ -0,0 +1,153 @@
+"""Monthly range partitions and retention for the game_results table."""
+
+import asyncio
+import logging
+import re
+from datetime import UTC, date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "game_results"
+PARTITION_PREFIX = f"{PARENT_TABLE}_p"
+PARTITION_PATTERN = re.compile(rf"^{PARTITION_PREFIX}(\d{{4}})(\d{{2}})$")
+
+LIST_PARTITIONS = text("""
+    SELECT child.relname
+    FROM pg_inherits
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE parent.relname = :parent
+""")
+
+
+def month_start(moment: date | datetime) -> date:
+    """First day of the month containing ``moment`` (UTC for datetimes)."""
+    if isinstance(moment, datetime):
+        moment = moment.astimezone(UTC).date()
+    return moment.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    """Shift a first-of-month date by a number of months."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Table name of the partition holding ``month``."""
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+def parse_partition_name(name: str) -> date | None:
+    """Month covered by a partition table name, or None if not ours."""
+    match = PARTITION_PATTERN.match(name)
+    if match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def create_partition_sql(month: date) -> str:
+    """DDL for the partition covering one UTC month."""
+    lower = datetime(month.year, month.month, 1, tzinfo=UTC)
+    upper_month = add_months(month, 1)
+    upper = datetime(upper_month.year, upper_month.month, 1, tzinfo=UTC)
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{partition_name(month)}" '
+        f'PARTITION OF "{PARENT_TABLE}" '
+        f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+    )
+
+
+def retention_cutoff(now: datetime, retention_months: int) -> date:
+    """First month kept under the retention window; older ones are dropped."""
+    return add_months(month_start(now), -retention_months)
+
+
+def expired_months(months: list[date], now: datetime, retention_months: int) -> list[date]:
+    """Partitions whose whole range is older than the retention window."""
+    cutoff = retention_cutoff(now, retention_months)
+    return sorted(month for month in months if month < cutoff)
+
+
+async def ensure_partitions(
+    conn: AsyncConnection,
+    now: datetime | None = None,
+    months_ahead: int = settings.partition_months_ahead,
+) -> list[str]:
+    """Create partitions for the current month and the next ``months_ahead``."""
+    current = month_start(now or datetime.now(UTC))
+    months = [add_months(current, offset) for offset in range(months_ahead + 1)]
+    for month in months:
+        await conn.execute(text(create_partition_sql(month)))
+    return [partition_name(month) for month in months]
+
+
+async def prune_partitions(
+    conn: AsyncConnection,
+    now: datetime | None = None,
+    retention_months: int = settings.game_results_retention_months,
+) -> list[str]:
+    """Drop whole partitions older than the retention window.
+    
+    Dropping a partition is a metadata operation, unlike DELETE it leaves no
+    dead tuples behind for vacuum. A retention of 0 keeps everything.
+    """
+    if retention_months <= 0:
+        return []
+    
+    names = (await conn.execute(LIST_PARTITIONS, {"parent": PARENT_TABLE})).scalars()
+    months = [month for month in map(parse_partition_name, names) if month is not None]
+    dropped = []
+    for month in expired_months(months, now or datetime.now(UTC), retention_months):
+        name = partition_name(month)
+        await conn.execute(text(f'ALTER TABLE "{PARENT_TABLE}" DETACH PARTITION "{name}"'))
+        await conn.execute(text(f'DROP TABLE "{name}"'))
+        dropped.append(name)
+    return dropped
+
+
+async def maintain_partitions(engine: AsyncEngine) -> None:
+    """Create upcoming partitions and prune expired ones in one transaction."""
+    async with engine.begin() as conn:
+        await ensure_partitions(conn)
+        dropped = await prune_partitions(conn)
+    if dropped:
+        logger.info("Dropped expired game_results partitions: %s", ", ".join(dropped))
+
+
+class PartitionMaintainer:
+    """Background task that keeps partitions ahead of time and prunes old ones."""
+    
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        interval: float = settings.partition_maintenance_interval,
+    ) -> None:
+        self._engine = engine
+        self._interval = interval
+        self._task: asyncio.Task[None] | None = None
+    
+    async def start(self) -> None:
+        """Start periodic maintenance."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="partition-maintainer")
+    
+    async def stop(self) -> None:
+        """Stop periodic maintenance."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+    
+    async def _run(self) -> None:
+        while True:
+            try:
+                await maintain_partitions(self._engine)
+            except Exception:
+                logger.exception("Partition maintenance failed")
+            await asyncio.sleep(self._interval)
@@ -0,0 +1,268 @@
+"""Write-behind buffer that persists game results with asyncpg COPY."""
+
+import asyncio
+import json
+import logging
+import uuid
+from collections.abc import Awaitable, Callable, Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import engine
+from app.services.rollups import (
+    RollupBatch,
+    aggregate_results,
+    apply_rollups,
+    rollup_watermark,
+)
+
+logger = logging.getLogger(__name__)
+
+RESULT_COLUMNS = (
+    "id",
+    "session_id",
+    "selected_name_id",
+    "selected_name_snapshot",
+    "roster_snapshot_key",
+    "spin_duration_ms",
+    "user_id",
+    "user_ip",
+    "user_agent_id",
+    "created_at",
+    "updated_at",
+    "spin_mode",
+)
+
+ResultRecord = tuple[Any, ...]
+ResultSink = Callable[[Sequence[ResultRecord]], Awaitable[None]]
+
+MAX_RETRY_DELAY = 5.0
+
+
+def build_result_record(
+    *,
+    session_id: uuid.UUID,
+    selected_name_id: uuid.UUID,
+    selected_name_snapshot: dict[str, Any],
+    roster_snapshot_key: str,
+    created_at: datetime,
+    spin_duration_ms: int | None = None,
+    user_id: uuid.UUID | None = None,
+    user_ip: str | None = None,
+    user_agent_id: int | None = None,
+    spin_mode: str = "standard",
+    id: uuid.UUID | None = None,
+) -> ResultRecord:
+    """Build a COPY-ready row in ``RESULT_COLUMNS`` order.
+    
+    Timestamps are taken at spin time rather than flush time, and JSONB is
+    passed pre-encoded because that is what the asyncpg JSONB codec expects.
+    """
+    return (
+        id or uuid.uuid4(),
+        session_id,
+        selected_name_id,
+        json.dumps(selected_name_snapshot),
+        roster_snapshot_key,
+        spin_duration_ms,
+        user_id,
+        user_ip,
+        user_agent_id,
+        created_at,
+        created_at,
+        spin_mode,
+    )
+
+
+async def write_results(
+    driver: Any, records: Sequence[ResultRecord], rollups: RollupBatch
+) -> None:
+    """COPY records and merge their rollups within the connection's transaction."""
+    await driver.copy_records_to_table("game_results", records=records, columns=RESULT_COLUMNS)
+    await apply_rollups(driver, rollups)
+
+
+async def advance_rollup_watermark() -> None:
+    """Advance the rollup watermark after results were committed."""
+    try:
+        await rollup_watermark.advance()
+    except Exception:
+        # The rows are committed; raising would make the caller write them
+        # again. Analytics ETags catch up with the next batch.
+        logger.exception("Failed to advance the rollup watermark")
+
+
+async def copy_results(records: Sequence[ResultRecord]) -> None:
+    """Insert records with a single binary COPY inside one transaction.
+    
+    The analytics rollups are updated in the same transaction, so they never
+    count a result that was not written or miss one that was. The rollup
+    watermark is advanced after the commit.
+    """
+    rollups = aggregate_results(records)
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        driver = raw.driver_connection
+        async with driver.transaction():
+            await write_results(driver, records, rollups)
+    await advance_rollup_watermark()
+
+
+async def commit_results(db: AsyncSession, records: Sequence[ResultRecord]) -> None:
+    """Like ``copy_results``, but in the session's transaction, which is committed.
+    
+    For writes that must happen under locks the session holds, without
+    checking out a second connection while holding them.
+    """
+    rollups = aggregate_results(records)
+    raw = await (await db.connection()).get_raw_connection()
+    await write_results(raw.driver_connection, records, rollups)
+    await db.commit()
+    await advance_rollup_watermark()
+
+
+class ResultWriter:
+    """Bounded in-process queue flushed to the database in batches.
+    
+    A batch is written when it reaches ``batch_size`` records or when
+    ``flush_interval`` seconds have passed since its first record. Producers
+    block once ``max_size`` records are waiting, so a slow database turns into
+    backpressure instead of unbounded memory growth.
+    """
+    
+    def __init__(
+        self,
+        sink: ResultSink = copy_results,
+        *,
+        max_size: int = settings.result_buffer_size,
+        batch_size: int = settings.result_batch_size,
+        flush_interval: float = settings.result_flush_interval,
+    ) -> None:
+        self._sink = sink
+        self._queue: asyncio.Queue[ResultRecord] = asyncio.Queue(maxsize=max_size)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._pending: list[ResultRecord] = []
+        self._task: asyncio.Task[None] | None = None
+        self._stopping = asyncio.Event()
+    
+    @property
+    def running(self) -> bool:
+        """Whether the background flush loop is active."""
+        return self._task is not None and not self._task.done()
+    
+    @property
+    def backlog(self) -> int:
+        """Records accepted but not yet written."""
+        return self._queue.qsize() + len(self._pending)
+    
+    async def start(self) -> None:
+        """Start the background flush loop."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="result-writer")
+    
+    async def submit(self, record: ResultRecord) -> None:
+        """Queue a record, waiting for room if the buffer is full."""
+        if not self.running:
+            raise RuntimeError("Result writer is not running")
+        await self._queue.put(record)
+    
+    async def stop(self) -> None:
+        """Stop the flush loop and write everything still buffered.
+        
+        The loop is asked to finish its current batch and exit rather than
+        being cancelled, since a cancel landing after a COPY committed would
+        make the drain write the same rows again.
+        """
+        if self._task is not None:
+            self._stopping.set()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        
+        try:
+            while not self._queue.empty():
+                self._pending.append(self._queue.get_nowait())
+                if len(self._pending) >= self._batch_size:
+                    await self._flush()
+            await self._flush()
+        except Exception:
+            logger.error("Shutdown drain failed, discarding %d game results", self.backlog)
+            self._discard()
+            raise
+        finally:
+            self._stopping.clear()
+    
+    def _discard(self) -> None:
+        self._pending = []
+        while not self._queue.empty():
+            self._queue.get_nowait()
+    
+    async def _next(self, timeout: float | None) -> ResultRecord | None:
+        """Next queued record, or None on timeout or once stopping."""
+        if not self._queue.empty():
+            return self._queue.get_nowait()
+        if self._stopping.is_set():
+            return None
+        get = asyncio.ensure_future(self._queue.get())
+        stopping = asyncio.ensure_future(self._stopping.wait())
+        try:
+            await asyncio.wait(
+                (get, stopping), timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            stopping.cancel()
+            if not get.done():
+                # The item stays queued until a getter actually resumes
+                get.cancel()
+        return get.result() if get.done() and not get.cancelled() else None
+    
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while not self._stopping.is_set():
+            record = await self._next(None)
+            if record is None:
+                break
+            self._pending.append(record)
+            deadline = loop.time() + self._flush_interval
+            while len(self._pending) < self._batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                record = await self._next(timeout)
+                if record is None:
+                    break
+                self._pending.append(record)
+            await self._flush_with_retry()
+    
+    async def _flush(self) -> None:
+        if not self._pending:
+            return
+        await self._sink(self._pending)
+        # Only reset after the sink succeeded so a failed flush keeps its
+        # records for the retry or the shutdown drain.
+        self._pending = []
+    
+    async def _flush_with_retry(self) -> None:
+        delay = self._flush_interval
+        while True:
+            try:
+                await self._flush()
+                return
+            except Exception:
+                logger.exception(
+                    "Failed to flush %d game results, retrying in %.1fs",
+                    len(self._pending),
+                    delay,
+                )
+            # Stopping leaves the batch to the shutdown drain's last attempt
+            try:
+                await asyncio.wait_for(self._stopping.wait(), delay)
+                return
+            except TimeoutError:
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+
+
+result_writer = ResultWriter()
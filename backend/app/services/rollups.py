@@ -0,0 +1,278 @@
+"""Incremental maintenance of the spin rollup tables."""
+
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime
+from operator import itemgetter
+from typing import Any
+
+from app.services.cache import CacheBackend, cache_backend
+from app.services.sketches import (
+    DAILY_SKETCHES,
+    HOURLY_SKETCHES,
+    SketchInput,
+    apply_sketches,
+    daily_sketches,
+)
+
+# Positions within result records, see result_writer.RESULT_COLUMNS
+RECORD_SESSION_ID = 1
+RECORD_NAME_ID = 2
+RECORD_SNAPSHOT_KEY = 4
+RECORD_DURATION = 5
+RECORD_USER_ID = 6
+RECORD_USER_IP = 7
+RECORD_USER_AGENT_ID = 8
+RECORD_CREATED_AT = 9
+RECORD_SPIN_MODE = 11
+
+# Only standard spins draw from the snapshot weights; elimination rounds
+# draw from what is left of the wheel
+AUDITED_SPIN_MODE = "standard"
+
+# Client rollup key for results without an interned agent; agent ids start at 1
+NO_USER_AGENT = 0
+
+_STATS_COLUMNS = (
+    "spin_count, duration_count, duration_sum, duration_sq_sum, "
+    "duration_min, duration_max"
+)
+
+_STATS_MERGE = """
+    spin_count = r.spin_count + EXCLUDED.spin_count,
+    duration_count = r.duration_count + EXCLUDED.duration_count,
+    duration_sum = r.duration_sum + EXCLUDED.duration_sum,
+    duration_sq_sum = r.duration_sq_sum + EXCLUDED.duration_sq_sum,
+    duration_min = LEAST(r.duration_min, EXCLUDED.duration_min),
+    duration_max = GREATEST(r.duration_max, EXCLUDED.duration_max)"""
+
+HOURLY_UPSERT = f"""
+INSERT INTO spin_rollups_hourly AS r (bucket_start, name_id, {_STATS_COLUMNS})
+VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+ON CONFLICT (bucket_start, name_id) DO UPDATE SET{_STATS_MERGE}
+"""
+
+DAILY_UPSERT = f"""
+INSERT INTO spin_rollups_daily AS r (bucket_date, name_id, {_STATS_COLUMNS})
+VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+ON CONFLICT (bucket_date, name_id) DO UPDATE SET{_STATS_MERGE}
+"""
+
+SESSION_UPSERT = f"""
+INSERT INTO session_rollups AS r (session_id, first_spin_at, last_spin_at, {_STATS_COLUMNS})
+VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+ON CONFLICT (session_id) DO UPDATE SET
+    first_spin_at = LEAST(r.first_spin_at, EXCLUDED.first_spin_at),
+    last_spin_at = GREATEST(r.last_spin_at, EXCLUDED.last_spin_at),{_STATS_MERGE}
+"""
+
+CLIENT_HOURLY_UPSERT = """
+INSERT INTO client_rollups_hourly AS r (bucket_start, user_agent_id, spin_count)
+VALUES ($1, $2, $3)
+ON CONFLICT (bucket_start, user_agent_id) DO UPDATE SET spin_count = r.spin_count + EXCLUDED.spin_count
+"""
+
+CLIENT_DAILY_UPSERT = """
+INSERT INTO client_rollups_daily AS r (bucket_date, user_agent_id, spin_count)
+VALUES ($1, $2, $3)
+ON CONFLICT (bucket_date, user_agent_id) DO UPDATE SET spin_count = r.spin_count + EXCLUDED.spin_count
+"""
+
+FAIRNESS_UPSERT = """
+INSERT INTO fairness_counts AS f (snapshot_key, name_id, observed)
+VALUES ($1, $2, $3)
+ON CONFLICT (snapshot_key, name_id) DO UPDATE SET observed = f.observed + EXCLUDED.observed
+"""
+
+
+@dataclass(slots=True)
+class DurationStats:
+    """Additive count and duration statistics for one rollup key."""
+    
+    spin_count: int = 0
+    duration_count: int = 0
+    duration_sum: int = 0
+    duration_sq_sum: float = 0.0
+    duration_min: int | None = None
+    duration_max: int | None = None
+    
+    def add(self, duration: int | None) -> None:
+        """Account for one spin."""
+        self.spin_count += 1
+        if duration is None:
+            return
+        self.duration_count += 1
+        self.duration_sum += duration
+        self.duration_sq_sum += float(duration) * duration
+        if self.duration_min is None or duration < self.duration_min:
+            self.duration_min = duration
+        if self.duration_max is None or duration > self.duration_max:
+            self.duration_max = duration
+    
+    def values(self) -> tuple[Any, ...]:
+        """Column values in rollup table order."""
+        return (
+            self.spin_count,
+            self.duration_count,
+            self.duration_sum,
+            self.duration_sq_sum,
+            self.duration_min,
+            self.duration_max,
+        )
+
+
+@dataclass(slots=True)
+class SessionStats(DurationStats):
+    """Duration statistics plus the time span of a session."""
+    
+    first_spin_at: datetime | None = None
+    last_spin_at: datetime | None = None
+    
+    def add_at(self, created_at: datetime, duration: int | None) -> None:
+        """Account for one spin at ``created_at``."""
+        self.add(duration)
+        if self.first_spin_at is None or created_at < self.first_spin_at:
+            self.first_spin_at = created_at
+        if self.last_spin_at is None or created_at > self.last_spin_at:
+            self.last_spin_at = created_at
+
+
+@dataclass(slots=True)
+class RollupBatch:
+    """Rollup deltas for one batch of written results."""
+    
+    hourly: dict[tuple[datetime, uuid.UUID], DurationStats] = field(default_factory=dict)
+    daily: dict[tuple[date, uuid.UUID], DurationStats] = field(default_factory=dict)
+    sessions: dict[uuid.UUID, SessionStats] = field(default_factory=dict)
+    sketches: dict[datetime, SketchInput] = field(default_factory=dict)
+    clients_hourly: dict[tuple[datetime, int], int] = field(default_factory=dict)
+    clients_daily: dict[tuple[date, int], int] = field(default_factory=dict)
+    fairness: dict[tuple[str, uuid.UUID], int] = field(default_factory=dict)
+
+
+def hour_bucket(moment: datetime) -> datetime:
+    """Start of the UTC hour containing ``moment``."""
+    return moment.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+
+
+def aggregate_results(records: Sequence[tuple[Any, ...]]) -> RollupBatch:
+    """Collapse result records into per-key rollup deltas."""
+    batch = RollupBatch()
+    for record in records:
+        created_at = record[RECORD_CREATED_AT]
+        duration = record[RECORD_DURATION]
+        name_id = record[RECORD_NAME_ID]
+        session_id = record[RECORD_SESSION_ID]
+        hour = hour_bucket(created_at)
+        day = hour.date()
+        
+        if name_id is not None:
+            hourly = batch.hourly.get((hour, name_id))
+            if hourly is None:
+                hourly = batch.hourly[(hour, name_id)] = DurationStats()
+            hourly.add(duration)
+            
+            daily = batch.daily.get((day, name_id))
+            if daily is None:
+                daily = batch.daily[(day, name_id)] = DurationStats()
+            daily.add(duration)
+        
+        session = batch.sessions.get(session_id)
+        if session is None:
+            session = batch.sessions[session_id] = SessionStats()
+        session.add_at(created_at, duration)
+        
+        values = batch.sketches.get(hour)
+        if values is None:
+            values = batch.sketches[hour] = SketchInput()
+        values.users.append(record[RECORD_USER_ID])
+        values.ips.append(record[RECORD_USER_IP])
+        values.sessions.append(session_id)
+        if duration is not None:
+            values.durations.append(duration)
+        
+        agent_id = record[RECORD_USER_AGENT_ID]
+        if agent_id is None:
+            agent_id = NO_USER_AGENT
+        key = (hour, agent_id)
+        batch.clients_hourly[key] = batch.clients_hourly.get(key, 0) + 1
+        key = (day, agent_id)
+        batch.clients_daily[key] = batch.clients_daily.get(key, 0) + 1
+        
+        snapshot_key = record[RECORD_SNAPSHOT_KEY]
+        if (
+            name_id is not None
+            and snapshot_key is not None
+            and record[RECORD_SPIN_MODE] == AUDITED_SPIN_MODE
+        ):
+            key = (snapshot_key, name_id)
+            batch.fairness[key] = batch.fairness.get(key, 0) + 1
+    return batch
+
+
+async def apply_rollups(driver: Any, batch: RollupBatch) -> None:
+    """Merge rollup deltas into the rollup tables on an asyncpg connection.
+    
+    Rows are sorted by key so concurrent writers lock rollup rows in the
+    same order and cannot deadlock each other.
+    """
+    if batch.hourly:
+        await driver.executemany(HOURLY_UPSERT, [
+            (bucket, name_id, *stats.values())
+            for (bucket, name_id), stats in sorted(batch.hourly.items(), key=itemgetter(0))
+        ])
+    if batch.daily:
+        await driver.executemany(DAILY_UPSERT, [
+            (day, name_id, *stats.values())
+            for (day, name_id), stats in sorted(batch.daily.items(), key=itemgetter(0))
+        ])
+    if batch.sessions:
+        await driver.executemany(SESSION_UPSERT, [
+            (session_id, stats.first_spin_at, stats.last_spin_at, *stats.values())
+            for session_id, stats in sorted(batch.sessions.items(), key=itemgetter(0))
+        ])
+    if batch.sketches:
+        hourly = {hour: values.sketch() for hour, values in batch.sketches.items()}
+        await apply_sketches(driver, HOURLY_SKETCHES, hourly)
+        await apply_sketches(driver, DAILY_SKETCHES, daily_sketches(hourly))
+    if batch.clients_hourly:
+        await driver.executemany(CLIENT_HOURLY_UPSERT, [
+            (bucket, agent_id, spins)
+            for (bucket, agent_id), spins in sorted(batch.clients_hourly.items())
+        ])
+    if batch.clients_daily:
+        await driver.executemany(CLIENT_DAILY_UPSERT, [
+            (day, agent_id, spins)
+            for (day, agent_id), spins in sorted(batch.clients_daily.items())
+        ])
+    if batch.fairness:
+        await driver.executemany(FAIRNESS_UPSERT, [
+            (snapshot_key, name_id, observed)
+            for (snapshot_key, name_id), observed in sorted(batch.fairness.items())
+        ])
+
+
+class RollupWatermark:
+    """Shared counter advanced after every committed rollup batch.
+    
+    Analytics responses derive their ETags from it, so a client can
+    revalidate without a query until new results have been rolled up.
+    """
+    
+    KEY = "roulette:rollups:watermark"
+    
+    def __init__(self, backend: CacheBackend | None = None) -> None:
+        self._backend = backend or cache_backend
+    
+    async def current(self) -> int:
+        """Latest watermark, 0 before any rollup was applied."""
+        raw = await self._backend.get(self.KEY)
+        return int(raw) if raw else 0
+    
+    async def advance(self) -> int:
+        """Mark that the rollup tables changed."""
+        return await self._backend.incr(self.KEY)
+
+
+rollup_watermark = RollupWatermark()
@@ -0,0 +1,343 @@
+"""In-memory roster of active names with a prebuilt sampler."""
+
+import asyncio
+import json
+import logging
+import random
+import time
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, overload
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import engine
+from app.models.name import Name
+from app.models.roster_snapshot import RosterSnapshot
+from app.services.cache import CacheBackend, cache_backend
+from app.services.roster_store import PackedRoster, SharedRosterStore
+from app.services.sampler import AliasTable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class RosterEntry:
+    """Immutable view of an active name used for sampling."""
+    
+    id: uuid.UUID
+    name: str
+    weight: int
+    
+    def snapshot(self) -> dict[str, Any]:
+        """Serializable snapshot stored alongside game results."""
+        return {'id': str(self.id), 'name': self.name, 'weight': self.weight}
+
+
+class PackedEntries(Sequence[RosterEntry]):
+    """Roster entries decoded on access from a packed, shared roster."""
+    
+    __slots__ = ("_packed",)
+    
+    def __init__(self, packed: PackedRoster) -> None:
+        self._packed = packed
+    
+    def __len__(self) -> int:
+        return len(self._packed)
+    
+    @overload
+    def __getitem__(self, index: int) -> RosterEntry: ...
+    
+    @overload
+    def __getitem__(self, index: slice) -> list[RosterEntry]: ...
+    
+    def __getitem__(self, index: int | slice) -> RosterEntry | list[RosterEntry]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        packed = self._packed
+        if index < 0:
+            index += len(packed)
+        if not 0 <= index < len(packed):
+            raise IndexError("roster index out of range")
+        start, end = packed.offsets[index], packed.offsets[index + 1]
+        return RosterEntry(
+            id=uuid.UUID(bytes=packed.ids[16 * index:16 * index + 16].tobytes()),
+            name=str(packed.names[start:end], "utf-8"),
+            weight=packed.weights[index],
+        )
+
+
+class Roster:
+    """Active names for one roster version together with their alias table."""
+    
+    __slots__ = ("entries", "version", "_table", "_snapshot", "_snapshot_key")
+    
+    def __init__(
+        self,
+        entries: Sequence[RosterEntry],
+        version: int,
+        table: AliasTable | None = None,
+        snapshot_key: str | None = None,
+    ) -> None:
+        self.entries = entries
+        self.version = version
+        if table is None and entries:
+            table = AliasTable([e.weight for e in entries])
+        self._table = table
+        self._snapshot: list[dict[str, Any]] | None = None
+        self._snapshot_key = snapshot_key
+    
+    def to_payload(self) -> bytes:
+        """Serialize entries and the prebuilt alias table for the shared cache."""
+        return json.dumps({
+            'entries': [[str(e.id), e.name, e.weight] for e in self.entries],
+            'prob': list(self._table.prob) if self._table else [],
+            'alias': list(self._table.alias) if self._table else [],
+            'snapshot_key': self.snapshot_key if self.entries else None,
+        }).encode("utf-8")
+    
+    @classmethod
+    def from_packed(cls, packed: PackedRoster) -> "Roster":
+        """Roster backed by a shared mapping instead of per-process objects."""
+        table = AliasTable.from_buffers(packed.prob, packed.alias) if len(packed) else None
+        return cls(PackedEntries(packed), packed.version, table, packed.snapshot_key)
+    
+    def publish(self, store: SharedRosterStore) -> "Roster":
+        """Publish this roster host-wide and return the shared copy.
+        
+        Returns this roster itself if the host already has a newer version.
+        """
+        entries = self.entries
+        packed = store.publish(
+            self.version,
+            ids=[e.id for e in entries],
+            names=[e.name for e in entries],
+            weights=[e.weight for e in entries],
+            prob=self._table.prob if self._table else [],
+            alias=self._table.alias if self._table else [],
+            snapshot_key=self.snapshot_key if entries else None,
+        )
+        return Roster.from_packed(packed) if packed is not None else self
+    
+    @classmethod
+    def from_payload(cls, payload: bytes, version: int) -> "Roster":
+        """Restore a roster published by another worker without rebuilding it."""
+        data = json.loads(payload)
+        entries = [
+            RosterEntry(id=uuid.UUID(id_), name=name, weight=weight)
+            for id_, name, weight in data['entries']
+        ]
+        table = AliasTable.from_arrays(data['prob'], data['alias']) if entries else None
+        return cls(entries, version, table, data['snapshot_key'])
+    
+    def __len__(self) -> int:
+        """Number of active names."""
+        return len(self.entries)
+    
+    def spin(self, rng: random.Random | None = None) -> RosterEntry:
+        """Pick a weighted random entry in constant time."""
+        if self._table is None:
+            raise LookupError("No active names available")
+        return self.entries[self._table.sample(rng)]
+    
+    def spin_many(
+        self, count: int, rng: np.random.Generator | None = None
+    ) -> np.ndarray:
+        """Pick ``count`` weighted random entry indices in one vectorized draw."""
+        if self._table is None:
+            raise LookupError("No active names available")
+        return self._table.sample_many(count, rng)
+    
+    def snapshot(self) -> list[dict[str, Any]]:
+        """Snapshot of all entries, built once per roster version."""
+        if self._snapshot is None:
+            self._snapshot = [entry.snapshot() for entry in self.entries]
+        return self._snapshot
+    
+    @property
+    def snapshot_key(self) -> str:
+        """Content-addressed key of this roster's snapshot row."""
+        if self._snapshot_key is None:
+            self._snapshot_key = RosterSnapshot.compute_key(self.snapshot())
+        return self._snapshot_key
+
+
+async def load_active_entries(db: AsyncSession) -> list[RosterEntry]:
+    """Load active names as plain tuples, bypassing ORM object construction."""
+    result = await db.execute(
+        select(Name.id, Name.name, Name.weight)
+        .where(Name.is_active.is_(True))
+        .order_by(Name.id)
+    )
+    return [RosterEntry(id=row.id, name=row.name, weight=row.weight) for row in result]
+
+
+async def save_snapshot(roster: Roster) -> None:
+    """Persist the roster snapshot once, in its own committed transaction.
+    
+    Spins reference the snapshot by key, so it must be durable before any
+    result pointing at it commits, regardless of how that request ends.
+    """
+    snapshot = roster.snapshot()
+    stmt = (
+        pg_insert(RosterSnapshot)
+        .values(
+            key=roster.snapshot_key,
+            entries=snapshot,
+            name_count=len(snapshot),
+            total_weight=sum(entry.weight for entry in roster.entries),
+        )
+        .on_conflict_do_nothing(index_elements=[RosterSnapshot.key])
+    )
+    async with engine.begin() as conn:
+        await conn.execute(stmt)
+
+
+class RosterCache:
+    """Per-worker roster cache kept consistent through a shared version.
+    
+    Every change to the names table bumps a monotonic version in the shared
+    cache backend. Workers compare their local roster against that version
+    (at most once per ``check_interval`` seconds) and reload lazily when it
+    is stale. The first worker to see a new version loads it from the
+    database and publishes the entries and alias table; the others pick the
+    payload up from the cache instead of querying the database.
+    
+    With a ``shared`` store, workers on one host also share the roster
+    itself: it is built once per host into a memory-mapped file whose
+    generation every worker checks before reloading, and each worker
+    samples from that mapping instead of keeping its own copy.
+    """
+    
+    VERSION_KEY = "roulette:roster:version"
+    PAYLOAD_KEY = "roulette:roster:payload:{version}"
+    LOCK_KEY = "roulette:roster:lock:{version}"
+    LOCK_TTL = 10
+    LOCK_POLL_INTERVAL = 0.05
+    LOCK_POLL_ATTEMPTS = 40
+    
+    def __init__(
+        self,
+        backend: CacheBackend | None = None,
+        *,
+        check_interval: float = settings.roster_version_check_interval,
+        payload_ttl: int = settings.roster_cache_ttl,
+        shared: SharedRosterStore | None = None,
+    ) -> None:
+        self._backend = backend or cache_backend
+        self._shared = shared
+        self._check_interval = check_interval
+        self._payload_ttl = payload_ttl
+        self._roster: Roster | None = None
+        self._version = 0
+        self._checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+    
+    @property
+    def version(self) -> int:
+        """Latest shared roster version seen by this worker."""
+        return self._version
+    
+    async def current_version(self, *, fresh: bool = False) -> int:
+        """Shared roster version, re-read at most once per ``check_interval``.
+        
+        ``fresh`` re-reads it now, for validators that must see the latest
+        write.
+        """
+        if fresh:
+            self.invalidate()
+        return await self._shared_version()
+    
+    def invalidate(self) -> None:
+        """Force a version check on the next access."""
+        self._checked_at = float("-inf")
+    
+    async def bump(self) -> int:
+        """Publish a new roster version; call after committing name changes."""
+        self._version = await self._backend.incr(self.VERSION_KEY)
+        self._checked_at = time.monotonic()
+        return self._version
+    
+    async def _shared_version(self) -> int:
+        now = time.monotonic()
+        if now - self._checked_at >= self._check_interval:
+            raw = await self._backend.get(self.VERSION_KEY)
+            self._version = int(raw) if raw else 0
+            self._checked_at = now
+        return self._version
+    
+    async def get(self, db: AsyncSession) -> Roster:
+        """Return the current roster, reloading it if the version moved."""
+        version = await self._shared_version()
+        roster = self._current(version)
+        if roster is not None:
+            return roster
+        
+        async with self._lock:
+            roster = self._current(version)
+            if roster is None:
+                roster = await self._load(version, db)
+                self._roster = roster
+        return roster
+    
+    def _current(self, version: int) -> Roster | None:
+        roster = self._roster
+        if roster is not None and roster.version == version:
+            return roster
+        if self._shared is not None:
+            try:
+                packed = self._shared.read()
+            except OSError:
+                logger.exception("Failed to read the host-wide roster")
+                return None
+            if packed is not None and packed.version == version:
+                self._roster = Roster.from_packed(packed)
+                return self._roster
+        return None
+    
+    def _publish(self, roster: Roster) -> Roster:
+        if self._shared is None:
+            return roster
+        try:
+            return roster.publish(self._shared)
+        except OSError:
+            logger.exception("Failed to publish roster version %d host-wide", roster.version)
+            return roster
+    
+    async def _load(self, version: int, db: AsyncSession) -> Roster:
+        payload_key = self.PAYLOAD_KEY.format(version=version)
+        payload = await self._backend.get(payload_key)
+        if payload is None:
+            lock_key = self.LOCK_KEY.format(version=version)
+            if not await self._backend.add(lock_key, b"1", ttl=self.LOCK_TTL):
+                # Another worker is building this version; wait for it.
+                for _ in range(self.LOCK_POLL_ATTEMPTS):
+                    await asyncio.sleep(self.LOCK_POLL_INTERVAL)
+                    roster = self._current(version)
+                    if roster is not None:
+                        return roster
+                    payload = await self._backend.get(payload_key)
+                    if payload is not None:
+                        break
+        
+        if payload is not None:
+            return self._publish(Roster.from_payload(payload, version))
+        
+        roster = Roster(await load_active_entries(db), version)
+        if len(roster):
+            await save_snapshot(roster)
+        # Publish host-wide first so waiting workers here map it instead of
+        # decoding the payload themselves.
+        roster = self._publish(roster)
+        await self._backend.set(payload_key, roster.to_payload(), ttl=self._payload_ttl)
+        return roster
+
+
+roster_cache = RosterCache(
+    shared=SharedRosterStore(settings.roster_shared_dir) if settings.roster_shared_dir else None
+)
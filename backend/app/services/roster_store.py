@@ -0,0 +1,216 @@
+"""Host-wide roster published once into memory-mapped files.
+
+Layout of a roster file, all little endian and naturally aligned::
+    
+    header    magic, layout, generation, version, count, name bytes, snapshot key
+    prob      float64[count]   alias table acceptance probabilities
+    ids       16 bytes[count]  UUIDs
+    alias     int32[count]     alias table fallback columns
+    offsets   uint32[count+1]  start of each name in the blob
+    weights   int16[count]
+    names     UTF-8 blob
+
+A small control file holds the generation of the current roster file.
+Every worker maps it once and reads the generation before using its
+roster, so a publish by any process on the host is seen without a syscall.
+"""
+
+import fcntl
+import mmap
+import os
+import struct
+import uuid
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+HEADER = struct.Struct("<4sHxxQQII64s")
+MAGIC = b"RSTR"
+LAYOUT = 1
+GENERATION = struct.Struct("<Q")
+
+CONTROL_FILE = "roster.gen"
+ROSTER_FILE = "roster-{generation}.bin"
+
+
+@dataclass(frozen=True, slots=True)
+class PackedRoster:
+    """Read-only views into one mapped roster file."""
+    
+    generation: int
+    version: int
+    snapshot_key: str | None
+    ids: memoryview
+    weights: memoryview
+    offsets: memoryview
+    names: memoryview
+    prob: memoryview
+    alias: memoryview
+    
+    def __len__(self) -> int:
+        """Number of names."""
+        return len(self.weights)
+
+
+def pack_roster(
+    generation: int,
+    version: int,
+    ids: Sequence[uuid.UUID],
+    names: Sequence[str],
+    weights: Sequence[int],
+    prob: Sequence[float],
+    alias: Sequence[int],
+    snapshot_key: str | None,
+) -> bytes:
+    """Serialize a roster and its alias table into the file layout."""
+    count = len(ids)
+    encoded = [name.encode("utf-8") for name in names]
+    offsets = np.zeros(count + 1, dtype="<u4")
+    np.cumsum([len(name) for name in encoded], out=offsets[1:])
+    blob = b"".join(encoded)
+    header = HEADER.pack(
+        MAGIC, LAYOUT, generation, version, count, len(blob),
+        (snapshot_key or "").encode("ascii"),
+    )
+    return b"".join([
+        header,
+        np.asarray(prob, dtype="<f8").tobytes(),
+        b"".join(id_.bytes for id_ in ids),
+        np.asarray(alias, dtype="<i4").tobytes(),
+        offsets.tobytes(),
+        np.asarray(weights, dtype="<i2").tobytes(),
+        blob,
+    ])
+
+
+def unpack_roster(buffer: memoryview) -> PackedRoster:
+    """Views over a packed roster; nothing is copied."""
+    magic, layout, generation, version, count, name_bytes, key = HEADER.unpack_from(buffer)
+    if magic != MAGIC or layout != LAYOUT:
+        raise ValueError("Not a roster file of a supported layout")
+    
+    position = HEADER.size
+    
+    def take(size: int, fmt: str) -> memoryview:
+        nonlocal position
+        view = buffer[position:position + size].cast(fmt)
+        position += size
+        return view
+    
+    return PackedRoster(
+        generation=generation,
+        version=version,
+        snapshot_key=key.rstrip(b"\0").decode("ascii") or None,
+        prob=take(8 * count, "d"),
+        ids=take(16 * count, "B"),
+        alias=take(4 * count, "i"),
+        offsets=take(4 * (count + 1), "I"),
+        weights=take(2 * count, "h"),
+        names=take(name_bytes, "B"),
+    )
+
+
+class SharedRosterStore:
+    """Roster files under ``directory``, shared by every worker on the host.
+    
+    Files are written once and never modified: a publish writes a new file,
+    renames it into place and then bumps the generation in the control file.
+    Workers map files read-only, so the pages are shared through the page
+    cache and memory stays flat as the worker count grows. Put the directory
+    on tmpfs (e.g. ``/dev/shm``) to keep it off disk.
+    """
+    
+    def __init__(self, directory: str | os.PathLike[str]) -> None:
+        self._directory = Path(directory)
+        self._control: mmap.mmap | None = None
+        self._control_fd = -1
+        self._generation = 0
+        self._packed: PackedRoster | None = None
+    
+    def _control_map(self) -> mmap.mmap:
+        if self._control is None:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self._directory / CONTROL_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+            with self._flock(fd):
+                if os.fstat(fd).st_size < GENERATION.size:
+                    os.ftruncate(fd, GENERATION.size)
+            self._control = mmap.mmap(fd, GENERATION.size)
+            self._control_fd = fd
+        return self._control
+    
+    @staticmethod
+    @contextmanager
+    def _flock(fd: int) -> Iterator[None]:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    
+    def _path(self, generation: int) -> Path:
+        return self._directory / ROSTER_FILE.format(generation=generation)
+    
+    def generation(self) -> int:
+        """Generation of the roster currently published on this host."""
+        return GENERATION.unpack_from(self._control_map())[0]
+    
+    def read(self) -> PackedRoster | None:
+        """Current roster, remapped only when the generation moved."""
+        generation = self.generation()
+        if generation != self._generation:
+            packed = self._map(generation) if generation else None
+            if packed is None and generation:
+                # Not recorded, so the next read tries this generation again
+                return None
+            self._packed, self._generation = packed, generation
+        return self._packed
+    
+    def _map(self, generation: int) -> PackedRoster | None:
+        try:
+            with open(self._path(generation), "rb") as file:
+                mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            # Superseded and removed between reading the generation and opening
+            return None
+        return unpack_roster(memoryview(mapping))
+    
+    def publish(
+        self,
+        version: int,
+        ids: Sequence[uuid.UUID],
+        names: Sequence[str],
+        weights: Sequence[int],
+        prob: Sequence[float],
+        alias: Sequence[int],
+        snapshot_key: str | None,
+    ) -> PackedRoster | None:
+        """Publish a roster version unless another process already did.
+        
+        Publishers are serialized with a file lock, so concurrent workers
+        reloading the same version write it once; the rest map that file.
+        Returns None without publishing when a newer version is already
+        published, so a slow loader cannot roll the host back.
+        """
+        control = self._control_map()
+        with self._flock(self._control_fd):
+            current = self.read()
+            if current is not None and current.version >= version:
+                return current if current.version == version else None
+            
+            generation = self.generation() + 1
+            path = self._path(generation)
+            temp = path.with_suffix(".tmp")
+            temp.write_bytes(pack_roster(
+                generation, version, ids, names, weights, prob, alias, snapshot_key
+            ))
+            os.replace(temp, path)
+            GENERATION.pack_into(control, 0, generation)
+            # Keep the previous file for readers that saw its generation but
+            # have not mapped it yet; mapped files stay valid once unlinked.
+            for old in self._directory.glob(ROSTER_FILE.format(generation="*")):
+                if int(old.stem.rpartition("-")[2]) < generation - 1:
+                    old.unlink(missing_ok=True)
+        return self.read()
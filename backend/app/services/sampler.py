@@ -0,0 +1,204 @@
+"""Weighted random sampling using Walker/Vose alias tables and Fenwick trees."""
+
+import random
+from collections.abc import Sequence
+
+import numpy as np
+
+
+class AliasTable:
+    """Alias table for O(1) weighted sampling over a fixed set of weights.
+    
+    Construction is O(n); every draw afterwards costs one random number,
+    one index lookup and one comparison regardless of roster size.
+    """
+    
+    __slots__ = ("_prob", "_alias", "_size", "_prob_array", "_alias_array")
+    
+    def __init__(self, weights: Sequence[int | float]) -> None:
+        """Build the table using Vose's numerically stable method."""
+        size = len(weights)
+        if size == 0:
+            raise ValueError("Alias table requires at least one weight")
+        
+        total = float(sum(weights))
+        if total <= 0:
+            raise ValueError("Total weight must be positive")
+        
+        scaled = [w * size / total for w in weights]
+        if any(p < 0 for p in scaled):
+            raise ValueError("Weights cannot be negative")
+        
+        prob = [0.0] * size
+        alias = list(range(size))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            scaled[more] = (scaled[more] + scaled[less]) - 1.0
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+        
+        # Whatever remains is 1.0 up to floating point error
+        for index in large:
+            prob[index] = 1.0
+        for index in small:
+            prob[index] = 1.0
+        
+        self._prob = prob
+        self._alias = alias
+        self._size = size
+        self._prob_array: np.ndarray | None = None
+        self._alias_array: np.ndarray | None = None
+    
+    @classmethod
+    def from_arrays(cls, prob: Sequence[float], alias: Sequence[int]) -> "AliasTable":
+        """Restore a table from previously built probability and alias columns."""
+        if len(prob) != len(alias) or not prob:
+            raise ValueError("Probability and alias columns must be non-empty and equal length")
+        table = cls.__new__(cls)
+        table._prob = list(prob)
+        table._alias = list(alias)
+        table._size = len(prob)
+        table._prob_array = None
+        table._alias_array = None
+        return table
+    
+    @classmethod
+    def from_buffers(cls, prob: memoryview, alias: memoryview) -> "AliasTable":
+        """Wrap prebuilt columns of doubles and C ints without copying them.
+        
+        Indexing a memoryview is as cheap as indexing a list, and the NumPy
+        arrays for vectorized draws are views over the same memory.
+        """
+        if len(prob) != len(alias) or not len(prob):
+            raise ValueError("Probability and alias columns must be non-empty and equal length")
+        table = cls.__new__(cls)
+        table._prob = prob
+        table._alias = alias
+        table._size = len(prob)
+        table._prob_array = np.frombuffer(prob, dtype=np.float64)
+        table._alias_array = np.frombuffer(alias, dtype=np.int32)
+        return table
+    
+    def __len__(self) -> int:
+        """Number of outcomes in the table."""
+        return self._size
+    
+    @property
+    def prob(self) -> Sequence[float]:
+        """Acceptance probability for each column."""
+        return self._prob
+    
+    @property
+    def alias(self) -> Sequence[int]:
+        """Fallback outcome for each column."""
+        return self._alias
+    
+    def sample(self, rng: random.Random | None = None) -> int:
+        """Draw a single index in O(1)."""
+        x = (rng or random).random() * self._size
+        column = int(x)
+        if column >= self._size:  # Guard against x rounding up to size
+            column = self._size - 1
+        if x - column < self._prob[column]:
+            return column
+        return self._alias[column]
+    
+    def sample_many(
+        self, count: int, rng: np.random.Generator | None = None
+    ) -> np.ndarray:
+        """Draw ``count`` indices at once using vectorized NumPy operations."""
+        if count < 0:
+            raise ValueError("Sample count cannot be negative")
+        if self._prob_array is None:
+            self._prob_array = np.asarray(self._prob, dtype=np.float64)
+            self._alias_array = np.asarray(self._alias, dtype=np.intp)
+        
+        rng = rng or np.random.default_rng()
+        columns = rng.integers(0, self._size, size=count)
+        accept = rng.random(count) < self._prob_array[columns]
+        return np.where(accept, columns, self._alias_array[columns])
+
+
+class FenwickTree:
+    """Binary indexed tree over integer weights for sampling without replacement.
+    
+    Drawing an index and changing its weight both cost O(log n), so removing
+    picked entries never requires rebuilding the structure.
+    """
+    
+    __slots__ = ("_tree", "_weights", "_size", "_total", "_top")
+    
+    def __init__(self, weights: Sequence[int]) -> None:
+        """Build the tree in O(n)."""
+        size = len(weights)
+        tree = [0] * (size + 1)
+        for index, weight in enumerate(weights, start=1):
+            if weight < 0:
+                raise ValueError("Weights cannot be negative")
+            tree[index] += weight
+            parent = index + (index & -index)
+            if parent <= size:
+                tree[parent] += tree[index]
+        
+        self._tree = tree
+        self._weights = list(weights)
+        self._size = size
+        self._total = sum(self._weights)
+        self._top = 1 << (size.bit_length() - 1) if size else 0
+    
+    def __len__(self) -> int:
+        """Number of slots, including those with zero weight."""
+        return self._size
+    
+    @property
+    def total(self) -> int:
+        """Sum of all current weights."""
+        return self._total
+    
+    def weight(self, index: int) -> int:
+        """Current weight of one slot."""
+        return self._weights[index]
+    
+    def update(self, index: int, weight: int) -> None:
+        """Set the weight of one slot in O(log n)."""
+        if weight < 0:
+            raise ValueError("Weights cannot be negative")
+        delta = weight - self._weights[index]
+        self._weights[index] = weight
+        self._total += delta
+        position = index + 1
+        while position <= self._size:
+            self._tree[position] += delta
+            position += position & -position
+    
+    def remove(self, index: int) -> None:
+        """Exclude a slot from future draws."""
+        self.update(index, 0)
+    
+    def find(self, value: int) -> int:
+        """Index whose cumulative weight range contains ``value``."""
+        if not 0 <= value < self._total:
+            raise ValueError("Value must be within [0, total)")
+        position = 0
+        step = self._top
+        while step:
+            candidate = position + step
+            if candidate <= self._size and self._tree[candidate] <= value:
+                position = candidate
+                value -= self._tree[candidate]
+            step >>= 1
+        return position
+    
+    def sample(self, rng: random.Random | None = None) -> int:
+        """Draw an index with probability proportional to its weight."""
+        if self._total <= 0:
+            raise LookupError("No weight left to sample from")
+        return self.find((rng or random).randrange(self._total))
@@ -0,0 +1,360 @@
+"""Mergeable sketches: HyperLogLog distinct counts and t-digest quantiles.
+
+Both sketches merge losslessly with respect to their own error bounds, so
+per-bucket sketches can be combined on read for any range of buckets.
+"""
+
+import hashlib
+import math
+import os
+import struct
+import uuid
+import zlib
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any
+
+import numpy as np
+
+from app.config import settings
+
+HLL_HEADER = struct.Struct("<cB")
+DIGEST_HEADER = struct.Struct("<cHdd")
+
+MIN_PRECISION = 4
+MIN_COMPRESSION = 20
+
+
+def hash64(value: Any) -> int:
+    """Stable 64-bit hash of a UUID or string."""
+    data = value.bytes if isinstance(value, uuid.UUID) else str(value).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+def precision_for_error(error: float, maximum: int) -> int:
+    """Smallest HyperLogLog precision whose standard error is at most ``error``."""
+    needed = math.ceil(2 * math.log2(1.04 / error))
+    return max(MIN_PRECISION, min(maximum, needed))
+
+
+def compression_for_error(error: float, maximum: int) -> int:
+    """t-digest compression for a target quantile error, capped at what is stored."""
+    return max(MIN_COMPRESSION, min(maximum, math.ceil(1 / error)))
+
+
+class HyperLogLog:
+    """Distinct-count sketch with ``2 ** precision`` one-byte registers.
+    
+    The standard error is about ``1.04 / sqrt(2 ** precision)``: 0.8% at
+    the default precision of 14. Registers of merged sketches are the
+    element-wise maximum, and a sketch can be folded down to a lower
+    precision, so sketches written with different settings still merge.
+    """
+    
+    __slots__ = ("precision", "registers")
+    
+    def __init__(
+        self, precision: int = settings.sketch_hll_precision, registers: np.ndarray | None = None
+    ) -> None:
+        self.precision = precision
+        if registers is None:
+            registers = np.zeros(1 << precision, dtype=np.uint8)
+        self.registers = registers
+    
+    def add_hashes(self, hashes: Iterable[int]) -> None:
+        """Account for values given by their 64-bit hashes."""
+        width = 64 - self.precision
+        low = (1 << width) - 1
+        indices, ranks = [], []
+        for value in hashes:
+            indices.append(value >> width)
+            ranks.append(width - (value & low).bit_length() + 1)
+        np.maximum.at(self.registers, indices, np.asarray(ranks, dtype=np.uint8))
+    
+    def add(self, values: Iterable[Any]) -> None:
+        """Account for UUIDs or strings; None values are skipped."""
+        self.add_hashes(hash64(value) for value in values if value is not None)
+    
+    def fold(self, precision: int) -> "HyperLogLog":
+        """Equivalent sketch at a lower precision.
+        
+        The dropped low index bits become the leading bits of the rank part,
+        so a register's rank grows by their width when they are all zero.
+        """
+        if precision >= self.precision:
+            return self
+        shift = self.precision - precision
+        groups = self.registers.reshape(1 << precision, 1 << shift)
+        dropped = np.arange(1 << shift)
+        leading = np.array(
+            [shift - int(bits).bit_length() + 1 for bits in dropped], dtype=np.int16
+        )
+        # Zero dropped bits: the old rank continues past them
+        ranks = np.where(dropped == 0, groups.astype(np.int16) + shift, leading)
+        ranks = np.where(groups == 0, 0, ranks)
+        return HyperLogLog(precision, ranks.max(axis=1).astype(np.uint8))
+    
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Union of two sketches, at the lower of their precisions."""
+        precision = min(self.precision, other.precision)
+        left, right = self.fold(precision), other.fold(precision)
+        return HyperLogLog(precision, np.maximum(left.registers, right.registers))
+    
+    def count(self) -> float:
+        """Estimated number of distinct values."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.ldexp(1.0, -self.registers.astype(np.int32)).sum()
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)
+        return float(estimate)
+    
+    @property
+    def standard_error(self) -> float:
+        """Relative standard error of ``count``."""
+        return 1.04 / math.sqrt(len(self.registers))
+    
+    def to_bytes(self) -> bytes:
+        """Compressed registers; sparse hours compress to a few bytes."""
+        return HLL_HEADER.pack(b"H", self.precision) + zlib.compress(self.registers.tobytes())
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        """Restore a sketch written by ``to_bytes``."""
+        kind, precision = HLL_HEADER.unpack_from(data)
+        if kind != b"H":
+            raise ValueError("Not a HyperLogLog sketch")
+        registers = np.frombuffer(zlib.decompress(data[HLL_HEADER.size:]), dtype=np.uint8)
+        return cls(precision, registers.copy())
+
+
+class TDigest:
+    """Merging t-digest of centroids for approximate quantiles.
+    
+    Centroids are clustered with the k1 scale function, which keeps them
+    small near the tails, so extreme percentiles stay accurate. At most
+    about ``compression / 2`` centroids are kept; exact minimum and maximum
+    are tracked separately.
+    """
+    
+    __slots__ = ("compression", "means", "weights", "min", "max")
+    
+    def __init__(self, compression: int = settings.sketch_digest_compression) -> None:
+        self.compression = compression
+        self.means = np.empty(0, dtype=np.float64)
+        self.weights = np.empty(0, dtype=np.float64)
+        self.min = math.inf
+        self.max = -math.inf
+    
+    @property
+    def count(self) -> int:
+        """Number of values summarized."""
+        return int(self.weights.sum())
+    
+    def add(self, values: Sequence[float]) -> None:
+        """Account for raw values."""
+        if not len(values):
+            return
+        array = np.asarray(values, dtype=np.float64)
+        self._absorb(array, np.ones(len(array)), float(array.min()), float(array.max()))
+    
+    def merge(self, other: "TDigest") -> "TDigest":
+        """Combine two digests at the lower of their compressions."""
+        merged = TDigest(min(self.compression, other.compression))
+        for digest in (self, other):
+            if len(digest.weights):
+                merged._absorb(digest.means, digest.weights, digest.min, digest.max)
+        return merged
+    
+    def _absorb(self, means: np.ndarray, weights: np.ndarray, low: float, high: float) -> None:
+        means = np.concatenate([self.means, means])
+        weights = np.concatenate([self.weights, weights])
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        
+        # Cluster by whole units of k1(q) at each centroid's midpoint
+        cumulative = np.cumsum(weights)
+        midpoints = (cumulative - weights / 2) / cumulative[-1]
+        k = self.compression / (2 * math.pi) * np.arcsin(2 * midpoints - 1)
+        cluster = np.floor(k)
+        starts = np.flatnonzero(np.r_[True, cluster[1:] != cluster[:-1]])
+        
+        total = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / total
+        self.weights = total
+        self.min = min(self.min, low)
+        self.max = max(self.max, high)
+    
+    def quantiles(self, qs: Sequence[float]) -> list[float]:
+        """Estimated values at quantiles in ``[0, 1]``."""
+        if not len(self.weights):
+            raise ValueError("Quantiles of an empty digest")
+        cumulative = np.cumsum(self.weights)
+        centers = cumulative - self.weights / 2
+        positions = np.r_[0.0, centers, cumulative[-1]]
+        values = np.r_[self.min, self.means, self.max]
+        targets = np.asarray(qs, dtype=np.float64) * cumulative[-1]
+        return np.interp(targets, positions, values).tolist()
+    
+    def to_bytes(self) -> bytes:
+        """Compressed centroid columns."""
+        header = DIGEST_HEADER.pack(b"T", self.compression, self.min, self.max)
+        return header + zlib.compress(self.means.tobytes() + self.weights.tobytes())
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TDigest":
+        """Restore a digest written by ``to_bytes``."""
+        kind, compression, low, high = DIGEST_HEADER.unpack_from(data)
+        if kind != b"T":
+            raise ValueError("Not a t-digest")
+        columns = np.frombuffer(zlib.decompress(data[DIGEST_HEADER.size:]), dtype=np.float64)
+        digest = cls(compression)
+        digest.means, digest.weights = columns[:len(columns) // 2], columns[len(columns) // 2:]
+        digest.min, digest.max = low, high
+        return digest
+
+
+@dataclass(slots=True)
+class BucketSketches:
+    """Sketches of one time bucket, or of a merged range of buckets."""
+    
+    users: HyperLogLog = field(default_factory=HyperLogLog)
+    ips: HyperLogLog = field(default_factory=HyperLogLog)
+    sessions: HyperLogLog = field(default_factory=HyperLogLog)
+    durations: TDigest = field(default_factory=TDigest)
+    
+    def merge(self, other: "BucketSketches") -> "BucketSketches":
+        """Union of two buckets."""
+        return BucketSketches(
+            self.users.merge(other.users),
+            self.ips.merge(other.ips),
+            self.sessions.merge(other.sessions),
+            self.durations.merge(other.durations),
+        )
+    
+    def to_row(self) -> tuple[bytes, bytes, bytes, bytes]:
+        """Column values in table order."""
+        return (
+            self.users.to_bytes(),
+            self.ips.to_bytes(),
+            self.sessions.to_bytes(),
+            self.durations.to_bytes(),
+        )
+    
+    @classmethod
+    def from_row(
+        cls,
+        users: bytes | None,
+        ips: bytes | None,
+        sessions: bytes | None,
+        durations: bytes | None,
+    ) -> "BucketSketches":
+        """Decode stored columns; NULL columns become empty sketches."""
+        sketches = cls()
+        if users is not None:
+            sketches.users = HyperLogLog.from_bytes(users)
+        if ips is not None:
+            sketches.ips = HyperLogLog.from_bytes(ips)
+        if sessions is not None:
+            sketches.sessions = HyperLogLog.from_bytes(sessions)
+        if durations is not None:
+            sketches.durations = TDigest.from_bytes(durations)
+        return sketches
+
+
+@dataclass(slots=True)
+class SketchInput:
+    """Raw values of one bucket collected from a batch of results."""
+    
+    users: list[uuid.UUID | None] = field(default_factory=list)
+    ips: list[str | None] = field(default_factory=list)
+    sessions: list[uuid.UUID] = field(default_factory=list)
+    durations: list[int] = field(default_factory=list)
+    
+    def sketch(self) -> BucketSketches:
+        """Sketches of the collected values."""
+        sketches = BucketSketches()
+        sketches.users.add(self.users)
+        sketches.ips.add(self.ips)
+        sketches.sessions.add(self.sessions)
+        sketches.durations.add(self.durations)
+        return sketches
+
+
+def merge_all(
+    rows: Iterable[Sequence[bytes | None]],
+    precision: int = settings.sketch_hll_precision,
+    compression: int = settings.sketch_digest_compression,
+) -> BucketSketches:
+    """Merge stored bucket rows of ``(users, ips, sessions, durations)``.
+    
+    Lower ``precision`` and ``compression`` trade accuracy for speed: every
+    row is folded down before it is merged.
+    """
+    merged = BucketSketches(
+        HyperLogLog(precision), HyperLogLog(precision), HyperLogLog(precision),
+        TDigest(compression),
+    )
+    for row in rows:
+        merged = merged.merge(BucketSketches.from_row(*row))
+    return merged
+
+
+def daily_sketches(hourly: dict[datetime, BucketSketches]) -> dict[date, BucketSketches]:
+    """Merge hourly sketches into sketches per UTC day."""
+    daily: dict[date, BucketSketches] = {}
+    for hour, sketches in hourly.items():
+        day = hour.date()
+        daily[day] = daily[day].merge(sketches) if day in daily else sketches
+    return daily
+
+
+def sketch_statements(table: str, key: str, key_type: str) -> tuple[str, str, str]:
+    """Statements that create, lock and rewrite one shard's sketch rows of a table."""
+    return (
+        f"INSERT INTO {table} ({key}, shard) SELECT unnest($1::{key_type}[]), $2 "
+        f"ON CONFLICT ({key}, shard) DO NOTHING",
+        f"SELECT {key}, users, ips, sessions, durations FROM {table} "
+        f"WHERE {key} = ANY($1::{key_type}[]) AND shard = $2 ORDER BY {key} FOR UPDATE",
+        f"UPDATE {table} SET users = $3, ips = $4, sessions = $5, durations = $6 "
+        f"WHERE {key} = $1 AND shard = $2",
+    )
+
+
+HOURLY_SKETCHES = sketch_statements("spin_sketches_hourly", "bucket_start", "timestamptz")
+DAILY_SKETCHES = sketch_statements("spin_sketches_daily", "bucket_date", "date")
+
+
+def writer_shard() -> int:
+    """Sketch shard of this process; read after forking, so workers differ."""
+    return os.getpid() % settings.sketch_shards
+
+
+async def apply_sketches(
+    driver: Any,
+    statements: tuple[str, str, str],
+    sketches: dict[Any, BucketSketches],
+    shard: int | None = None,
+) -> None:
+    """Merge new bucket sketches into the stored ones on an asyncpg connection.
+    
+    Binary sketches cannot be merged in SQL, so the rows are created if
+    missing, locked in key order (like the rollup upserts) and rewritten.
+    Each bucket is stored as up to ``sketch_shards`` rows and a worker only
+    writes its own, so workers do not queue on the current bucket's lock;
+    reads merge the shards like any other rows. A batch usually touches one
+    or two buckets.
+    """
+    if not sketches:
+        return
+    shard = writer_shard() if shard is None else shard
+    create, lock, update = statements
+    keys = sorted(sketches)
+    await driver.execute(create, keys, shard)
+    stored = {row[0]: tuple(row)[1:] for row in await driver.fetch(lock, keys, shard)}
+    await driver.executemany(update, [
+        (key, shard, *BucketSketches.from_row(*stored[key]).merge(sketches[key]).to_row())
+        for key in keys
+    ])
@@ -0,0 +1,197 @@
+"""Interning of user agent strings into the ``user_agents`` dimension."""
+
+import asyncio
+import logging
+import re
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.config import settings
+from app.database import engine
+from app.models.user_agent import UserAgent
+
+logger = logging.getLogger(__name__)
+
+FIELD_LENGTH = 32
+
+WHITESPACE = re.compile(r"\s+")
+
+BOT_PATTERN = re.compile(
+    r"bot\b|bot/|crawler|spider|slurp|headless|curl/|wget/|python-|httpx|okhttp|go-http-client|java/",
+    re.IGNORECASE,
+)
+BOT_TOKEN = re.compile(r"([\w-]*(?:bot|crawler|spider))/?([\d.]*)", re.IGNORECASE)
+PRODUCT_TOKEN = re.compile(r"^([\w.-]+)/([\w.]+)")
+
+# First match wins, so browsers that embed another's token come first
+BROWSERS = (
+    ("Edge", re.compile(r"Edg(?:e|A|iOS)?/([\d.]+)")),
+    ("Opera", re.compile(r"(?:OPR|Opera)/([\d.]+)")),
+    ("Samsung Internet", re.compile(r"SamsungBrowser/([\d.]+)")),
+    ("Firefox", re.compile(r"(?:Firefox|FxiOS)/([\d.]+)")),
+    ("Chrome", re.compile(r"(?:Chrome|CriOS)/([\d.]+)")),
+    ("Safari", re.compile(r"Version/([\d.]+).*Safari/")),
+    ("Internet Explorer", re.compile(r"(?:MSIE |Trident/.*rv:)([\d.]+)")),
+)
+
+# iOS agents say "like Mac OS X" and Android ones "Linux"
+OPERATING_SYSTEMS = (
+    ("Windows", re.compile(r"Windows NT ([\d.]+)")),
+    ("iOS", re.compile(r"(?:iPhone|CPU) OS ([\d_]+)")),
+    ("Android", re.compile(r"Android ([\d.]+)")),
+    ("ChromeOS", re.compile(r"CrOS \S+ ([\d.]+)")),
+    ("macOS", re.compile(r"Mac OS X ([\d_.]+)")),
+    ("Linux", re.compile(r"Linux()")),
+)
+
+WINDOWS_VERSIONS = {"10.0": "10", "6.3": "8.1", "6.2": "8", "6.1": "7"}
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedUserAgent:
+    """Browser, operating system and device class of a user agent."""
+    
+    browser: str | None
+    browser_version: str | None
+    os: str | None
+    os_version: str | None
+    device: str
+    
+    def clipped(self) -> "ParsedUserAgent":
+        """Copy with every field cut to the column length."""
+        return ParsedUserAgent(*(
+            value[:FIELD_LENGTH] if value else None
+            for value in (self.browser, self.browser_version, self.os, self.os_version)
+        ), device=self.device)
+
+
+def normalize_user_agent(user_agent: str | None) -> str | None:
+    """Agent string as interned: whitespace collapsed and length capped.
+    
+    Clients choose the header, so this bounds the size of dimension rows
+    and folds trivially different spellings of one agent together.
+    """
+    if not user_agent:
+        return None
+    return WHITESPACE.sub(" ", user_agent).strip()[:settings.user_agent_max_length] or None
+
+
+def _first(
+    patterns: Sequence[tuple[str, re.Pattern[str]]], user_agent: str
+) -> tuple[str | None, str | None]:
+    for name, pattern in patterns:
+        match = pattern.search(user_agent)
+        if match:
+            return name, match.group(1) or None
+    return None, None
+
+
+def parse_user_agent(user_agent: str) -> ParsedUserAgent:
+    """Classify an agent string by a small set of ordered patterns.
+    
+    This runs once per distinct agent, when it is interned, so it favours
+    readability over speed. Unknown agents keep NULL fields and the
+    ``other`` device class.
+    """
+    if BOT_PATTERN.search(user_agent):
+        match = BOT_TOKEN.search(user_agent) or PRODUCT_TOKEN.search(user_agent)
+        name, version = (match.group(1), match.group(2) or None) if match else (None, None)
+        return ParsedUserAgent(name, version, None, None, "bot").clipped()
+    
+    browser, browser_version = _first(BROWSERS, user_agent)
+    os, os_version = _first(OPERATING_SYSTEMS, user_agent)
+    if os == "Windows":
+        os_version = WINDOWS_VERSIONS.get(os_version, os_version)
+    elif os in ("iOS", "macOS") and os_version:
+        os_version = os_version.replace("_", ".")
+    if os == "iOS" and "iPad" in user_agent:
+        os = "iPadOS"
+    
+    if "iPad" in user_agent or "Tablet" in user_agent or (os == "Android" and "Mobile" not in user_agent):
+        device = "tablet"
+    elif "Mobi" in user_agent or "iPhone" in user_agent:
+        device = "mobile"
+    elif os is not None:
+        device = "desktop"
+    else:
+        device = "other"
+    return ParsedUserAgent(browser, browser_version, os, os_version, device).clipped()
+
+
+class UserAgentCache:
+    """Worker-local LRU from agent strings to their ``user_agents`` ids.
+    
+    Spins resolve their agent here before building result records. A hit
+    is a dictionary lookup. A miss parses the agent and upserts it in its
+    own committed transaction, so the id is durable before any result
+    referencing it is written; concurrent misses for one agent share that
+    round trip. Agents are normalized first (see ``normalize_user_agent``).
+    If the database cannot be reached the spin goes ahead without an agent
+    rather than failing.
+    """
+    
+    def __init__(self, maxsize: int = settings.user_agent_cache_size) -> None:
+        self._maxsize = maxsize
+        self._ids: OrderedDict[str, int] = OrderedDict()
+        self._pending: dict[str, asyncio.Task[int]] = {}
+    
+    def __len__(self) -> int:
+        """Number of cached agents."""
+        return len(self._ids)
+    
+    async def intern(self, user_agent: str | None) -> int | None:
+        """Id of the agent's dimension row, creating it on first sight."""
+        user_agent = normalize_user_agent(user_agent)
+        if user_agent is None:
+            return None
+        agent_id = self._ids.get(user_agent)
+        if agent_id is not None:
+            self._ids.move_to_end(user_agent)
+            return agent_id
+        
+        task = self._pending.get(user_agent)
+        if task is None:
+            task = self._pending[user_agent] = asyncio.create_task(self._resolve(user_agent))
+            task.add_done_callback(lambda _: self._pending.pop(user_agent, None))
+        try:
+            # Shielded so one cancelled request does not fail the others
+            return await asyncio.shield(task)
+        except Exception:
+            logger.exception("Failed to intern a user agent")
+            return None
+    
+    def put(self, user_agent: str, agent_id: int) -> None:
+        """Remember the id of an agent."""
+        self._ids[user_agent] = agent_id
+        self._ids.move_to_end(user_agent)
+        while len(self._ids) > self._maxsize:
+            self._ids.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Forget all agents."""
+        self._ids.clear()
+    
+    async def _resolve(self, user_agent: str) -> int:
+        digest = UserAgent.compute_digest(user_agent)
+        stmt = (
+            pg_insert(UserAgent)
+            .values(digest=digest, user_agent=user_agent, **asdict(parse_user_agent(user_agent)))
+            .on_conflict_do_nothing(index_elements=[UserAgent.digest])
+            .returning(UserAgent.id)
+        )
+        async with engine.begin() as conn:
+            agent_id = (await conn.execute(stmt)).scalar()
+            if agent_id is None:
+                # Inserted by another worker; visible once its transaction committed
+                agent_id = (await conn.execute(
+                    select(UserAgent.id).where(UserAgent.digest == digest)
+                )).scalar_one()
+        self.put(user_agent, agent_id)
+        return agent_id
+
+
+user_agent_cache = UserAgentCache()
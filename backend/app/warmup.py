@@ -0,0 +1,121 @@
+"""Bring a fresh worker to steady state before it reports ready."""
+
+import asyncio
+import logging
+import time
+import uuid
+
+from sqlalchemy import Select, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import configure_mappers
+
+from app.api.auth import user_query
+from app.api.names import names_query
+from app.api.pagination import DEFAULT_PAGE_SIZE
+from app.api.results import history_query
+from app.config import settings
+from app.database import AsyncSessionLocal, engine, replica_router
+from app.services.roster import roster_cache
+
+logger = logging.getLogger(__name__)
+
+
+def hot_queries() -> list[Select]:
+    """Statements on the request path, built exactly as the endpoints build them.
+    
+    Limits and filter values are bound parameters, so running these once
+    compiles and prepares the same SQL that real requests will send.
+    """
+    placeholder = uuid.UUID(int=0)
+    return [
+        names_query(None, None, DEFAULT_PAGE_SIZE),
+        names_query(True, None, DEFAULT_PAGE_SIZE),
+        history_query(None, None, None, DEFAULT_PAGE_SIZE),
+        history_query(placeholder, None, None, DEFAULT_PAGE_SIZE),
+        user_query(placeholder),
+    ]
+
+
+async def warm_pool(target: AsyncEngine, connections: int, statements: list[Select]) -> None:
+    """Open ``connections`` pooled connections at once and prepare statements on each.
+    
+    asyncpg caches prepared statements per connection, so every pooled
+    connection gets its own copy before it serves a request.
+    """
+    conns = [target.connect() for _ in range(connections)]
+    try:
+        await asyncio.gather(*(conn.start() for conn in conns))
+        for conn in conns:
+            await conn.execute(text("SELECT 1"))
+            for stmt in statements:
+                await conn.execute(stmt)
+    finally:
+        await asyncio.gather(*(conn.close() for conn in conns), return_exceptions=True)
+
+
+async def warm_roster() -> int:
+    """Load the active roster and build everything a spin needs."""
+    async with AsyncSessionLocal() as db:
+        roster = await roster_cache.get(db)
+    if len(roster):
+        roster.spin()
+        roster.spin_many(1)  # materializes the NumPy sampler arrays
+        _ = roster.snapshot_key
+    return len(roster)
+
+
+async def warm_up(connections: int = settings.warmup_pool_connections) -> None:
+    """Pre-warm mappers, pools, hot statements and the roster."""
+    started = time.perf_counter()
+    configure_mappers()
+    statements = hot_queries()
+    targets = [engine, *replica_router.replicas]
+    await asyncio.gather(*(warm_pool(target, connections, statements) for target in targets))
+    names = await warm_roster()
+    logger.info(
+        "Warm-up finished in %.3fs: %d connection(s) per engine, %d active names",
+        time.perf_counter() - started,
+        connections,
+        names,
+    )
+
+
+class Readiness:
+    """Runs warm-up in the background and tracks whether it has finished.
+    
+    The server accepts connections (and answers liveness checks) while the
+    warm-up runs; readiness flips once it succeeds. Failures, e.g. a database
+    that is still starting, are retried every ``retry_interval`` seconds.
+    """
+    
+    def __init__(self, retry_interval: float = settings.warmup_retry_interval) -> None:
+        self.retry_interval = retry_interval
+        self.ready = False
+        self._task: asyncio.Task[None] | None = None
+    
+    async def start(self) -> None:
+        """Start warming up."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="warm-up")
+    
+    async def stop(self) -> None:
+        """Stop warming up and report not ready while shutting down."""
+        self.ready = False
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+    
+    async def _run(self) -> None:
+        while True:
+            try:
+                await warm_up()
+            except Exception:
+                logger.exception("Warm-up failed, retrying in %.1fs", self.retry_interval)
+                await asyncio.sleep(self.retry_interval)
+            else:
+                self.ready = True
+                return
+
+
+readiness = Readiness()
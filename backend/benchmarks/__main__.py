@@ -0,0 +1,146 @@
+"""Command line entry point: ``python -m benchmarks <command>``."""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from dataclasses import asdict
+
+from benchmarks import api, micro
+from benchmarks.harness import build_report, compare_reports, load_report, write_report
+from benchmarks.seed import SeedConfig
+
+
+def _seed(args: argparse.Namespace) -> int:
+    from app.database import close_db, init_db
+    from benchmarks.seed import reset, seed
+    
+    config = SeedConfig(
+        names=args.names,
+        results=args.results,
+        sessions=args.sessions,
+        days=args.days,
+        seed=args.seed,
+        batch_size=args.batch_size,
+    )
+    
+    async def main() -> dict[str, object]:
+        try:
+            await init_db()
+            if args.reset:
+                await reset()
+            return await seed(config)
+        finally:
+            await close_db()
+    
+    summary = asyncio.run(main())
+    print(json.dumps({**asdict(config), **summary}, indent=2))
+    return 0
+
+
+def _micro(args: argparse.Namespace) -> int:
+    config = {
+        'names': args.names,
+        'iterations': args.iterations,
+        'batch_size': args.batch_size,
+        'seed': args.seed,
+    }
+    results = micro.run(**config)
+    return _report("micro", config, results, args.output)
+
+
+def _api(args: argparse.Namespace) -> int:
+    config = {
+        'base_url': args.base_url,
+        'scenarios': tuple(args.scenario or api.SCENARIOS),
+        'requests': args.requests,
+        'concurrency': args.concurrency,
+        'batch_count': args.batch_count,
+        'pages': args.pages,
+        'page_size': args.page_size,
+    }
+    results = asyncio.run(api.run(**config))
+    return _report("api", {**config, 'scenarios': list(config['scenarios'])}, results, args.output)
+
+
+def _report(suite: str, config: dict, results: list, output: str | None) -> int:
+    report = build_report(suite, config, results)
+    print(f"{'benchmark':<28}{'p50 ms':>12}{'p95 ms':>12}{'p99 ms':>12}{'ops/s':>16}{'errors':>8}")
+    for result in report['results']:
+        print(
+            f"{result['name']:<28}{result.get('p50_ms', float('nan')):>12.4f}"
+            f"{result.get('p95_ms', float('nan')):>12.4f}"
+            f"{result.get('p99_ms', float('nan')):>12.4f}"
+            f"{result['throughput_per_s'] or 0:>16.1f}{result['errors']:>8}"
+        )
+    if output:
+        print(f"Wrote {write_report(report, output)}")
+    return 1 if any(result['errors'] for result in report['results']) else 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+    comparisons = compare_reports(
+        load_report(args.baseline), load_report(args.current), args.threshold
+    )
+    for item in comparisons:
+        flag = "REGRESSION" if item.regression else ""
+        print(
+            f"{item.name:<28}{item.metric:<18}{item.baseline:>14.4f}"
+            f"{item.current:>14.4f}{item.change:>+10.1%}  {flag}"
+        )
+    return 1 if any(item.regression for item in comparisons) else 0
+
+
+def parser() -> argparse.ArgumentParser:
+    """Argument parser for all benchmark commands."""
+    root = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    commands = root.add_subparsers(dest="command", required=True)
+    
+    seed = commands.add_parser("seed", help="load synthetic names and results")
+    seed.add_argument("--names", type=int, default=SeedConfig.names)
+    seed.add_argument("--results", type=int, default=SeedConfig.results)
+    seed.add_argument("--sessions", type=int, default=SeedConfig.sessions)
+    seed.add_argument("--days", type=int, default=SeedConfig.days)
+    seed.add_argument("--seed", type=int, default=SeedConfig.seed)
+    seed.add_argument("--batch-size", type=int, default=SeedConfig.batch_size)
+    seed.add_argument("--reset", action="store_true", help="truncate seeded tables first")
+    seed.set_defaults(handler=_seed)
+    
+    in_process = commands.add_parser("micro", help="in-process benchmarks, no services needed")
+    in_process.add_argument("--names", type=int, default=10_000)
+    in_process.add_argument("--iterations", type=int, default=1000)
+    in_process.add_argument("--batch-size", type=int, default=10_000)
+    in_process.add_argument("--seed", type=int, default=42)
+    in_process.add_argument("--output", help="write a JSON report to this path")
+    in_process.set_defaults(handler=_micro)
+    
+    load = commands.add_parser("api", help="HTTP load scenarios against a seeded database")
+    load.add_argument("--base-url", help="target a running server instead of the app in-process")
+    load.add_argument("--scenario", action="append", choices=api.SCENARIOS)
+    load.add_argument("--requests", type=int, default=1000)
+    load.add_argument("--concurrency", type=int, default=16)
+    load.add_argument("--batch-count", type=int, default=1000)
+    load.add_argument("--pages", type=int, default=10)
+    load.add_argument("--page-size", type=int, default=100)
+    load.add_argument("--output", help="write a JSON report to this path")
+    load.set_defaults(handler=_api)
+    
+    diff = commands.add_parser("compare", help="compare two reports")
+    diff.add_argument("baseline")
+    diff.add_argument("current")
+    diff.add_argument("--threshold", type=float, default=0.10,
+                      help="relative change flagged as a regression (default 0.10)")
+    diff.set_defaults(handler=_compare)
+    return root
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run a benchmark command and return its exit status."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    args = parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""HTTP load scenarios against a seeded database.
+
+By default requests go through the ASGI app in-process, which measures the
+service without network and server overhead; pass ``base_url`` to load a
+running deployment instead (e.g. uvicorn with several workers).
+"""
+
+import contextlib
+import uuid
+from collections.abc import AsyncIterator
+from typing import Any
+
+import httpx
+
+from benchmarks.harness import BenchmarkResult, measure_async
+
+SCENARIOS = (
+    "spin",
+    "spin_batch",
+    "names_crud",
+    "names_pages",
+    "results_pages",
+    "analytics_names",
+    "analytics_volume",
+    "analytics_session",
+)
+
+
+@contextlib.asynccontextmanager
+async def open_client(base_url: str | None) -> AsyncIterator[httpx.AsyncClient]:
+    """Client for a remote server, or for the app in-process with its lifespan."""
+    if base_url is not None:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60.0) as client:
+            yield client
+        return
+    
+    from app.main import app
+    
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark", timeout=60.0
+        ) as client:
+            yield client
+
+
+async def _get(client: httpx.AsyncClient, url: str, **params: Any) -> Any:
+    response = await client.get(url, params={k: v for k, v in params.items() if v is not None})
+    response.raise_for_status()
+    return response.json()
+
+
+async def _walk_pages(
+    client: httpx.AsyncClient, url: str, pages: int, page_size: int, **params: Any
+) -> None:
+    cursor = None
+    for _ in range(pages):
+        page = await _get(client, url, limit=page_size, cursor=cursor, **params)
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+
+
+async def seeded_sessions(client: httpx.AsyncClient, count: int) -> list[str]:
+    """Session ids that have history, taken from the newest results."""
+    page = await _get(client, "/api/results", limit=1000)
+    sessions = list(dict.fromkeys(item['session_id'] for item in page['items']))
+    return sessions[:count] or [str(uuid.uuid4())]
+
+
+async def run(
+    base_url: str | None = None,
+    scenarios: tuple[str, ...] = SCENARIOS,
+    requests: int = 1000,
+    concurrency: int = 16,
+    batch_count: int = 1000,
+    pages: int = 10,
+    page_size: int = 100,
+) -> list[BenchmarkResult]:
+    """Run the selected scenarios one after another and collect their latencies."""
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+    
+    results = []
+    async with open_client(base_url) as client:
+        sessions = await seeded_sessions(client, 100)
+        
+        def session_for(index: int) -> str:
+            return sessions[index % len(sessions)]
+        
+        async def spin(index: int) -> None:
+            response = await client.post(
+                "/api/spin", json={'session_id': session_for(index), 'spin_duration_ms': 3000}
+            )
+            response.raise_for_status()
+        
+        async def spin_batch(index: int) -> None:
+            response = await client.post("/api/spin/batch", json={
+                'session_id': session_for(index), 'count': batch_count,
+            })
+            response.raise_for_status()
+        
+        async def names_crud(index: int) -> None:
+            response = await client.post(
+                "/api/names", json={'name': f"Benchmark {uuid.uuid4().hex[:12]}"}
+            )
+            response.raise_for_status()
+            name_id = response.json()['id']
+            response = await client.patch(f"/api/names/{name_id}", json={'weight': 5})
+            response.raise_for_status()
+            response = await client.delete(f"/api/names/{name_id}")
+            response.raise_for_status()
+        
+        async def names_pages(index: int) -> None:
+            await _walk_pages(client, "/api/names", pages, page_size)
+        
+        async def results_pages(index: int) -> None:
+            await _walk_pages(
+                client, "/api/results", pages, page_size, session_id=session_for(index)
+            )
+        
+        async def analytics_names(index: int) -> None:
+            await _get(client, "/api/analytics/names", granularity="day")
+        
+        async def analytics_volume(index: int) -> None:
+            await _get(client, "/api/analytics/volume", granularity="hour")
+        
+        async def analytics_session(index: int) -> None:
+            await _get(client, f"/api/analytics/sessions/{session_for(index)}")
+        
+        handlers = {
+            "spin": (spin, 1, {}),
+            "spin_batch": (spin_batch, batch_count, {'count': batch_count}),
+            # One sample is a create, an update and a delete, each bumping the roster
+            "names_crud": (names_crud, 3, {}),
+            "names_pages": (names_pages, 1, {'pages': pages, 'page_size': page_size}),
+            "results_pages": (results_pages, 1, {'pages': pages, 'page_size': page_size}),
+            "analytics_names": (analytics_names, 1, {'granularity': "day"}),
+            "analytics_volume": (analytics_volume, 1, {'granularity': "hour"}),
+            "analytics_session": (analytics_session, 1, {}),
+        }
+        for scenario in scenarios:
+            handler, ops_per_sample, params = handlers[scenario]
+            results.append(await measure_async(
+                scenario,
+                handler,
+                requests,
+                concurrency=concurrency,
+                ops_per_sample=ops_per_sample,
+                **params,
+            ))
+    return results
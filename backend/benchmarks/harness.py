@@ -0,0 +1,225 @@
+"""Timing, statistics and JSON reports shared by the benchmark suites."""
+
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+REPORT_VERSION = 1
+
+# Metrics compared between reports and whether a higher value is better
+COMPARED_METRICS = {
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "throughput_per_s": True,
+}
+
+
+@dataclass(slots=True)
+class BenchmarkResult:
+    """Latencies of one benchmark; each sample covers ``ops_per_sample`` operations."""
+    
+    name: str
+    latencies: list[float]
+    wall_seconds: float
+    ops_per_sample: int = 1
+    concurrency: int = 1
+    errors: int = 0
+    params: dict[str, Any] = field(default_factory=dict)
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Summary statistics in milliseconds, as written to reports."""
+        samples = np.asarray(self.latencies, dtype=np.float64) * 1000.0
+        operations = len(self.latencies) * self.ops_per_sample
+        summary: dict[str, Any] = {
+            'name': self.name,
+            'samples': len(self.latencies),
+            'operations': operations,
+            'concurrency': self.concurrency,
+            'errors': self.errors,
+            'wall_seconds': round(self.wall_seconds, 6),
+            'throughput_per_s': (
+                round(operations / self.wall_seconds, 3) if self.wall_seconds else None
+            ),
+            'params': self.params,
+        }
+        if samples.size:
+            p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+            summary.update({
+                'mean_ms': round(float(samples.mean()), 6),
+                'min_ms': round(float(samples.min()), 6),
+                'p50_ms': round(float(p50), 6),
+                'p95_ms': round(float(p95), 6),
+                'p99_ms': round(float(p99), 6),
+                'max_ms': round(float(samples.max()), 6),
+            })
+        return summary
+
+
+def measure(
+    name: str,
+    func: Callable[[], Any],
+    iterations: int,
+    warmup: int = 10,
+    ops_per_sample: int = 1,
+    **params: Any,
+) -> BenchmarkResult:
+    """Time ``iterations`` sequential calls of a synchronous function."""
+    for _ in range(warmup):
+        func()
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    wall = time.perf_counter() - started
+    return BenchmarkResult(name, latencies, wall, ops_per_sample, params=params)
+
+
+async def measure_async(
+    name: str,
+    func: Callable[[int], Awaitable[Any]],
+    iterations: int,
+    concurrency: int = 1,
+    warmup: int = 5,
+    ops_per_sample: int = 1,
+    **params: Any,
+) -> BenchmarkResult:
+    """Run ``iterations`` calls of ``func(i)`` across ``concurrency`` workers.
+    
+    Failed calls are counted as errors and excluded from the latencies, so a
+    benchmark that starts failing shows up as errors rather than as a speedup.
+    """
+    for index in range(warmup):
+        await func(-index - 1)
+    
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(iterations))
+    
+    async def worker() -> None:
+        nonlocal errors
+        for index in counter:
+            start = time.perf_counter()
+            try:
+                await func(index)
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+    return BenchmarkResult(
+        name, latencies, wall, ops_per_sample, concurrency, errors, params
+    )
+
+
+def git_revision() -> str | None:
+    """Commit the benchmarked tree is at, with a marker for local changes."""
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{revision}-dirty" if dirty else revision
+
+
+def environment() -> dict[str, Any]:
+    """Machine and interpreter details recorded with every report."""
+    return {
+        'git_revision': git_revision(),
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+    }
+
+
+def build_report(
+    suite: str, config: dict[str, Any], results: Iterable[BenchmarkResult]
+) -> dict[str, Any]:
+    """Machine-readable report of one suite run."""
+    return {
+        'version': REPORT_VERSION,
+        'suite': suite,
+        'created_at': datetime.now(UTC).isoformat(),
+        'environment': environment(),
+        'config': config,
+        'results': [result.to_dict() for result in results],
+    }
+
+
+def write_report(report: dict[str, Any], path: str | Path) -> Path:
+    """Write a report as JSON, creating parent directories."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+    return path
+
+
+def load_report(path: str | Path) -> dict[str, Any]:
+    """Read a report written by ``write_report``."""
+    report = json.loads(Path(path).read_text())
+    if report.get('version') != REPORT_VERSION:
+        raise ValueError(f"{path}: unsupported report version {report.get('version')}")
+    return report
+
+
+@dataclass(frozen=True, slots=True)
+class Comparison:
+    """Change of one metric of one benchmark between two reports."""
+    
+    name: str
+    metric: str
+    baseline: float
+    current: float
+    change: float
+    regression: bool
+
+
+def compare_reports(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float = 0.10
+) -> list[Comparison]:
+    """Compare benchmarks present in both reports.
+    
+    ``change`` is relative to the baseline and signed so that positive means
+    worse; a change above ``threshold`` is flagged as a regression.
+    """
+    previous = {result['name']: result for result in baseline['results']}
+    comparisons = []
+    for result in current['results']:
+        before = previous.get(result['name'])
+        if before is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if higher_is_better:
+                change = -change
+            comparisons.append(
+                Comparison(result['name'], metric, old, new, change, change > threshold)
+            )
+    return comparisons
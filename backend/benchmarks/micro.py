@@ -0,0 +1,110 @@
+"""In-process benchmarks of the hot paths that need no database or Redis."""
+
+import random
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+
+from app.api.pagination import Page, decode_cursor, encode_cursor
+from app.api.results import HISTORY_FIELDS
+from app.schemas.game_result import GameResultRead
+from app.schemas.spin import SelectedName, SpinResponse
+from app.serialization import page_response
+from app.services.columnar import ColumnarStore
+from app.services.export import format_csv, format_ndjson
+from app.services.rollups import aggregate_results
+from app.services.roster import Roster, RosterEntry
+from app.services.sampler import AliasTable
+from benchmarks.harness import BenchmarkResult, measure
+from benchmarks.seed import generate_names, generate_results, session_ids
+
+EXPORT_ROWS = 1000
+
+
+def run(
+    names: int = 10_000,
+    iterations: int = 1000,
+    batch_size: int = 10_000,
+    seed: int = 42,
+) -> list[BenchmarkResult]:
+    """Run every micro benchmark against a synthetic roster of ``names`` entries."""
+    rng = random.Random(seed)
+    np_rng = np.random.default_rng(seed)
+    now = datetime.now(UTC)
+    rows = generate_names(names, rng, now)
+    entries = [RosterEntry(id=row[0], name=row[1], weight=row[4]) for row in sorted(rows)]
+    weights = [entry.weight for entry in entries]
+    roster = Roster(entries, version=1)
+    payload = roster.to_payload()
+    records = next(generate_results(
+        roster,
+        batch_size,
+        session_ids(max(batch_size // 100, 1), rng),
+        now - timedelta(days=1),
+        now,
+        np_rng,
+        batch_size,
+    ))
+    export_rows = [
+        (record[0], record[9], record[1], record[2], "Name", record[4], record[5],
+         None, record[7], record[8])
+        for record in records[:EXPORT_ROWS]
+    ]
+    history_rows = [
+        (record[0], record[1], record[2], "Name", record[4], record[5], "standard", record[9])
+        for record in records
+    ]
+    facts = sorted(
+        (record[9], record[0], record[2], record[5], record[1]) for record in records
+    )
+    store = ColumnarStore()
+    store.append(facts)
+    rollups = aggregate_results(records)
+    entry = entries[0]
+    session_id = uuid.uuid4()
+    cursor = encode_cursor(now, entry.id)
+    build_iterations = max(iterations // 100, 5)
+    
+    return [
+        measure("alias_table_build", lambda: AliasTable(weights), build_iterations,
+                warmup=1, names=names),
+        measure("roster_spin", roster.spin, iterations * 100, names=names),
+        measure("roster_spin_many", lambda: roster.spin_many(batch_size, np_rng),
+                iterations, ops_per_sample=batch_size, names=names, count=batch_size),
+        measure("roster_payload_encode", roster.to_payload, build_iterations,
+                warmup=1, names=names),
+        measure("roster_payload_decode", lambda: Roster.from_payload(payload, 1),
+                build_iterations, warmup=1, names=names),
+        measure("roster_snapshot_key", lambda: Roster(entries, 1, roster._table).snapshot_key,
+                build_iterations, warmup=1, names=names),
+        measure("rollup_aggregate", lambda: aggregate_results(records),
+                max(iterations // 10, 5), ops_per_sample=len(records), records=len(records)),
+        measure("sketch_build", lambda: [values.sketch() for values in rollups.sketches.values()],
+                max(iterations // 10, 5), ops_per_sample=len(records), records=len(records)),
+        measure("spin_response_serialize", lambda: SpinResponse(
+                    id=entry.id,
+                    session_id=session_id,
+                    selected=SelectedName(id=entry.id, name=entry.name, weight=entry.weight),
+                    roster_size=names,
+                    created_at=now,
+                ).model_dump_json(), iterations * 10),
+        measure("export_format_csv", lambda: format_csv(export_rows),
+                iterations, ops_per_sample=len(export_rows), rows=len(export_rows)),
+        measure("export_format_ndjson", lambda: format_ndjson(export_rows),
+                iterations, ops_per_sample=len(export_rows), rows=len(export_rows)),
+        measure("history_page_fast", lambda: page_response(HISTORY_FIELDS, history_rows, None),
+                max(iterations // 10, 5), ops_per_sample=len(history_rows), rows=len(history_rows)),
+        measure("history_page_model", lambda: Page[GameResultRead](
+                    items=[GameResultRead(**dict(zip(HISTORY_FIELDS, row))) for row in history_rows],
+                ).model_dump_json(),
+                max(iterations // 10, 5), ops_per_sample=len(history_rows), rows=len(history_rows)),
+        measure("columnar_heatmap", store.snapshot.heatmap,
+                max(iterations // 10, 5), ops_per_sample=len(store), rows=len(store)),
+        measure("columnar_percentiles", lambda: store.snapshot.duration_percentiles([50, 90, 99]),
+                max(iterations // 10, 5), ops_per_sample=len(store), rows=len(store)),
+        measure("columnar_selection_counts", store.snapshot.selection_counts,
+                max(iterations // 10, 5), ops_per_sample=len(store), rows=len(store)),
+        measure("cursor_round_trip", lambda: decode_cursor(encode_cursor(*decode_cursor(cursor))),
+                iterations * 10),
+    ]
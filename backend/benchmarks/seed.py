@@ -0,0 +1,196 @@
+"""Deterministic synthetic data for benchmarks.
+
+Names and results are generated from a seeded RNG so that two runs at the
+same scale benchmark the same data, and are loaded with binary COPY so that
+seeding millions of rows takes minutes rather than hours.
+"""
+
+import logging
+import random
+import uuid
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+from sqlalchemy import text
+
+from app.database import engine
+from app.services.partitions import add_months, create_partition_sql, month_start
+from app.services.result_writer import ResultRecord, build_result_record, copy_results
+from app.services.roster import Roster, RosterEntry, roster_cache, save_snapshot
+from app.services.user_agents import user_agent_cache
+
+logger = logging.getLogger(__name__)
+
+NAME_COLUMNS = ("id", "name", "description", "is_active", "weight", "created_at", "updated_at")
+
+SEEDED_TABLES = (
+    "game_results",
+    "spin_rollups_hourly",
+    "spin_rollups_daily",
+    "session_rollups",
+    "client_rollups_hourly",
+    "client_rollups_daily",
+    "spin_sketches_hourly",
+    "spin_sketches_daily",
+    "fairness_counts",
+    "roster_snapshots",
+    "names",
+)
+
+MAX_SEED_WEIGHT = 10
+INACTIVE_RATIO = 0.05
+MIN_DURATION_MS = 1000
+MAX_DURATION_MS = 6000
+BENCHMARK_USER_AGENT = "roulette-benchmark/1.0"
+
+
+@dataclass(frozen=True, slots=True)
+class SeedConfig:
+    """Scale and shape of the generated data set."""
+    
+    names: int = 1000
+    results: int = 100_000
+    sessions: int = 1000
+    days: int = 30
+    seed: int = 42
+    batch_size: int = 50_000
+
+
+def seeded_uuid(rng: random.Random) -> uuid.UUID:
+    """Random version 4 UUID drawn from ``rng`` rather than the OS."""
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def generate_names(
+    count: int, rng: random.Random, now: datetime
+) -> list[tuple]:
+    """Name rows in ``NAME_COLUMNS`` order, created over the last year."""
+    rows = []
+    for index in range(count):
+        created_at = now - timedelta(seconds=rng.randrange(365 * 86400))
+        rows.append((
+            seeded_uuid(rng),
+            f"Name {index:07d}",
+            None,
+            rng.random() >= INACTIVE_RATIO,
+            rng.randint(1, MAX_SEED_WEIGHT),
+            created_at,
+            created_at,
+        ))
+    return rows
+
+
+def session_ids(count: int, rng: random.Random) -> list[uuid.UUID]:
+    """Pool of session ids that results are spread over."""
+    return [seeded_uuid(rng) for _ in range(count)]
+
+
+def generate_results(
+    roster: Roster,
+    count: int,
+    sessions: list[uuid.UUID],
+    start: datetime,
+    end: datetime,
+    rng: np.random.Generator,
+    batch_size: int,
+    user_agent_id: int | None = None,
+) -> Iterator[list[ResultRecord]]:
+    """COPY-ready result records in batches, weighted like real spins."""
+    span = (end - start).total_seconds()
+    snapshot_key = roster.snapshot_key
+    for offset in range(0, count, batch_size):
+        size = min(batch_size, count - offset)
+        picks = roster.spin_many(size, rng)
+        session_picks = rng.integers(0, len(sessions), size)
+        seconds = np.sort(rng.uniform(0, span, size))
+        durations = rng.integers(MIN_DURATION_MS, MAX_DURATION_MS, size)
+        batch = []
+        for pick, session, second, duration in zip(
+            picks.tolist(), session_picks.tolist(), seconds.tolist(), durations.tolist()
+        ):
+            entry = roster.entries[pick]
+            batch.append(build_result_record(
+                id=uuid.UUID(bytes=rng.bytes(16), version=4),
+                session_id=sessions[session],
+                selected_name_id=entry.id,
+                selected_name_snapshot=entry.snapshot(),
+                roster_snapshot_key=snapshot_key,
+                spin_duration_ms=duration,
+                user_ip="127.0.0.1",
+                user_agent_id=user_agent_id,
+                created_at=start + timedelta(seconds=second),
+            ))
+        yield batch
+
+
+async def reset() -> None:
+    """Empty every table the seeder writes to."""
+    async with engine.begin() as conn:
+        await conn.execute(text(f"TRUNCATE {', '.join(SEEDED_TABLES)} CASCADE"))
+
+
+async def ensure_result_partitions(start: datetime, end: datetime) -> None:
+    """Create monthly partitions covering the seeded time window."""
+    month, last = month_start(start), month_start(end)
+    async with engine.begin() as conn:
+        while month <= last:
+            await conn.execute(text(create_partition_sql(month)))
+            month = add_months(month, 1)
+
+
+async def copy_names(rows: list[tuple], batch_size: int) -> None:
+    """Load name rows with binary COPY."""
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        driver = raw.driver_connection
+        async with driver.transaction():
+            for offset in range(0, len(rows), batch_size):
+                await driver.copy_records_to_table(
+                    "names",
+                    records=rows[offset:offset + batch_size],
+                    columns=NAME_COLUMNS,
+                )
+
+
+async def seed(config: SeedConfig, now: datetime | None = None) -> dict[str, object]:
+    """Generate and load names, the roster snapshot and results with rollups."""
+    now = now or datetime.now(UTC)
+    rng = random.Random(config.seed)
+    np_rng = np.random.default_rng(config.seed)
+    
+    names = generate_names(config.names, rng, now)
+    await copy_names(names, config.batch_size)
+    logger.info("Seeded %d names", len(names))
+    
+    entries = [
+        RosterEntry(id=row[0], name=row[1], weight=row[4])
+        for row in sorted(names) if row[3]
+    ]
+    roster = Roster(entries, version=0)
+    await save_snapshot(roster)
+    
+    start = now - timedelta(days=config.days)
+    await ensure_result_partitions(start, now)
+    sessions = session_ids(config.sessions, rng)
+    user_agent_id = await user_agent_cache.intern(BENCHMARK_USER_AGENT)
+    written = 0
+    for batch in generate_results(
+        roster, config.results, sessions, start, now, np_rng, config.batch_size, user_agent_id
+    ):
+        await copy_results(batch)
+        written += len(batch)
+        logger.info("Seeded %d/%d results", written, config.results)
+    
+    # Names were written behind the API's back
+    await roster_cache.bump()
+    return {
+        'names': len(names),
+        'active_names': len(entries),
+        'results': written,
+        'sessions': len(sessions),
+        'window_start': start.isoformat(),
+        'window_end': now.isoformat(),
+        'snapshot_key': roster.snapshot_key,
+    }
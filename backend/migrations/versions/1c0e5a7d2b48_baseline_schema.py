@@ -0,0 +1,89 @@
+"""Create the baseline users, names and game_results tables
+
+Revision ID: 1c0e5a7d2b48
+Revises: 
+Create Date: 2026-10-18 06:00:00.000000
+
+The schema as it stood before roster snapshots, rollups and partitioning;
+the following revisions bring it up to date one change at a time. A
+database whose tables were created by ``init_db`` already matches the
+models and should be stamped at ``head`` instead of upgraded.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '1c0e5a7d2b48'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def timestamp_columns() -> list[sa.Column]:
+    return [
+        sa.Column("id", sa.UUID(), primary_key=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True),
+            server_default=sa.func.now(), nullable=False,
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True),
+            server_default=sa.func.now(), nullable=False,
+        ),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        *timestamp_columns(),
+        sa.Column("username", sa.String(50), nullable=False),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("password_hash", sa.String(255), nullable=False),
+        sa.Column("role", sa.String(20), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+    )
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    
+    op.create_table(
+        "names",
+        *timestamp_columns(),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("weight", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_by", sa.UUID(),
+            sa.ForeignKey("users.id", ondelete="SET NULL"), nullable=True,
+        ),
+    )
+    op.create_index("ix_names_is_active", "names", ["is_active"])
+    
+    op.create_table(
+        "game_results",
+        *timestamp_columns(),
+        sa.Column("session_id", sa.UUID(), nullable=False),
+        sa.Column(
+            "selected_name_id", sa.UUID(),
+            sa.ForeignKey("names.id", ondelete="SET NULL"), nullable=True,
+        ),
+        sa.Column("selected_name_snapshot", postgresql.JSONB(), nullable=False),
+        sa.Column("available_names", postgresql.JSONB(), nullable=False),
+        sa.Column("spin_duration_ms", sa.Integer(), nullable=True),
+        sa.Column(
+            "user_id", sa.UUID(),
+            sa.ForeignKey("users.id", ondelete="SET NULL"), nullable=True,
+        ),
+        sa.Column("user_ip", postgresql.INET(), nullable=True),
+        sa.Column("user_agent", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_game_results_session_id", "game_results", ["session_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("game_results")
+    op.drop_table("names")
+    op.drop_table("users")
@@ -0,0 +1,58 @@
+"""Reference content-addressed roster snapshots from game results
+
+Revision ID: 2d7f9b3e6a15
+Revises: 1c0e5a7d2b48
+Create Date: 2026-10-18 06:15:00.000000
+
+Existing results keep their inline ``available_names``; new ones reference
+a ``roster_snapshots`` row instead, and every row must have one of the two.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '2d7f9b3e6a15'
+down_revision = '1c0e5a7d2b48'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "roster_snapshots",
+        sa.Column("key", sa.String(64), primary_key=True),
+        sa.Column("entries", postgresql.JSONB(), nullable=False),
+        sa.Column("name_count", sa.Integer(), nullable=False),
+        sa.Column("total_weight", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True),
+            server_default=sa.func.now(), nullable=False,
+        ),
+    )
+    op.add_column(
+        "game_results",
+        sa.Column(
+            "roster_snapshot_key", sa.String(64),
+            sa.ForeignKey("roster_snapshots.key", ondelete="RESTRICT"), nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_game_results_roster_snapshot_key", "game_results", ["roster_snapshot_key"]
+    )
+    op.alter_column("game_results", "available_names", nullable=True)
+    op.create_check_constraint(
+        "ck_game_results_roster_source",
+        "game_results",
+        "roster_snapshot_key IS NOT NULL OR available_names IS NOT NULL",
+    )
+
+
+def downgrade() -> None:
+    # Fails if results without inline candidates exist, which would lose data
+    op.drop_constraint("ck_game_results_roster_source", "game_results", type_="check")
+    op.alter_column("game_results", "available_names", nullable=False)
+    op.drop_index("ix_game_results_roster_snapshot_key", table_name="game_results")
+    op.drop_column("game_results", "roster_snapshot_key")
+    op.drop_table("roster_snapshots")
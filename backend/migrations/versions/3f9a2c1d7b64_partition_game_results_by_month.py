@@ -0,0 +1,140 @@
+"""Partition game_results by month on created_at
+
+Revision ID: 3f9a2c1d7b64
+Revises: 7b9d1f4a2c60
+Create Date: 2026-10-18 09:00:00.000000
+
+Converts the ``game_results`` table built by the earlier revisions into
+a RANGE-partitioned table with one partition per UTC month, copying the
+existing rows. Partitions are named ``game_results_pYYYYMM`` to match
+``app.services.partitions``, which creates future months and prunes expired
+ones at runtime.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a2c1d7b64'
+down_revision = '7b9d1f4a2c60'
+branch_labels = None
+depends_on = None
+
+COLUMNS = (
+    "id, session_id, selected_name_id, selected_name_snapshot, roster_snapshot_key, "
+    "available_names, spin_duration_ms, user_id, user_ip, user_agent, "
+    "created_at, updated_at"
+)
+
+TABLE_BODY = """
+    id UUID NOT NULL,
+    session_id UUID NOT NULL,
+    selected_name_id UUID REFERENCES names (id) ON DELETE SET NULL,
+    selected_name_snapshot JSONB NOT NULL,
+    roster_snapshot_key VARCHAR(64) REFERENCES roster_snapshots (key) ON DELETE RESTRICT,
+    available_names JSONB,
+    spin_duration_ms INTEGER,
+    user_id UUID REFERENCES users (id) ON DELETE SET NULL,
+    user_ip INET,
+    user_agent TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+    CONSTRAINT ck_game_results_roster_source
+        CHECK (roster_snapshot_key IS NOT NULL OR available_names IS NOT NULL)
+"""
+
+INDEXES = (
+    ("ix_game_results_roster_snapshot_key", "roster_snapshot_key"),
+    ("ix_game_results_session_created_at", "session_id, created_at, id"),
+    ("ix_game_results_selected_name_created_at", "selected_name_id, created_at, id"),
+)
+
+# One partition per UTC month from the oldest row through two months ahead
+CREATE_MONTHLY_PARTITIONS = """
+DO $$
+DECLARE
+    first_month date;
+    month date;
+BEGIN
+    SELECT date_trunc('month', coalesce(min(created_at), now()) AT TIME ZONE 'UTC')::date
+    INTO first_month
+    FROM game_results_unpartitioned;
+    
+    FOR month IN
+        SELECT generate_series(
+            first_month,
+            date_trunc('month', now() AT TIME ZONE 'UTC')::date + interval '2 months',
+            interval '1 month'
+        )::date
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF game_results '
+            'FOR VALUES FROM (%L) TO (%L)',
+            'game_results_p' || to_char(month, 'YYYYMM'),
+            month::timestamp AT TIME ZONE 'UTC',
+            (month + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+        );
+    END LOOP;
+END $$;
+"""
+
+
+def create_indexes() -> None:
+    """Create the secondary indexes on game_results."""
+    for name, columns in INDEXES:
+        op.execute(f"CREATE INDEX {name} ON game_results ({columns})")
+
+
+def drop_old_indexes() -> None:
+    """Drop secondary indexes so their names can be reused."""
+    for name, _ in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.execute("ALTER TABLE game_results RENAME TO game_results_unpartitioned")
+    op.execute(
+        "ALTER TABLE game_results_unpartitioned "
+        "RENAME CONSTRAINT game_results_pkey TO game_results_unpartitioned_pkey"
+    )
+    drop_old_indexes()
+    
+    op.execute(f"""
+        CREATE TABLE game_results (
+            {TABLE_BODY},
+            CONSTRAINT game_results_pkey PRIMARY KEY (created_at, id)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute(CREATE_MONTHLY_PARTITIONS)
+    op.execute(
+        f"INSERT INTO game_results ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM game_results_unpartitioned"
+    )
+    op.execute("DROP TABLE game_results_unpartitioned")
+    create_indexes()
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.execute("ALTER TABLE game_results RENAME TO game_results_partitioned")
+    op.execute(
+        "ALTER TABLE game_results_partitioned "
+        "RENAME CONSTRAINT game_results_pkey TO game_results_partitioned_pkey"
+    )
+    drop_old_indexes()
+    
+    op.execute(f"""
+        CREATE TABLE game_results (
+            {TABLE_BODY},
+            CONSTRAINT game_results_pkey PRIMARY KEY (created_at, id)
+        )
+    """)
+    op.execute(
+        f"INSERT INTO game_results ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM game_results_partitioned"
+    )
+    # Dropping the parent drops every partition with it
+    op.execute("DROP TABLE game_results_partitioned")
+    create_indexes()
+    # The partitioned primary key stood in for this index
+    op.execute("CREATE INDEX ix_game_results_created_at_id ON game_results (created_at, id)")
@@ -0,0 +1,58 @@
+"""Add per-hour, per-day and per-session spin rollups
+
+Revision ID: 5a3c8e1f0d92
+Revises: 2d7f9b3e6a15
+Create Date: 2026-10-18 06:30:00.000000
+
+Rollups only cover results written after this migration.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a3c8e1f0d92'
+down_revision = '2d7f9b3e6a15'
+branch_labels = None
+depends_on = None
+
+
+def duration_columns() -> list[sa.Column]:
+    return [
+        sa.Column("spin_count", sa.BigInteger(), nullable=False),
+        sa.Column("duration_count", sa.BigInteger(), nullable=False),
+        sa.Column("duration_sum", sa.BigInteger(), nullable=False),
+        sa.Column("duration_sq_sum", sa.Float(), nullable=False),
+        sa.Column("duration_min", sa.Integer(), nullable=True),
+        sa.Column("duration_max", sa.Integer(), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "spin_rollups_hourly",
+        sa.Column("bucket_start", sa.DateTime(timezone=True), primary_key=True),
+        sa.Column("name_id", sa.UUID(), primary_key=True),
+        *duration_columns(),
+    )
+    op.create_index("ix_spin_rollups_hourly_name_id", "spin_rollups_hourly", ["name_id"])
+    op.create_table(
+        "spin_rollups_daily",
+        sa.Column("bucket_date", sa.Date(), primary_key=True),
+        sa.Column("name_id", sa.UUID(), primary_key=True),
+        *duration_columns(),
+    )
+    op.create_index("ix_spin_rollups_daily_name_id", "spin_rollups_daily", ["name_id"])
+    op.create_table(
+        "session_rollups",
+        sa.Column("session_id", sa.UUID(), primary_key=True),
+        sa.Column("first_spin_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_spin_at", sa.DateTime(timezone=True), nullable=False),
+        *duration_columns(),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("session_rollups")
+    op.drop_table("spin_rollups_daily")
+    op.drop_table("spin_rollups_hourly")
@@ -0,0 +1,48 @@
+"""Add per-hour and per-day approximate analytics sketches
+
+Revision ID: 6e2f4c9b1a37
+Revises: d5b7e3a0c812
+Create Date: 2026-10-18 16:00:00.000000
+
+Sketches only cover results written after this migration; historical
+buckets stay empty until they are backfilled. Each bucket is split into
+shards written by different workers and merged on read.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e2f4c9b1a37'
+down_revision = 'd5b7e3a0c812'
+branch_labels = None
+depends_on = None
+
+
+def sketch_columns() -> list[sa.Column]:
+    return [
+        sa.Column("users", sa.LargeBinary(), nullable=True),
+        sa.Column("ips", sa.LargeBinary(), nullable=True),
+        sa.Column("sessions", sa.LargeBinary(), nullable=True),
+        sa.Column("durations", sa.LargeBinary(), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "spin_sketches_hourly",
+        sa.Column("bucket_start", sa.DateTime(timezone=True), primary_key=True),
+        sa.Column("shard", sa.SmallInteger(), primary_key=True),
+        *sketch_columns(),
+    )
+    op.create_table(
+        "spin_sketches_daily",
+        sa.Column("bucket_date", sa.Date(), primary_key=True),
+        sa.Column("shard", sa.SmallInteger(), primary_key=True),
+        *sketch_columns(),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("spin_sketches_daily")
+    op.drop_table("spin_sketches_hourly")
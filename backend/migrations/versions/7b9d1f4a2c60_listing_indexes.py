@@ -0,0 +1,43 @@
+"""Add composite indexes for keyset pagination of listings
+
+Revision ID: 7b9d1f4a2c60
+Revises: 5a3c8e1f0d92
+Create Date: 2026-10-18 06:45:00.000000
+
+The single-column ``is_active`` and ``session_id`` indexes are prefixes
+of the new composites and are dropped.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '7b9d1f4a2c60'
+down_revision = '5a3c8e1f0d92'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ("ix_names_created_at_id", "names", ["created_at", "id"]),
+    ("ix_names_is_active_created_at_id", "names", ["is_active", "created_at", "id"]),
+    ("ix_game_results_created_at_id", "game_results", ["created_at", "id"]),
+    ("ix_game_results_session_created_at", "game_results", ["session_id", "created_at", "id"]),
+    (
+        "ix_game_results_selected_name_created_at",
+        "game_results",
+        ["selected_name_id", "created_at", "id"],
+    ),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+    op.drop_index("ix_names_is_active", table_name="names")
+    op.drop_index("ix_game_results_session_id", table_name="game_results")
+
+
+def downgrade() -> None:
+    op.create_index("ix_game_results_session_id", "game_results", ["session_id"])
+    op.create_index("ix_names_is_active", "names", ["is_active"])
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,34 @@
+"""Make names unique ignoring case
+
+Revision ID: 8c41e2b7a9d0
+Revises: 3f9a2c1d7b64
+Create Date: 2026-10-18 12:00:00.000000
+
+Adds the ``uq_names_name_lower`` expression index used as the conflict
+target of bulk name imports. Fails with the offending names if the table
+already holds case-insensitive duplicates, which have to be merged by hand.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c41e2b7a9d0'
+down_revision = '3f9a2c1d7b64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    duplicates = op.get_bind().execute(sa.text("""
+        SELECT lower(name) FROM names GROUP BY lower(name) HAVING count(*) > 1 LIMIT 20
+    """)).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            "Merge or rename duplicate names before upgrading: " + ", ".join(duplicates)
+        )
+    op.execute("CREATE UNIQUE INDEX uq_names_name_lower ON names (lower(name))")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS uq_names_name_lower")
@@ -0,0 +1,41 @@
+"""Add fairness audit counters per roster snapshot
+
+Revision ID: a4c8d2f61b95
+Revises: 6e2f4c9b1a37
+Create Date: 2026-10-18 17:00:00.000000
+
+The writer counts results from the time this migration runs, recorded as
+``streaming_since``; ``python -m app.services.fairness`` backfills the
+results written before it. Results that workers of the previous release
+write between the migration and their restart are in neither range.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4c8d2f61b95'
+down_revision = '6e2f4c9b1a37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "fairness_counts",
+        sa.Column("snapshot_key", sa.String(64), primary_key=True),
+        sa.Column("name_id", sa.UUID(), primary_key=True),
+        sa.Column("observed", sa.BigInteger(), nullable=False),
+    )
+    op.create_table(
+        "fairness_audit_state",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("streaming_since", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("backfilled_until", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.execute("INSERT INTO fairness_audit_state (id, streaming_since) VALUES (1, now())")
+
+
+def downgrade() -> None:
+    op.drop_table("fairness_audit_state")
+    op.drop_table("fairness_counts")
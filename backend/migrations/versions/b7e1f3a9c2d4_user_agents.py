@@ -0,0 +1,88 @@
+"""Intern user agents into a dimension table
+
+Revision ID: b7e1f3a9c2d4
+Revises: a4c8d2f61b95
+Create Date: 2026-10-18 18:00:00.000000
+
+New results reference ``user_agents`` by id and leave the legacy
+``user_agent`` text NULL. Existing rows keep their text, which readers fall
+back to, until retention drops their partitions; rewriting them in place
+would bloat every partition for a one-off saving.
+
+Spins per agent are rolled up by hour and day like the name rollups, so
+the clients endpoint never scans results. Existing results have no agent
+id yet and are backfilled under agent id 0, the unidentified client.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e1f3a9c2d4'
+down_revision = 'a4c8d2f61b95'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_agents",
+        sa.Column("id", sa.Integer(), sa.Identity(), primary_key=True),
+        sa.Column("digest", sa.String(64), nullable=False, unique=True),
+        sa.Column("user_agent", sa.Text(), nullable=False),
+        sa.Column("browser", sa.String(32), nullable=True),
+        sa.Column("browser_version", sa.String(32), nullable=True),
+        sa.Column("os", sa.String(32), nullable=True),
+        sa.Column("os_version", sa.String(32), nullable=True),
+        sa.Column("device", sa.String(16), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.add_column("game_results", sa.Column("user_agent_id", sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        "game_results_user_agent_id_fkey",
+        "game_results",
+        "user_agents",
+        ["user_agent_id"],
+        ["id"],
+        ondelete="RESTRICT",
+    )
+    op.create_index("ix_game_results_user_agent_id", "game_results", ["user_agent_id"])
+    
+    op.create_table(
+        "client_rollups_hourly",
+        sa.Column("bucket_start", sa.DateTime(timezone=True), primary_key=True),
+        sa.Column("user_agent_id", sa.Integer(), primary_key=True),
+        sa.Column("spin_count", sa.BigInteger(), nullable=False),
+    )
+    op.create_table(
+        "client_rollups_daily",
+        sa.Column("bucket_date", sa.Date(), primary_key=True),
+        sa.Column("user_agent_id", sa.Integer(), primary_key=True),
+        sa.Column("spin_count", sa.BigInteger(), nullable=False),
+    )
+    op.execute("""
+        INSERT INTO client_rollups_hourly (bucket_start, user_agent_id, spin_count)
+        SELECT date_trunc('hour', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC', 0, count(*)
+        FROM game_results
+        GROUP BY 1
+    """)
+    op.execute("""
+        INSERT INTO client_rollups_daily (bucket_date, user_agent_id, spin_count)
+        SELECT (bucket_start AT TIME ZONE 'UTC')::date, user_agent_id, sum(spin_count)
+        FROM client_rollups_hourly
+        GROUP BY 1, 2
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table("client_rollups_daily")
+    op.drop_table("client_rollups_hourly")
+    op.drop_index("ix_game_results_user_agent_id", table_name="game_results")
+    op.drop_constraint("game_results_user_agent_id_fkey", "game_results", type_="foreignkey")
+    op.drop_column("game_results", "user_agent_id")
+    op.drop_table("user_agents")
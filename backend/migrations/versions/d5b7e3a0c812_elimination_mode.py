@@ -0,0 +1,41 @@
+"""Add spin_mode to game_results and elimination rounds
+
+Revision ID: d5b7e3a0c812
+Revises: 8c41e2b7a9d0
+Create Date: 2026-10-18 14:00:00.000000
+
+Existing results become ``standard`` spins. Adding a column with a constant
+default is a catalog-only change, including on the partitioned table.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5b7e3a0c812'
+down_revision = '8c41e2b7a9d0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "game_results",
+        sa.Column("spin_mode", sa.String(16), nullable=False, server_default="standard"),
+    )
+    op.create_check_constraint(
+        "ck_game_results_spin_mode",
+        "game_results",
+        "spin_mode IN ('standard', 'elimination')",
+    )
+    op.create_table(
+        "elimination_rounds",
+        sa.Column("session_id", sa.UUID(), primary_key=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("elimination_rounds")
+    op.drop_constraint("ck_game_results_spin_mode", "game_results", type_="check")
+    op.drop_column("game_results", "spin_mode")
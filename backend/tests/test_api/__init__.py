@@ -0,0 +1 @@
+"""Test API package."""
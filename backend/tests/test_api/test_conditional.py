@@ -0,0 +1,85 @@
+"""Tests for ETag validation and 304 responses."""
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.conditional import etag_matches, make_etag
+from app.main import app
+from app.services.rollups import rollup_watermark
+from app.services.roster import roster_cache
+
+client = TestClient(app)
+
+
+class TestEtag:
+    """Test ETag construction and matching."""
+    
+    def test_etag_is_strong_and_stable(self):
+        """Test that equal inputs give the same quoted strong tag."""
+        etag = make_etag("names", 3, True, None, 100)
+        assert etag == make_etag("names", 3, True, None, 100)
+        assert etag.startswith('"') and etag.endswith('"')
+        assert not etag.startswith("W/")
+    
+    def test_etag_changes_with_version_and_parameters(self):
+        """Test that any input that shapes the response changes the tag."""
+        base = make_etag("names", 3, True, None, 100)
+        assert make_etag("names", 4, True, None, 100) != base
+        assert make_etag("names", 3, False, None, 100) != base
+        assert make_etag("names", 3, True, None, 50) != base
+    
+    @pytest.mark.parametrize("header", ['"a", "b"', 'W/"b"', "*", '"b"'])
+    def test_if_none_match_matches(self, header):
+        """Test lists, weak prefixes and the wildcard."""
+        assert etag_matches(header, '"b"')
+    
+    @pytest.mark.parametrize("header", [None, "", '"a"', '"b-gzip"'])
+    def test_if_none_match_mismatch(self, header):
+        """Test that other tags or a missing header do not match."""
+        assert not etag_matches(header, '"b"')
+
+
+class TestConditionalEndpoints:
+    """Test that current clients get a 304 without a database query."""
+    
+    @pytest.fixture(autouse=True)
+    def versions(self, monkeypatch):
+        async def roster_version(*, fresh=False):
+            return 7
+        
+        async def watermark():
+            return 42
+        
+        monkeypatch.setattr(roster_cache, "current_version", roster_version)
+        monkeypatch.setattr(rollup_watermark, "current", watermark)
+    
+    @pytest.mark.parametrize("path, etag", [
+        ("/api/names?limit=100", make_etag("names", 7, None, None, 100)),
+        ("/api/analytics/volume?granularity=day", make_etag("analytics", 42, "volume", "day", None, None)),
+    ])
+    def test_matching_etag_returns_not_modified(self, path, etag):
+        """Test 304 with validators; no database is available in this test."""
+        response = client.get(path, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert "cache-control" in response.headers
+    
+    def test_stale_etag_is_not_answered_with_304(self, monkeypatch):
+        """Test that new rollups invalidate a previously returned tag."""
+        session_id = uuid.uuid4()
+        path = f"/api/analytics/sessions/{session_id}"
+        etag = make_etag("analytics", 42, "session", session_id)
+        assert client.get(path, headers={"If-None-Match": etag}).status_code == 304
+        
+        async def advanced():
+            return 43
+        
+        async def missing_session(self, *args):
+            return None
+        
+        monkeypatch.setattr(rollup_watermark, "current", advanced)
+        monkeypatch.setattr("sqlalchemy.ext.asyncio.AsyncSession.get", missing_session)
+        assert client.get(path, headers={"If-None-Match": etag}).status_code == 404
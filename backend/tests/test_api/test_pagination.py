@@ -0,0 +1,80 @@
+"""Tests for keyset pagination helpers."""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.api.pagination import decode_cursor, encode_cursor, keyset_paginate, page_from_rows
+from app.models.name import Name
+
+
+class TestCursor:
+    """Test cursor encoding."""
+    
+    def test_cursor_round_trip(self):
+        """Test that a cursor decodes to the row it was built from."""
+        created_at = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=UTC)
+        id_ = uuid.uuid4()
+        assert decode_cursor(encode_cursor(created_at, id_)) == (created_at, id_)
+    
+    def test_invalid_cursor_is_rejected(self):
+        """Test that garbage cursors produce a 400."""
+        for cursor in ["not-a-cursor", "!!!", encode_cursor(datetime.now(UTC), uuid.uuid4())[:-6]]:
+            with pytest.raises(HTTPException) as exc_info:
+                decode_cursor(cursor)
+            assert exc_info.value.status_code == 400
+
+
+class TestKeysetPaginate:
+    """Test the generated keyset queries."""
+    
+    def compile(self, stmt) -> str:
+        return str(stmt.compile(dialect=postgresql.dialect()))
+    
+    def test_first_page_has_no_seek_predicate(self):
+        """Test that the first page only orders and limits."""
+        sql = self.compile(keyset_paginate(select(Name), Name.created_at, Name.id, None, 10))
+        assert "WHERE" not in sql
+        assert "ORDER BY names.created_at, names.id" in sql
+        assert "LIMIT" in sql
+    
+    def test_cursor_seeks_with_row_comparison(self):
+        """Test that later pages seek past the cursor instead of using OFFSET."""
+        cursor = encode_cursor(datetime.now(UTC), uuid.uuid4())
+        ascending = self.compile(keyset_paginate(select(Name), Name.created_at, Name.id, cursor, 10))
+        assert "(names.created_at, names.id) >" in ascending
+        assert "OFFSET" not in ascending
+        
+        descending = self.compile(
+            keyset_paginate(select(Name), Name.created_at, Name.id, cursor, 10, descending=True)
+        )
+        assert "(names.created_at, names.id) <" in descending
+        assert "ORDER BY names.created_at DESC, names.id DESC" in descending
+
+
+class TestPageFromRows:
+    """Test trimming the look-ahead row."""
+    
+    def make_rows(self, count: int) -> list:
+        base = datetime(2024, 1, 1, tzinfo=UTC)
+        return [
+            SimpleNamespace(created_at=base + timedelta(seconds=i), id=uuid.uuid4())
+            for i in range(count)
+        ]
+    
+    def test_last_page_has_no_cursor(self):
+        """Test that a short page ends pagination."""
+        rows = self.make_rows(3)
+        assert page_from_rows(rows, 3) == (rows, None)
+    
+    def test_full_page_points_at_last_row(self):
+        """Test that the next cursor resumes after the last returned row."""
+        rows = self.make_rows(4)
+        page, cursor = page_from_rows(rows, 3)
+        assert page == rows[:3]
+        assert decode_cursor(cursor) == (rows[2].created_at, rows[2].id)
@@ -0,0 +1,55 @@
+"""Tests for the benchmark harness."""
+
+import pytest
+
+from benchmarks.harness import (
+    BenchmarkResult,
+    build_report,
+    compare_reports,
+    load_report,
+    measure_async,
+    write_report,
+)
+
+
+class TestBenchmarkHarness:
+    """Test statistics, reports and comparisons."""
+    
+    def test_result_statistics(self):
+        """Test that summaries report milliseconds and operation throughput."""
+        result = BenchmarkResult("spin", [0.001] * 99 + [0.1], 2.0, ops_per_sample=10)
+        summary = result.to_dict()
+        
+        assert summary['operations'] == 1000
+        assert summary['throughput_per_s'] == 500.0
+        assert summary['p50_ms'] == pytest.approx(1.0)
+        assert summary['max_ms'] == pytest.approx(100.0)
+    
+    async def test_measure_async_counts_errors(self):
+        """Test that failing calls are counted and not timed."""
+        async def flaky(index: int) -> None:
+            if index % 2:
+                raise RuntimeError("boom")
+        
+        result = await measure_async("flaky", flaky, 10, concurrency=3, warmup=0)
+        
+        assert result.errors == 5
+        assert len(result.latencies) == 5
+    
+    def test_report_round_trip_and_compare(self, tmp_path):
+        """Test that regressions beyond the threshold are flagged."""
+        baseline = build_report("micro", {}, [BenchmarkResult("spin", [0.010], 1.0)])
+        current = build_report("micro", {}, [
+            BenchmarkResult("spin", [0.0125], 0.5),
+            BenchmarkResult("new", [0.001], 1.0),
+        ])
+        path = write_report(baseline, tmp_path / "baseline.json")
+        
+        comparisons = {
+            item.metric: item for item in compare_reports(load_report(path), current, 0.10)
+        }
+        
+        assert comparisons['p50_ms'].change == pytest.approx(0.25)
+        assert comparisons['p50_ms'].regression
+        assert comparisons['throughput_per_s'].change == pytest.approx(-1.0)
+        assert not comparisons['throughput_per_s'].regression
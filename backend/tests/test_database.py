@@ -3,7 +3,20 @@
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db, init_db, Base
+from app.config import settings
+from app.database import (
+    Base,
+    ReplicaRouter,
+    create_replica_engine,
+    engine,
+    PRIMARY_WAL_POSITION,
+    get_db,
+    get_read_db,
+    get_versioned_read_db,
+    replica_router,
+    init_db,
+    statement_type,
+)
 from app.models.base import BaseModel, UUIDMixin, TimestampMixin
 
 
@@ -18,6 +31,26 @@ class TestDatabaseConnection:
             assert db.is_active
             break  # Only test first yield
     
+    @pytest.mark.asyncio
+    async def test_get_read_db_session(self):
+        """Test that get_read_db returns an autocommit session."""
+        async for db in get_read_db():
+            assert isinstance(db, AsyncSession)
+            assert db.bind.get_execution_options()["isolation_level"] == "AUTOCOMMIT"
+            break
+    
+    @pytest.mark.asyncio
+    async def test_get_versioned_read_db_session(self):
+        """Test that the versioned session opens lazily, in autocommit."""
+        async for read in get_versioned_read_db():
+            assert read.session is None
+            read.depends_on(("names", 1))
+            db = await read.open()
+            assert db is await read.open()
+            assert db.bind is replica_router.primary
+            assert db.bind.get_execution_options()["isolation_level"] == "AUTOCOMMIT"
+            break
+    
     @pytest.mark.asyncio
     async def test_init_db(self):
         """Test database initialization creates tables."""
@@ -26,6 +59,113 @@ class TestDatabaseConnection:
         # Add assertions once we have proper test database
 
 
+class TestReplicaRouter:
+    """Test read replica routing and ejection."""
+    
+    def make_router(self, count: int, ejection_seconds: float = 30.0) -> ReplicaRouter:
+        replicas = [
+            create_replica_engine(f"postgresql+asyncpg://r:r@replica{i}/roulette")
+            for i in range(count)
+        ]
+        return ReplicaRouter(engine, replicas, ejection_seconds=ejection_seconds)
+    
+    def test_without_replicas_reads_use_primary(self):
+        """Test that reads fall back to the primary."""
+        router = self.make_router(0)
+        assert router.choose() is router.primary
+        assert router.primary.get_execution_options()["isolation_level"] == "AUTOCOMMIT"
+    
+    def test_round_robin(self):
+        """Test that replicas are used in turn."""
+        router = self.make_router(3)
+        chosen = [router.choose() for _ in range(6)]
+        assert chosen == router.replicas * 2
+    
+    def test_ejected_replica_is_skipped(self):
+        """Test that a failing replica leaves the rotation."""
+        router = self.make_router(2)
+        router.eject(router.replicas[0])
+        assert {router.choose() for _ in range(4)} == {router.replicas[1]}
+        assert router.healthy_replicas() == [router.replicas[1]]
+        
+        router.eject(router.replicas[1])
+        assert router.choose() is router.primary
+    
+    @pytest.mark.asyncio
+    async def test_reading_ejects_on_connection_errors(self):
+        """Test that a read losing its connection takes the replica out of rotation."""
+        router = self.make_router(2)
+        with pytest.raises(OSError):
+            async with router.reading() as target:
+                raise OSError("connection refused")
+        assert target is router.replicas[0]
+        assert router.healthy_replicas() == [router.replicas[1]]
+        
+        with pytest.raises(ValueError):
+            async with router.reading(router.replicas[1]):
+                raise ValueError("not a connection error")
+        assert router.healthy_replicas() == [router.replicas[1]]
+    
+    @pytest.mark.asyncio
+    async def test_choose_after_skips_replicas_behind_the_versions(self, monkeypatch):
+        """Test that reads go to a caught-up replica, else the primary."""
+        router = self.make_router(2)
+        primary_queries = []
+        replayed = {id(router.replicas[0]): 90, id(router.replicas[1]): 120}
+        
+        async def wal_position(target, statement):
+            if statement is PRIMARY_WAL_POSITION:
+                primary_queries.append(target)
+                return 100
+            return replayed[id(target)]
+        
+        monkeypatch.setattr(router, "_wal_position", wal_position)
+        assert await router.choose_after(("rollups", 1)) is router.replicas[1]
+        assert await router.choose_after(("rollups", 1)) is router.replicas[1]
+        assert primary_queries == [router.primary]
+        
+        router.eject(router.replicas[1])
+        assert await router.choose_after(("rollups", 1)) is router.primary
+        replayed[id(router.replicas[0])] = 100
+        assert await router.choose_after(("rollups", 1)) is router.replicas[0]
+    
+    @pytest.mark.asyncio
+    async def test_choose_after_without_replicas_skips_the_fence(self, monkeypatch):
+        """Test that the primary is used without querying WAL positions."""
+        router = self.make_router(0)
+        
+        async def wal_position(target, statement):
+            raise AssertionError("no position needed")
+        
+        monkeypatch.setattr(router, "_wal_position", wal_position)
+        assert await router.choose_after(("names", 3)) is router.primary
+    
+    def test_ejection_expires(self):
+        """Test that an ejected replica returns after the cooldown."""
+        router = self.make_router(1, ejection_seconds=0.0)
+        router.eject(router.replicas[0])
+        assert router.choose() is router.replicas[0]
+
+
+class TestEngineInstrumentation:
+    """Test pool configuration and statement metrics helpers."""
+    
+    def test_engine_uses_configured_pool(self):
+        """Test that pool settings reach the primary engine."""
+        pool = engine.sync_engine.pool
+        assert pool.size() == settings.db_pool_size
+        assert pool._max_overflow == settings.db_max_overflow
+        assert pool._timeout == settings.db_pool_timeout
+    
+    def test_statement_type(self):
+        """Test that statements are labelled by their leading keyword."""
+        assert statement_type("SELECT 1") == "SELECT"
+        assert statement_type("  insert into names values (1)") == "INSERT"
+        assert statement_type("WITH x AS (SELECT 1) SELECT * FROM x") == "WITH"
+        assert statement_type("BEGIN") == "OTHER"
+        assert statement_type("") == "OTHER"
+
+
 class TestUUIDMixin:
     """Test UUID mixin functionality."""
     
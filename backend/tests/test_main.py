@@ -1,7 +1,11 @@
+import asyncio
+
 import pytest
 from fastapi.testclient import TestClient
 
+from app import main
 from app.main import app
+from app.warmup import readiness
 
 client = TestClient(app)
 
@@ -13,8 +17,83 @@ def test_root_endpoint():
     assert response.json() == {"message": "Welcome to Roulette API"}
 
 
-def test_health_endpoint():
+def test_health_endpoint(monkeypatch):
     """Test the health check endpoint."""
+    monkeypatch.setattr(readiness, "ready", True)
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json() == {"status": "healthy"}
+
+
+def test_health_not_ready_before_warm_up(monkeypatch):
+    """Test that readiness fails until warm-up finished while liveness passes."""
+    monkeypatch.setattr(readiness, "ready", False)
     response = client.get("/health")
+    assert response.status_code == 503
+    assert response.json() == {"status": "starting"}
+    
+    response = client.get("/health/live")
+    assert response.status_code == 200
+    assert response.json() == {"status": "alive"}
+
+
+def test_metrics_endpoint_reports_requests(monkeypatch):
+    """Test that requests are labelled by route template in /metrics."""
+    monkeypatch.setattr(readiness, "ready", True)
+    client.get("/health")
+    response = client.get("/metrics")
     assert response.status_code == 200
-    assert response.json() == {"status": "healthy"}
\ No newline at end of file
+    assert response.headers["content-type"].startswith("text/plain")
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/health",status="200"}'
+        in response.text
+    )
+    assert "# TYPE http_requests_in_flight gauge" in response.text
+
+
+class FakeService:
+    """Service that records its shutdown, optionally failing it."""
+    
+    def __init__(self, name, stopped, fails=False):
+        self.name = name
+        self.stopped = stopped
+        self.fails = fails
+    
+    async def start(self):
+        pass
+    
+    async def stop(self):
+        self.stopped.append(self.name)
+        if self.fails:
+            raise ConnectionError("drain failed")
+    
+    close = stop
+
+
+def test_shutdown_continues_past_a_failed_step(monkeypatch):
+    """Test that a failing stop() still lets the later shutdown steps run."""
+    stopped = []
+    for name in ("hub", "readiness", "columnar_analytics", "cache_backend"):
+        monkeypatch.setattr(main, name, FakeService(name, stopped))
+    monkeypatch.setattr(main, "result_writer", FakeService("result_writer", stopped, fails=True))
+    monkeypatch.setattr(main, "PartitionMaintainer", lambda engine: FakeService("partitions", stopped))
+    monkeypatch.setattr(main, "metrics_collector", None)
+    monkeypatch.setattr(main.password_hasher, "shutdown", lambda: stopped.append("hasher"))
+    monkeypatch.setattr(main, "close_db", FakeService("db", stopped).stop)
+    
+    async def run():
+        async with main.lifespan(app):
+            pass
+    
+    with pytest.raises(ConnectionError):
+        asyncio.run(run())
+    assert stopped == [
+        "columnar_analytics",
+        "readiness",
+        "hub",
+        "result_writer",
+        "partitions",
+        "cache_backend",
+        "hasher",
+        "db",
+    ]
@@ -0,0 +1,144 @@
+"""Tests for metric primitives."""
+
+import json
+import math
+import os
+
+import pytest
+
+from app.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    MultiprocessCollector,
+    Registry,
+    merge_snapshots,
+    render,
+    snapshot,
+)
+
+
+class TestMetrics:
+    """Test counters, gauges and histograms."""
+    
+    def test_counter_accumulates_per_label(self):
+        """Test that counters add up per label set."""
+        registry = Registry()
+        counter = Counter("requests", "Requests.", ["route"], registry=registry)
+        counter.inc(route="/a")
+        counter.inc(2, route="/a")
+        counter.inc(route="/b")
+        assert sorted(counter.samples()) == [
+            ("_total", ("/a",), 3.0),
+            ("_total", ("/b",), 1.0),
+        ]
+        with pytest.raises(ValueError, match="only increase"):
+            counter.inc(-1, route="/a")
+    
+    def test_labels_must_match(self):
+        """Test that missing or extra labels are rejected."""
+        counter = Counter("c", "C.", ["route"], registry=Registry())
+        with pytest.raises(ValueError, match="expects labels"):
+            counter.inc()
+        with pytest.raises(ValueError, match="expects labels"):
+            counter.inc(route="/", method="GET")
+    
+    def test_gauge_values_and_functions(self):
+        """Test that gauges report set values and callbacks."""
+        gauge = Gauge("in_use", "In use.", ["pool"], registry=Registry())
+        gauge.inc(pool="a")
+        gauge.inc(pool="a")
+        gauge.dec(pool="a")
+        gauge.set_function(lambda: 7, pool="b")
+        assert sorted(gauge.samples()) == [("", ("a",), 1.0), ("", ("b",), 7.0)]
+    
+    def test_histogram_buckets_are_cumulative(self):
+        """Test that histogram samples follow Prometheus semantics."""
+        histogram = Histogram("latency", "Latency.", buckets=(0.1, 1.0), registry=Registry())
+        for value in (0.05, 0.1, 0.5, 5.0):
+            histogram.observe(value)
+        
+        assert histogram.buckets == (0.1, 1.0, math.inf)
+        samples = list(histogram.samples())
+        assert samples == [
+            ("_bucket", ("0.1",), 2),
+            ("_bucket", ("1.0",), 3),
+            ("_bucket", ("+Inf",), 4),
+            ("_sum", (), 5.65),
+            ("_count", (), 4),
+        ]
+    
+    def test_registry_rejects_duplicates(self):
+        """Test that metric names are unique per registry."""
+        registry = Registry()
+        Counter("dup", "Dup.", registry=registry)
+        with pytest.raises(ValueError, match="already registered"):
+            Gauge("dup", "Dup.", registry=registry)
+        assert [m.name for m in registry] == ["dup"]
+
+
+
+class TestExposition:
+    """Test snapshots, merging and the text format."""
+    
+    def test_render_text_format(self):
+        """Test that samples render with labels and an ``le`` bucket label."""
+        registry = Registry()
+        counter = Counter("spins", 'Spins "served".', ["mode"], registry=registry)
+        counter.inc(3, mode="single")
+        histogram = Histogram("latency", "Latency.", buckets=(0.5,), registry=registry)
+        histogram.observe(0.25)
+        
+        text = render(snapshot(registry))
+        
+        assert '# HELP spins Spins \\"served\\".' in text
+        assert "# TYPE spins counter" in text
+        assert 'spins_total{mode="single"} 3' in text
+        assert "# TYPE latency histogram" in text
+        assert 'latency_bucket{le="0.5"} 1' in text
+        assert 'latency_bucket{le="+Inf"} 1' in text
+        assert "latency_sum 0.25" in text
+        assert text.endswith("\n")
+    
+    def test_merge_sums_matching_series(self):
+        """Test that worker snapshots add up per series."""
+        first, second = Registry(), Registry()
+        Counter("c", "C.", ["route"], registry=first).inc(2, route="/a")
+        counter = Counter("c", "C.", ["route"], registry=second)
+        counter.inc(3, route="/a")
+        counter.inc(route="/b")
+        
+        merged = merge_snapshots([snapshot(first), snapshot(second)])
+        
+        assert sorted(merged["c"]["samples"]) == [
+            ["_total", ["/a"], 5.0],
+            ["_total", ["/b"], 1.0],
+        ]
+    
+    def test_collector_drops_gauges_of_dead_workers(self, tmp_path, monkeypatch):
+        """Test that exited workers keep counters but not gauges."""
+        registry = Registry()
+        Counter("c", "C.", registry=registry).inc(4)
+        Gauge("g", "G.", registry=registry).set(2)
+        collector = MultiprocessCollector(tmp_path, 5.0, registry=registry)
+        (tmp_path / "999999.json").write_text(json.dumps(snapshot(registry)))
+        monkeypatch.setattr("app.metrics._pid_alive", lambda pid: pid == os.getpid())
+        
+        merged = collector.collect()
+        
+        assert merged["c"]["samples"] == [["_total", [], 8.0]]
+        assert merged["g"]["samples"] == [["", [], 2.0]]
+    
+    def test_collector_keeps_totals_of_a_reused_pid(self, tmp_path):
+        """Test that a worker reusing an exited worker's pid does not overwrite its totals."""
+        registry = Registry()
+        Counter("c", "C.", registry=registry).inc(4)
+        Gauge("g", "G.", registry=registry).set(2)
+        collector = MultiprocessCollector(tmp_path, 5.0, registry=registry)
+        (tmp_path / f"{os.getpid()}-1.json").write_text(json.dumps(snapshot(registry)))
+        
+        merged = collector.collect()
+        
+        assert collector.path.name != f"{os.getpid()}-1.json"
+        assert merged["c"]["samples"] == [["_total", [], 8.0]]
+        assert merged["g"]["samples"] == [["", [], 2.0]]
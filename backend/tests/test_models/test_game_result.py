@@ -49,6 +49,18 @@ class TestGameResultModel:
         assert result.user_ip == IPv4Address('192.168.1.1')
         assert result.user_agent == 'Test User Agent'
     
+    def test_game_result_references_roster_snapshot(self):
+        """Test that GameResult can reference a roster snapshot by key."""
+        name_id = uuid.uuid4()
+        result = GameResult(
+            session_id=uuid.uuid4(),
+            selected_name_id=name_id,
+            selected_name_snapshot={'id': str(name_id), 'name': 'Selected Name'},
+            roster_snapshot_key='a' * 64
+        )
+        assert result.roster_snapshot_key == 'a' * 64
+        assert result.available_names is None
+    
     def test_game_result_validates_session_id(self):
         """Test that GameResult validates session_id field."""
         # Valid session ID
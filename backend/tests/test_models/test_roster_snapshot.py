@@ -0,0 +1,59 @@
+"""Tests for RosterSnapshot model."""
+
+import uuid
+
+import pytest
+
+from app.models.roster_snapshot import RosterSnapshot
+
+
+class TestRosterSnapshotModel:
+    """Test RosterSnapshot model validation and functionality."""
+    
+    def test_roster_snapshot_from_entries(self):
+        """Test that a snapshot derives its key and totals from entries."""
+        entries = [
+            {'id': str(uuid.uuid4()), 'name': 'Alice', 'weight': 3},
+            {'id': str(uuid.uuid4()), 'name': 'Bob', 'weight': 2},
+        ]
+        snapshot = RosterSnapshot.from_entries(entries)
+        assert snapshot.key == RosterSnapshot.compute_key(entries)
+        assert snapshot.entries == entries
+        assert snapshot.name_count == 2
+        assert snapshot.total_weight == 5
+    
+    def test_roster_snapshot_key_depends_on_content(self):
+        """Test that the key changes with names or weights but not order."""
+        name_id = str(uuid.uuid4())
+        other_id = str(uuid.uuid4())
+        entries = [
+            {'id': name_id, 'name': 'Alice', 'weight': 1},
+            {'id': other_id, 'name': 'Bob', 'weight': 1},
+        ]
+        key = RosterSnapshot.compute_key(entries)
+        assert RosterSnapshot.compute_key(list(reversed(entries))) == key
+        
+        reweighted = [dict(entries[0], weight=2), entries[1]]
+        assert RosterSnapshot.compute_key(reweighted) != key
+        
+        renamed = [dict(entries[0], name='Alicia'), entries[1]]
+        assert RosterSnapshot.compute_key(renamed) != key
+    
+    def test_roster_snapshot_validates_entries(self):
+        """Test that snapshot entries keep the available names rules."""
+        with pytest.raises(ValueError, match="must be a list"):
+            RosterSnapshot(entries="not a list")
+        
+        with pytest.raises(ValueError, match="cannot be empty"):
+            RosterSnapshot(entries=[])
+        
+        with pytest.raises(ValueError, match="must be a dictionary"):
+            RosterSnapshot(entries=["not a dict"])
+        
+        with pytest.raises(ValueError, match="must have 'id' and 'name' fields"):
+            RosterSnapshot(entries=[{'name': 'test'}])
+    
+    def test_roster_snapshot_validates_key(self):
+        """Test that the key must be a SHA-256 hex digest."""
+        with pytest.raises(ValueError, match="SHA-256 digest"):
+            RosterSnapshot(key="short")
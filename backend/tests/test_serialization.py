@@ -0,0 +1,51 @@
+"""Tests for the fast JSON serialization path."""
+
+import json
+import uuid
+from datetime import UTC, datetime
+
+from app.api.names import LISTING_FIELDS
+from app.api.pagination import Page
+from app.api.results import HISTORY_FIELDS
+from app.models.name import Name
+from app.schemas.game_result import GameResultRead
+from app.schemas.name import NameRead
+from app.serialization import page_response
+
+
+def history_row() -> tuple:
+    """A row shaped like the history query output."""
+    return (
+        uuid.uuid4(),
+        uuid.uuid4(),
+        None,
+        "Alice",
+        "a" * 64,
+        2500,
+        "standard",
+        datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=UTC),
+    )
+
+
+class TestFastPath:
+    """Test that row fast paths match model serialization."""
+    
+    def test_listing_fields_match_schemas(self):
+        """Test that selected columns are exactly the response fields."""
+        assert set(HISTORY_FIELDS) == set(GameResultRead.model_fields)
+        assert set(LISTING_FIELDS) == set(NameRead.model_fields)
+    
+    def test_page_response_matches_pydantic(self):
+        """Test that fast-path bodies equal model-validated bodies."""
+        rows = [history_row(), history_row()]
+        fast = page_response(HISTORY_FIELDS, rows, "next").body
+        items = [GameResultRead(**dict(zip(HISTORY_FIELDS, row))) for row in rows]
+        slow = Page[GameResultRead](items=items, next_cursor="next").model_dump_json()
+        assert json.loads(fast) == json.loads(slow)
+    
+    def test_to_dict_uses_cached_accessor(self):
+        """Test that the column accessor is built once per class."""
+        name = Name(name="Alice", weight=3)
+        assert name.to_dict()['name'] == "Alice"
+        assert Name.column_accessor() is Name.column_accessor()
+        assert set(name.to_dict()) == {column.name for column in Name.__table__.columns}
@@ -0,0 +1 @@
+"""Test services package."""
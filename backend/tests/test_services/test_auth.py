@@ -0,0 +1,127 @@
+"""Tests for password hashing and access-token caching."""
+
+import asyncio
+import time
+import uuid
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+from app.api.auth import resolve_token
+from app.services.auth import (
+    AuthenticatedUser,
+    HashingBusy,
+    InvalidToken,
+    PasswordHasher,
+    TokenCache,
+    create_access_token,
+    decode_access_token,
+    token_cache,
+)
+
+# Minimum cost keeps the tests fast
+FAST_CONTEXT = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+
+
+def make_user(**overrides) -> AuthenticatedUser:
+    """Build an authenticated user."""
+    values = {'id': uuid.uuid4(), 'username': "alice", 'role': "user", 'is_active': True}
+    return AuthenticatedUser(**{**values, **overrides})
+
+
+class TestPasswordHasher:
+    """Test hashing in the bounded thread pool."""
+    
+    async def test_hash_and_verify(self):
+        """Test that hashes verify and wrong passwords do not."""
+        hasher = PasswordHasher(FAST_CONTEXT, workers=2)
+        try:
+            password_hash = await hasher.hash("correct horse")
+            assert await hasher.verify("correct horse", password_hash) == (True, None)
+            assert (await hasher.verify("wrong", password_hash))[0] is False
+        finally:
+            hasher.shutdown()
+    
+    async def test_outdated_hash_is_upgraded(self):
+        """Test that verification returns a replacement for weaker hashes."""
+        weak = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("pw")
+        stronger = CryptContext(schemes=["bcrypt"], bcrypt__rounds=5)
+        hasher = PasswordHasher(stronger, workers=1)
+        try:
+            valid, new_hash = await hasher.verify("pw", weak)
+        finally:
+            hasher.shutdown()
+        assert valid
+        assert new_hash is not None and new_hash.startswith("$2b$05$")
+    
+    async def test_saturated_pool_fails_fast(self):
+        """Test that callers beyond the pending limit get HashingBusy."""
+        hasher = PasswordHasher(FAST_CONTEXT, workers=1, max_pending=0, timeout=0.05)
+        try:
+            slow = asyncio.ensure_future(hasher._run(time.sleep, 0.3))
+            await asyncio.sleep(0.01)
+            with pytest.raises(HashingBusy):
+                await hasher.hash("pw")
+            await slow
+        finally:
+            hasher.shutdown()
+
+
+class TestAccessTokens:
+    """Test token signing and the verification cache."""
+    
+    def test_token_round_trip(self):
+        """Test that a token decodes to its user and expiry."""
+        user_id = uuid.uuid4()
+        token, expires_at = create_access_token(user_id)
+        assert decode_access_token(token) == (user_id, float(int(expires_at.timestamp())))
+    
+    def test_expired_and_tampered_tokens_are_rejected(self):
+        """Test that invalid tokens raise InvalidToken."""
+        token, _ = create_access_token(uuid.uuid4(), timedelta(seconds=-1))
+        with pytest.raises(InvalidToken):
+            decode_access_token(token)
+        valid, _ = create_access_token(uuid.uuid4())
+        with pytest.raises(InvalidToken):
+            decode_access_token(valid[:-2] + "xx")
+    
+    def test_cache_is_lru_and_bounded_by_ttl(self):
+        """Test eviction order and expiry."""
+        cache = TokenCache(maxsize=2, ttl=60)
+        alice, bob = make_user(), make_user(username="bob")
+        far = time.time() + 3600
+        cache.put("a", alice, far)
+        cache.put("b", bob, far)
+        assert cache.get("a") is alice
+        cache.put("c", alice, far)
+        assert cache.get("b") is None
+        cache.put("expired", bob, time.time() - 1)
+        assert cache.get("expired") is None
+        cache.invalidate_user(alice.id)
+        assert len(cache) == 0
+    
+    async def test_resolve_token_looks_up_user_once(self):
+        """Test that a cached token skips decoding and the user query."""
+        token_cache.clear()
+        user_id = uuid.uuid4()
+        token, _ = create_access_token(user_id)
+        queries = []
+        
+        class FakeSession:
+            async def execute(self, stmt):
+                queries.append(stmt)
+                row = SimpleNamespace(id=user_id, username="alice", role="user", is_active=True)
+                return SimpleNamespace(first=lambda: row)
+        
+        first = await resolve_token(token, FakeSession())
+        second = await resolve_token(token, FakeSession())
+        assert first is second
+        assert first.id == user_id
+        assert len(queries) == 1
+        with pytest.raises(HTTPException) as exc_info:
+            await resolve_token("not-a-token", FakeSession())
+        assert exc_info.value.status_code == 401
+        token_cache.clear()
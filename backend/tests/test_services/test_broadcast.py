@@ -0,0 +1,100 @@
+"""Tests for the WebSocket broadcast hub."""
+
+import json
+
+import pytest
+
+from app.services.broadcast import BroadcastHub, Subscriber, session_channel
+
+
+class FakeWebSocket:
+    """Records frames sent by a subscriber's pump."""
+    
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+        self.close_code: int | None = None
+    
+    async def send_text(self, message: str) -> None:
+        self.sent.append(message)
+    
+    async def close(self, code: int = 1000, reason: str | None = None) -> None:
+        self.close_code = code
+
+
+class FailingRedis:
+    """Redis client whose publishes always fail."""
+    
+    async def publish(self, channel: str, message: str) -> int:
+        raise ConnectionError("Redis is down")
+
+
+class TestBroadcastHub:
+    """Test local fan-out and slow consumer handling."""
+    
+    @pytest.mark.asyncio
+    async def test_publish_delivers_to_channel_subscribers(self):
+        """Test that events reach subscribers of the named channels only."""
+        hub = BroadcastHub()
+        wheel, session, other = Subscriber(), Subscriber(), Subscriber()
+        hub.subscribe("wheel", wheel)
+        hub.subscribe(session_channel("abc"), session)
+        hub.subscribe(session_channel("xyz"), other)
+        
+        await hub.publish(["wheel", session_channel("abc")], {"type": "spin", "n": 1})
+        
+        assert json.loads(wheel.queue.get_nowait()) == {"type": "spin", "n": 1}
+        assert json.loads(session.queue.get_nowait()) == {"type": "spin", "n": 1}
+        assert other.queue.empty()
+    
+    @pytest.mark.asyncio
+    async def test_publish_survives_redis_failure(self):
+        """Test that a Redis error is logged instead of failing the caller."""
+        hub = BroadcastHub(redis=FailingRedis())
+        
+        await hub.publish(["wheel"], {"type": "spin"})
+    
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_is_dropped(self):
+        """Test that a full queue drops the subscriber instead of blocking."""
+        hub = BroadcastHub()
+        slow, fast = Subscriber(queue_size=2), Subscriber(queue_size=10)
+        hub.subscribe("wheel", slow)
+        hub.subscribe("wheel", fast)
+        
+        for n in range(3):
+            await hub.publish(["wheel"], {"n": n})
+        
+        assert slow.dropped
+        assert hub.subscriber_count("wheel") == 1
+        assert fast.queue.qsize() == 3
+        
+        websocket = FakeWebSocket()
+        await slow.pump(websocket)
+        assert websocket.sent == []
+        assert websocket.close_code == 1013
+    
+    @pytest.mark.asyncio
+    async def test_pump_sends_queued_messages(self):
+        """Test that the pump forwards messages in order."""
+        subscriber = Subscriber()
+        subscriber.offer("first")
+        subscriber.offer("second")
+        subscriber.drop()
+        assert subscriber.queue.get_nowait() is None
+        
+        subscriber = Subscriber()
+        subscriber.offer("first")
+        subscriber.offer("second")
+        subscriber.queue.put_nowait(None)
+        websocket = FakeWebSocket()
+        await subscriber.pump(websocket)
+        assert websocket.sent == ["first", "second"]
+    
+    def test_unsubscribe_removes_empty_channels(self):
+        """Test that idle channels do not accumulate."""
+        hub = BroadcastHub()
+        subscriber = Subscriber()
+        hub.subscribe("wheel", subscriber)
+        hub.unsubscribe("wheel", subscriber)
+        assert hub.subscriber_count() == 0
+        hub.unsubscribe("wheel", subscriber)
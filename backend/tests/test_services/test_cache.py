@@ -0,0 +1,60 @@
+"""Tests for cache backends."""
+
+import pytest
+
+from app.services.cache import MemoryCacheBackend, RedisCacheBackend, create_cache_backend
+
+
+class TestMemoryCacheBackend:
+    """Test the in-process cache stand-in."""
+    
+    @pytest.mark.asyncio
+    async def test_get_set_delete(self):
+        """Test basic key-value operations."""
+        cache = MemoryCacheBackend()
+        assert await cache.get("key") is None
+        await cache.set("key", b"value")
+        assert await cache.get("key") == b"value"
+        await cache.delete("key")
+        assert await cache.get("key") is None
+    
+    @pytest.mark.asyncio
+    async def test_add_only_sets_missing_keys(self):
+        """Test that add behaves like SET NX."""
+        cache = MemoryCacheBackend()
+        assert await cache.add("lock", b"1") is True
+        assert await cache.add("lock", b"2") is False
+        assert await cache.get("lock") == b"1"
+    
+    @pytest.mark.asyncio
+    async def test_incr_is_monotonic(self):
+        """Test that counters start at one and increase."""
+        cache = MemoryCacheBackend()
+        assert await cache.incr("version") == 1
+        assert await cache.incr("version") == 2
+        assert await cache.get("version") == b"2"
+    
+    @pytest.mark.asyncio
+    async def test_expired_keys_are_missing(self, monkeypatch):
+        """Test that keys disappear after their TTL."""
+        cache = MemoryCacheBackend()
+        now = [1000.0]
+        monkeypatch.setattr("app.services.cache.time.monotonic", lambda: now[0])
+        await cache.set("key", b"value", ttl=5)
+        assert await cache.get("key") == b"value"
+        now[0] += 5
+        assert await cache.get("key") is None
+
+
+class TestCreateCacheBackend:
+    """Test backend selection."""
+    
+    def test_create_known_backends(self):
+        """Test that configured backend names resolve."""
+        assert isinstance(create_cache_backend("memory"), MemoryCacheBackend)
+        assert isinstance(create_cache_backend("redis"), RedisCacheBackend)
+    
+    def test_create_unknown_backend(self):
+        """Test that an unknown backend name is rejected."""
+        with pytest.raises(ValueError, match="Unknown cache backend"):
+            create_cache_backend("memcached")
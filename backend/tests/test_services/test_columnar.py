@@ -0,0 +1,301 @@
+"""Tests for the columnar analytics store."""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from app.config import settings
+from app.main import app
+from app.services import columnar
+from app.services.columnar import (
+    ColumnarAnalytics,
+    ColumnarStore,
+    GrowableColumn,
+    columnar_analytics,
+    ingest_query,
+    window_count_query,
+)
+
+# A Monday
+BASE = datetime(2024, 5, 6, 10, 0, tzinfo=UTC)
+
+
+def make_row(created_at, name_id, duration, session_id) -> tuple:
+    """Row in ingest query column order."""
+    return (created_at, uuid.uuid4(), name_id, duration, session_id)
+
+
+@pytest.fixture
+def facts():
+    """A store with two names over two sessions and a deleted name."""
+    alice, bob = uuid.uuid4(), uuid.uuid4()
+    first, second = uuid.uuid4(), uuid.uuid4()
+    rows = [
+        make_row(BASE, alice, 1000, first),
+        make_row(BASE + timedelta(minutes=5), bob, 2000, first),
+        make_row(BASE + timedelta(minutes=10), alice, None, second),
+        make_row(BASE + timedelta(hours=1), alice, 3000, second),
+        make_row(BASE + timedelta(days=1, hours=2), None, 4000, second),
+    ]
+    store = ColumnarStore()
+    store.append(rows[:2])
+    store.append(rows[2:])
+    return store, rows, alice, bob, first, second
+
+
+class FakeDatabase:
+    """Stands in for game_results, answering the ingest and rescan queries."""
+    
+    def __init__(self, rows: list[tuple]) -> None:
+        self.rows = rows
+        self.ingests: list[tuple] = []
+        self._window: tuple | None = None
+    
+    def install(self, monkeypatch) -> None:
+        """Route the columnar module's queries and sessions here."""
+        monkeypatch.setattr(columnar, "ingest_query", self.ingest_query)
+        monkeypatch.setattr(columnar, "window_count_query", self.window_count_query)
+        monkeypatch.setattr(columnar, "ReadSessionLocal", lambda bind: self)
+    
+    def ingest_query(self, watermark, horizon, limit):
+        self.ingests.append((watermark, horizon, limit))
+        return ingest_query(watermark, horizon, limit)
+    
+    def window_count_query(self, since, watermark):
+        self._window = (since, watermark)
+        return window_count_query(since, watermark)
+    
+    async def __aenter__(self) -> "FakeDatabase":
+        return self
+    
+    async def __aexit__(self, *exc) -> bool:
+        return False
+    
+    async def execute(self, stmt):
+        watermark, horizon, limit = self.ingests[-1]
+        rows = sorted(
+            (
+                row for row in self.rows
+                if row[0] <= horizon and (watermark is None or row[:2] > watermark)
+            ),
+            key=lambda row: row[:2],
+        )
+        return FakeResult(rows[:limit])
+    
+    async def scalar(self, stmt) -> int:
+        since, watermark = self._window
+        return sum(1 for row in self.rows if row[0] >= since and row[:2] <= watermark)
+
+
+class FakeResult:
+    """Query result holding plain rows."""
+    
+    def __init__(self, rows: list[tuple]) -> None:
+        self._rows = rows
+    
+    def all(self) -> list[tuple]:
+        return self._rows
+
+
+class TestGrowableColumn:
+    """Test the append-only column."""
+    
+    def test_extend_grows_and_keeps_old_views(self):
+        """Test amortized growth without invalidating earlier views."""
+        column = GrowableColumn(np.int64, capacity=2)
+        column.extend(np.array([1, 2]))
+        before = column.view()
+        column.extend(np.arange(3, 10))
+        assert column.view().tolist() == list(range(1, 10))
+        assert before.tolist() == [1, 2]
+
+
+class TestColumnarStore:
+    """Test vectorized queries over the columnar store."""
+    
+    def test_watermark_tracks_last_row(self, facts):
+        """Test that the watermark is the key of the last ingested row."""
+        store, rows, *_ = facts
+        assert len(store) == 5
+        assert store.watermark == (rows[-1][0], rows[-1][1])
+    
+    def test_selection_counts(self, facts):
+        """Test counts per name, skipping results whose name was deleted."""
+        store, _, alice, bob, first, _ = facts
+        assert store.snapshot.selection_counts() == [(alice, 3), (bob, 1)]
+        assert store.snapshot.selection_counts(session_id=first) == [(alice, 1), (bob, 1)]
+        window = {'start': BASE + timedelta(minutes=5), 'end': BASE + timedelta(hours=1)}
+        assert store.snapshot.selection_counts(**window) == [(alice, 1), (bob, 1)]
+        assert store.snapshot.selection_counts(session_id=uuid.uuid4()) == []
+    
+    def test_heatmap_by_weekday_and_hour(self, facts):
+        """Test that spins land in their UTC weekday and hour cells."""
+        store, _, alice, *_ = facts
+        heatmap = store.snapshot.heatmap()
+        assert heatmap.shape == (7, 24)
+        assert heatmap.sum() == 5
+        assert heatmap[0, 10] == 3
+        assert heatmap[0, 11] == 1
+        assert heatmap[1, 12] == 1
+        assert store.snapshot.heatmap(name_id=alice).sum() == 3
+        assert store.snapshot.heatmap(name_id=uuid.uuid4()).sum() == 0
+    
+    def test_duration_percentiles(self, facts):
+        """Test percentiles over spins that recorded a duration."""
+        store, _, alice, _, _, second = facts
+        snapshot = store.snapshot
+        assert snapshot.duration_percentiles([0, 50, 100]) == (4, [1000.0, 2500.0, 4000.0])
+        assert snapshot.duration_percentiles([50], name_id=alice) == (2, [2000.0])
+        assert snapshot.duration_percentiles([50], name_id=alice, session_id=second) == (1, [3000.0])
+        assert snapshot.duration_percentiles([50], start=BASE + timedelta(days=2)) == (0, None)
+    
+    def test_truncate_resumes_at_the_cut(self, facts):
+        """Test that truncation drops the tail and moves the watermark before it."""
+        store, rows, *_ = facts
+        cut = BASE + timedelta(minutes=10)
+        assert store.count_since(cut) == 3
+        store.truncate(cut)
+        assert len(store) == 2
+        assert store.count_since(cut) == 0
+        assert rows[1][:2] < store.watermark < rows[2][:2]
+    
+    def test_trim_drops_old_rows_and_unused_ids(self, facts):
+        """Test that trimming releases rows and recodes the dictionaries."""
+        store, _, alice, bob, first, second = facts
+        assert store.trim(BASE + timedelta(minutes=10)) == 2
+        assert len(store) == 3
+        assert store.name_dictionary.values == [alice]
+        assert store.session_dictionary.values == [second]
+        assert store.snapshot.selection_counts() == [(alice, 2)]
+        assert store.snapshot.selection_counts(session_id=first) == []
+        assert store.snapshot.duration_percentiles([50], session_id=second) == (2, [3500.0])
+        assert store.trim(BASE) == 0
+    
+    def test_snapshot_is_unaffected_by_later_changes(self, facts):
+        """Test that a published snapshot keeps its rows and codes through mutations."""
+        store, rows, alice, bob, first, second = facts
+        snapshot = store.snapshot
+        store.append([make_row(BASE + timedelta(days=2), uuid.uuid4(), 5000, uuid.uuid4())])
+        store.trim(BASE + timedelta(minutes=10))
+        store.truncate(BASE + timedelta(hours=1))
+        assert len(snapshot) == 5
+        assert snapshot.watermark == rows[-1][:2]
+        assert snapshot.selection_counts() == [(alice, 3), (bob, 1)]
+        assert snapshot.selection_counts(session_id=first) == [(alice, 1), (bob, 1)]
+        assert snapshot.duration_percentiles([50], session_id=second) == (2, [3500.0])
+        assert len(store.snapshot) == 1
+        assert store.snapshot.selection_counts() == [(alice, 1)]
+    
+    def test_time_range_is_half_open(self, facts):
+        """Test that start is inclusive and end exclusive."""
+        store, *_ = facts
+        assert store.snapshot.heatmap(start=BASE, end=BASE + timedelta(minutes=5)).sum() == 1
+        assert store.snapshot.heatmap(start=BASE + timedelta(days=5), end=BASE).sum() == 0
+
+
+class TestIngest:
+    """Test incremental catch-up from the database."""
+    
+    def test_ingest_query_resumes_after_watermark(self):
+        """Test keyset resumption below the lag horizon."""
+        watermark = (BASE, uuid.uuid4())
+        sql = str(ingest_query(watermark, BASE + timedelta(hours=1), 100).compile(
+            dialect=postgresql.dialect()
+        ))
+        assert "(game_results.created_at, game_results.id) >" in sql
+        assert "game_results.created_at <=" in sql
+        assert "ORDER BY game_results.created_at, game_results.id" in sql
+        assert "LIMIT" in sql
+    
+    @pytest.mark.asyncio
+    async def test_catch_up_pages_until_short_batch(self, monkeypatch):
+        """Test that batches resume from the watermark until the source runs dry."""
+        now = BASE + timedelta(hours=2)
+        database = FakeDatabase([
+            make_row(BASE + timedelta(seconds=i), uuid.uuid4(), i, uuid.uuid4()) for i in range(5)
+        ])
+        source = database.rows
+        database.install(monkeypatch)
+        analytics = ColumnarAnalytics(ingest_lag=30, batch_size=2)
+        assert await analytics.catch_up(now) == 5
+        assert [watermark for watermark, _, _ in database.ingests] == [
+            None, source[1][:2], source[3][:2]
+        ]
+        assert {horizon for _, horizon, _ in database.ingests} == {now - timedelta(seconds=30)}
+        assert analytics.store.watermark == source[-1][:2]
+        assert await analytics.catch_up(now) == 0
+        assert len(analytics.store) == 5
+    
+    @pytest.mark.asyncio
+    async def test_catch_up_recovers_results_written_behind_the_watermark(self, monkeypatch):
+        """Test that a late result within the rescan window is ingested."""
+        now = BASE + timedelta(hours=2)
+        database = FakeDatabase([
+            make_row(BASE + timedelta(minutes=i), uuid.uuid4(), i, uuid.uuid4()) for i in range(4)
+        ])
+        database.install(monkeypatch)
+        analytics = ColumnarAnalytics(ingest_lag=30, rescan_window=3600, batch_size=10)
+        await analytics.catch_up(now)
+        
+        late = make_row(BASE + timedelta(seconds=90), uuid.uuid4(), 99, uuid.uuid4())
+        database.rows.append(late)
+        assert await analytics.catch_up(now) == 5
+        assert len(analytics.store) == 5
+        assert analytics.store.snapshot.duration_percentiles([100]) == (5, [99.0])
+        assert await analytics.catch_up(now) == 0
+    
+    @pytest.mark.asyncio
+    async def test_catch_up_trims_rows_past_retention(self, monkeypatch):
+        """Test that rows in dropped partitions are evicted from memory."""
+        database = FakeDatabase([
+            make_row(BASE - timedelta(days=40), uuid.uuid4(), 1, uuid.uuid4()),
+            make_row(BASE, uuid.uuid4(), 2, uuid.uuid4()),
+        ])
+        database.install(monkeypatch)
+        analytics = ColumnarAnalytics(ingest_lag=30, retention_months=1)
+        assert await analytics.catch_up(BASE + timedelta(hours=1)) == 2
+        
+        del database.rows[0]
+        assert await analytics.catch_up(BASE + timedelta(days=30)) == 0
+        assert len(analytics.store) == 1
+        assert len(analytics.store.session_dictionary.values) == 1
+
+
+class TestColumnarEndpoints:
+    """Test the analytics endpoints served from the store."""
+    
+    def test_unavailable_while_disabled_or_loading(self, monkeypatch):
+        """Test 503 instead of falling back to scanning game_results."""
+        client = TestClient(app)
+        monkeypatch.setattr(settings, "columnar_analytics", False)
+        assert client.get("/api/analytics/heatmap").status_code == 503
+        
+        monkeypatch.setattr(settings, "columnar_analytics", True)
+        monkeypatch.setattr(columnar_analytics, "ready", False)
+        response = client.get("/api/analytics/heatmap")
+        assert response.status_code == 503
+        assert "retry-after" in response.headers
+    
+    def test_heatmap_and_percentiles(self, monkeypatch, facts):
+        """Test responses and revalidation against the store."""
+        store, *_ = facts
+        client = TestClient(app)
+        monkeypatch.setattr(settings, "columnar_analytics", True)
+        monkeypatch.setattr(columnar_analytics, "ready", True)
+        monkeypatch.setattr(columnar_analytics, "store", store)
+        
+        response = client.get("/api/analytics/heatmap")
+        assert response.status_code == 200
+        assert response.json()["counts"][0][10] == 3
+        etag = response.headers["etag"]
+        assert client.get("/api/analytics/heatmap", headers={"If-None-Match": etag}).status_code == 304
+        
+        response = client.get("/api/analytics/durations", params={'p': [50, 100]})
+        assert response.json() == {
+            'duration_count': 4, 'percentiles': [50.0, 100.0], 'values_ms': [2500.0, 4000.0]
+        }
+        assert client.get("/api/analytics/durations", params={'p': 101}).status_code == 422
@@ -0,0 +1,231 @@
+"""Tests for per-session elimination wheels."""
+
+import asyncio
+import random
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+
+from app.services import elimination as elimination_module
+from app.services.cache import MemoryCacheBackend
+from app.services.elimination import (
+    EliminationExhausted,
+    EliminationState,
+    EliminationStore,
+)
+from app.services.roster import Roster, RosterEntry
+
+
+def make_roster(*weights: int) -> Roster:
+    """Build a roster with the given weights."""
+    return Roster(
+        [RosterEntry(id=uuid.uuid4(), name=f"Name {i}", weight=w) for i, w in enumerate(weights)],
+        version=1,
+    )
+
+
+class FakeTransaction:
+    """Request transaction holding session locks until it ends, like advisory locks."""
+    
+    def __init__(self, locks: dict[uuid.UUID, asyncio.Lock]) -> None:
+        self._locks = locks
+        self._held: list[asyncio.Lock] = []
+    
+    async def lock(self, session_id: uuid.UUID) -> None:
+        lock = self._locks.setdefault(session_id, asyncio.Lock())
+        await lock.acquire()
+        self._held.append(lock)
+    
+    async def __aenter__(self) -> "FakeTransaction":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        for lock in self._held:
+            lock.release()
+
+
+class FlakyIncrBackend(MemoryCacheBackend):
+    """Memory backend whose next sequence bump fails."""
+    
+    def __init__(self) -> None:
+        super().__init__()
+        self.fail_next = True
+    
+    async def incr(self, key: str, ttl: int | None = None) -> int:
+        if self.fail_next:
+            self.fail_next = False
+            raise ConnectionError("Redis is down")
+        return await super().incr(key, ttl)
+
+
+class TestEliminationState:
+    """Test sampling without replacement for one session."""
+    
+    def test_starts_without_eliminated_names(self):
+        """Test that recovered picks are out of play."""
+        roster = make_roster(1, 2, 3)
+        state = EliminationState(roster, {roster.entries[2].id})
+        assert state.remaining == 2
+        rng = random.Random(0)
+        assert all(state.pick(rng) != 2 for _ in range(100))
+    
+    def test_rebase_keeps_round_and_adds_new_names(self):
+        """Test that a roster change keeps eliminations and adds new names."""
+        roster = make_roster(1, 1)
+        state = EliminationState(roster, set())
+        state.eliminate(0)
+        changed = Roster([*roster.entries, RosterEntry(uuid.uuid4(), "New", 1)], version=2)
+        rebased = state.rebase(changed)
+        assert rebased.remaining == 2
+        assert roster.entries[0].id in rebased.eliminated
+
+
+class TestEliminationStore:
+    """Test session state caching, persistence and recovery."""
+    
+    @pytest.fixture
+    def persisted(self, monkeypatch):
+        """Replace result queries with an in-memory list of elimination picks."""
+        picks: dict[uuid.UUID, list[uuid.UUID]] = {}
+        
+        async def fake_load(db, session_id):
+            return set(picks.get(session_id, []))
+        
+        async def fake_lock(db, session_id):
+            if db is not None:
+                await db.lock(session_id)
+            return datetime.now(UTC)
+        
+        monkeypatch.setattr(elimination_module, "load_eliminated", fake_load)
+        monkeypatch.setattr(elimination_module, "lock_session", fake_lock)
+        return picks
+    
+    def persist_to(self, picks, session_id):
+        """Persist callback recording picks like the result table would."""
+        async def persist(entry, picked_at):
+            picks.setdefault(session_id, []).append(entry.id)
+        return persist
+    
+    async def test_draws_every_name_once(self, persisted):
+        """Test that a session picks each name once and then is exhausted."""
+        store = EliminationStore(backend=MemoryCacheBackend())
+        roster = make_roster(1, 5, 2, 9)
+        session_id = uuid.uuid4()
+        persist = self.persist_to(persisted, session_id)
+        
+        picked = []
+        for expected_remaining in (3, 2, 1, 0):
+            entry, remaining = await store.draw(None, session_id, roster, persist)
+            picked.append(entry.id)
+            assert remaining == expected_remaining
+        
+        assert sorted(picked) == sorted(e.id for e in roster.entries)
+        with pytest.raises(EliminationExhausted):
+            await store.draw(None, session_id, roster, persist)
+    
+    async def test_failed_persist_keeps_name_in_play(self, persisted):
+        """Test that a pick is only eliminated after it was written."""
+        store = EliminationStore(backend=MemoryCacheBackend())
+        roster = make_roster(1)
+        session_id = uuid.uuid4()
+        
+        async def failing(entry, picked_at):
+            raise OSError("database down")
+        
+        with pytest.raises(OSError):
+            await store.draw(None, session_id, roster, failing)
+        entry, remaining = await store.draw(
+            None, session_id, roster, self.persist_to(persisted, session_id)
+        )
+        assert entry is roster.entries[0]
+        assert remaining == 0
+    
+    async def test_evicted_session_recovers_from_results(self, persisted):
+        """Test that LRU eviction loses no eliminations."""
+        store = EliminationStore(capacity=1, backend=MemoryCacheBackend())
+        roster = make_roster(1, 1, 1)
+        first, second = uuid.uuid4(), uuid.uuid4()
+        
+        entry, _ = await store.draw(None, first, roster, self.persist_to(persisted, first))
+        await store.draw(None, second, roster, self.persist_to(persisted, second))
+        assert len(store) == 1
+        
+        rest = [
+            (await store.draw(None, first, roster, self.persist_to(persisted, first)))[0]
+            for _ in range(2)
+        ]
+        assert entry not in rest
+    
+    async def test_other_worker_picks_trigger_recovery(self, persisted):
+        """Test that a worker notices picks made by another worker."""
+        backend = MemoryCacheBackend()
+        worker_a = EliminationStore(backend=backend)
+        worker_b = EliminationStore(backend=backend)
+        roster = make_roster(1, 1)
+        session_id = uuid.uuid4()
+        persist = self.persist_to(persisted, session_id)
+        
+        first, _ = await worker_a.draw(None, session_id, roster, persist)
+        second, remaining = await worker_b.draw(None, session_id, roster, persist)
+        
+        assert second is not first
+        assert remaining == 0
+        with pytest.raises(EliminationExhausted):
+            await worker_a.draw(None, session_id, roster, persist)
+    
+    async def test_concurrent_workers_pick_different_names(self, persisted):
+        """Test that draws of one session on two workers are serialized."""
+        backend = MemoryCacheBackend()
+        workers = [EliminationStore(backend=backend) for _ in range(2)]
+        roster = make_roster(1, 1)
+        session_id = uuid.uuid4()
+        locks: dict[uuid.UUID, asyncio.Lock] = {}
+        
+        async def slow_persist(entry, picked_at):
+            await asyncio.sleep(0.01)
+            persisted.setdefault(session_id, []).append(entry.id)
+        
+        async def draw(worker):
+            async with FakeTransaction(locks) as db:
+                # Equal seeds would make unserialized draws pick the same name
+                entry, _ = await worker.draw(
+                    db, session_id, roster, slow_persist, random.Random(0)
+                )
+                return entry
+        
+        first, second = await asyncio.gather(*(draw(worker) for worker in workers))
+        assert first is not second
+    
+    async def test_failed_sequence_bump_persists_nothing(self, persisted):
+        """Test that a failed bump neither records nor eliminates the pick."""
+        store = EliminationStore(backend=FlakyIncrBackend())
+        roster = make_roster(1)
+        session_id = uuid.uuid4()
+        persist = self.persist_to(persisted, session_id)
+        
+        with pytest.raises(ConnectionError):
+            await store.draw(None, session_id, roster, persist)
+        assert session_id not in persisted
+        
+        entry, remaining = await store.draw(None, session_id, roster, persist)
+        assert entry is roster.entries[0]
+        assert remaining == 0
+    
+    async def test_pick_is_stamped_when_the_lock_is_held(self, persisted, monkeypatch):
+        """Test that persist gets the lock time, not a time taken before waiting."""
+        store = EliminationStore(backend=MemoryCacheBackend())
+        roster = make_roster(1)
+        session_id = uuid.uuid4()
+        locked_at = datetime(2024, 5, 6, 10, 0, tzinfo=UTC)
+        stamps = []
+        
+        async def lock(db, session_id):
+            return locked_at
+        
+        async def persist(entry, picked_at):
+            stamps.append(picked_at)
+        
+        monkeypatch.setattr(elimination_module, "lock_session", lock)
+        await store.draw(None, session_id, roster, persist)
+        assert stamps == [locked_at]
@@ -0,0 +1,117 @@
+"""Tests for history export formatting."""
+
+import csv
+import io
+import json
+import uuid
+from datetime import UTC, datetime, timedelta
+from ipaddress import IPv4Address
+
+import pytest
+from sqlalchemy import column, event, select, table, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.services import export
+from app.services.export import (
+    EXPORT_FIELDS,
+    export_query,
+    format_csv,
+    format_ndjson,
+    stream_export,
+)
+
+
+def make_row() -> tuple:
+    """Build a row shaped like the export query output."""
+    return (
+        uuid.uuid4(),
+        datetime(2024, 5, 1, 12, 0, tzinfo=UTC),
+        uuid.uuid4(),
+        uuid.uuid4(),
+        'Alice, "the first"',
+        'a' * 64,
+        2500,
+        None,
+        IPv4Address('192.168.1.1'),
+        'Test User Agent',
+    )
+
+
+class TestExportFormatting:
+    """Test CSV and NDJSON encoding."""
+    
+    def test_format_csv_with_header(self):
+        """Test that CSV output quotes values and includes the header."""
+        row = make_row()
+        text = format_csv([row], header=True).decode("utf-8")
+        parsed = list(csv.reader(io.StringIO(text)))
+        assert parsed[0] == list(EXPORT_FIELDS)
+        assert parsed[1][4] == 'Alice, "the first"'
+        assert parsed[1][1] == '2024-05-01T12:00:00+00:00'
+        assert parsed[1][8] == '192.168.1.1'
+    
+    def test_format_ndjson(self):
+        """Test that NDJSON emits one object per line."""
+        rows = [make_row(), make_row()]
+        lines = format_ndjson(rows).decode("utf-8").splitlines()
+        assert len(lines) == 2
+        record = json.loads(lines[0])
+        assert set(record) == set(EXPORT_FIELDS)
+        assert record["id"] == str(rows[0][0])
+        assert record["spin_duration_ms"] == 2500
+        assert record["user_id"] is None
+    
+    def test_format_ndjson_empty(self):
+        """Test that an empty chunk produces no output."""
+        assert format_ndjson([]) == b""
+
+
+class TestExportQuery:
+    """Test that filters are pushed down into SQL."""
+    
+    def test_filters_are_applied_in_sql(self):
+        """Test that date range and session filters become WHERE clauses."""
+        start = datetime(2024, 1, 1, tzinfo=UTC)
+        stmt = export_query(start=start, end=start + timedelta(days=1), session_id=uuid.uuid4())
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "game_results.created_at >=" in sql
+        assert "game_results.created_at <" in sql
+        assert "game_results.session_id =" in sql
+        assert "ORDER BY game_results.created_at, game_results.id" in sql
+
+
+class TestStreamExport:
+    """Test streaming against a real database connection."""
+    
+    @pytest.mark.asyncio
+    async def test_streams_inside_a_transaction_on_an_autocommit_engine(self, monkeypatch):
+        """Test that the cursor runs in a transaction although reads autocommit."""
+        monkeypatch.setattr(export, "EXPORT_CHUNK_ROWS", 2)
+        # Configured like the read engines
+        engine = create_async_engine("sqlite+aiosqlite://", isolation_level="AUTOCOMMIT")
+        async with engine.connect() as conn:
+            await conn.execute(text(f"CREATE TABLE spins ({', '.join(EXPORT_FIELDS)})"))
+            await conn.execute(text(
+                "INSERT INTO spins (id, created_at) VALUES (1, 'a'), (2, 'b'), (3, 'c')"
+            ))
+        
+        isolation_levels = []
+        
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def record(conn, cursor, statement, parameters, context, executemany):
+            isolation_levels.append(conn.get_execution_options().get("isolation_level"))
+        
+        spins = table("spins", *(column(field) for field in EXPORT_FIELDS))
+        stmt = select(*spins.c).order_by(spins.c.id)
+        try:
+            chunks = [chunk async for chunk in stream_export(stmt, "ndjson", bind=engine)]
+        finally:
+            await engine.dispose()
+        
+        assert len(chunks) == 2
+        records = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+        assert [(record["id"], record["created_at"]) for record in records] == [
+            (1, "a"), (2, "b"), (3, "c")
+        ]
+        assert isolation_levels and "AUTOCOMMIT" not in isolation_levels
@@ -0,0 +1,183 @@
+"""Tests for fairness audits."""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+from app.services import fairness
+from app.services.fairness import (
+    audit_snapshots,
+    backfill,
+    chi2_sf,
+    kolmogorov_sf,
+    name_fits,
+)
+from app.services.result_writer import build_result_record
+from app.services.rollups import aggregate_results
+
+
+def make_snapshot(weights, rng=None):
+    """Snapshot entries with the given weights, with ids drawn from ``rng``."""
+    rng = rng or np.random.default_rng(0)
+    ids = [uuid.UUID(bytes=rng.bytes(16)) for _ in weights]
+    entries = [
+        {'id': str(name_id), 'name': f"Name {i}", 'weight': int(weight)}
+        for i, (name_id, weight) in enumerate(zip(ids, weights))
+    ]
+    return rng.bytes(32).hex(), entries
+
+
+def draw(entries, spins, rng, probabilities=None):
+    """Observed counts of ``spins`` draws from the entries."""
+    weights = np.array([entry['weight'] for entry in entries], dtype=float)
+    counts = rng.multinomial(spins, probabilities or weights / weights.sum())
+    return {uuid.UUID(entry['id']): int(n) for entry, n in zip(entries, counts)}
+
+
+class TestDistributions:
+    """Test the tail probabilities behind the p-values."""
+    
+    def test_chi2_sf_matches_critical_values(self):
+        """Test both the series and the continued fraction branch."""
+        assert chi2_sf(3.841459, 1) == pytest.approx(0.05, abs=1e-6)
+        assert chi2_sf(18.307038, 10) == pytest.approx(0.05, abs=1e-6)
+        assert chi2_sf(2.558212, 10) == pytest.approx(0.99, abs=1e-6)
+        assert chi2_sf(0, 5) == 1.0
+        assert chi2_sf(50_000, 10_000) == 0.0
+    
+    def test_kolmogorov_sf(self):
+        """Test the asymptotic critical value and the small-statistic limit."""
+        p = kolmogorov_sf(np.array([1.3581 / 100, 0.0]), np.array([10_000, 10_000]))
+        assert p[0] == pytest.approx(0.05, abs=1e-3)
+        assert p[1] == 1.0
+
+
+class TestAuditSnapshots:
+    """Test goodness-of-fit audits over many snapshots at once."""
+    
+    def test_fair_snapshots_do_not_drift(self):
+        """Test that weighted draws pass and keep their segment totals."""
+        rng = np.random.default_rng(3)
+        snapshots = [make_snapshot(rng.integers(1, 10, size), rng) for size in (2, 7, 30)]
+        observed = {key: draw(entries, 20_000, rng) for key, entries in snapshots}
+        audits = audit_snapshots(snapshots, observed, alpha=0.001, min_expected=5)
+        
+        assert [audit.snapshot_key for audit in audits] == [key for key, _ in snapshots]
+        assert [audit.spins for audit in audits] == [20_000] * 3
+        assert [audit.degrees_of_freedom for audit in audits] == [1, 6, 29]
+        assert all(audit.sufficient and not audit.drift for audit in audits)
+    
+    def test_biased_snapshot_drifts(self):
+        """Test that draws ignoring the weights are flagged."""
+        rng = np.random.default_rng(4)
+        key, entries = make_snapshot([1, 1, 1, 5], rng)
+        observed = {key: draw(entries, 5_000, rng, [0.25] * 4)}
+        audit, = audit_snapshots([(key, entries)], observed, alpha=0.001, min_expected=5)
+        assert audit.drift
+        assert audit.chi_square_p < 1e-10
+        assert audit.ks_p < 0.001
+    
+    def test_unexpected_and_insufficient(self):
+        """Test spins outside the snapshot and too few spins to judge."""
+        key, entries = make_snapshot([1, 1])
+        first = uuid.UUID(entries[0]['id'])
+        audit, = audit_snapshots(
+            [(key, entries)], {key: {first: 3, uuid.uuid4(): 1}}, min_expected=5
+        )
+        assert audit.spins == 3
+        assert audit.unexpected_spins == 1
+        assert not audit.sufficient
+        assert audit.drift
+        
+        audit, = audit_snapshots([(key, entries)], {})
+        assert audit.spins == 0
+        assert audit.chi_square is None and not audit.drift
+    
+    def test_name_fits(self):
+        """Test expected counts proportional to weight in canonical order."""
+        key, entries = make_snapshot([1, 3])
+        counts = {uuid.UUID(entry['id']): 4 * entry['weight'] for entry in entries}
+        fits = name_fits(entries, counts)
+        assert [fit.name_id for fit in fits] == sorted(counts)
+        assert [fit.expected for fit in fits] == [fit.observed for fit in fits]
+
+
+class TestCounting:
+    """Test how spins reach the fairness counters."""
+    
+    def test_only_standard_spins_are_counted(self):
+        """Test per-snapshot counts, skipping elimination rounds."""
+        alice, bob = uuid.uuid4(), uuid.uuid4()
+        now = datetime.now(UTC)
+        records = [
+            build_result_record(
+                session_id=uuid.uuid4(),
+                selected_name_id=name_id,
+                selected_name_snapshot={},
+                roster_snapshot_key=key,
+                created_at=now,
+                spin_mode=mode,
+            )
+            for name_id, key, mode in [
+                (alice, "a" * 64, "standard"),
+                (alice, "a" * 64, "standard"),
+                (bob, "b" * 64, "standard"),
+                (bob, "a" * 64, "elimination"),
+            ]
+        ]
+        assert aggregate_results(records).fairness == {
+            ("a" * 64, alice): 2, ("b" * 64, bob): 1
+        }
+    
+    @pytest.mark.asyncio
+    async def test_backfill_walks_windows_and_resumes(self, monkeypatch):
+        """Test that each window commits with its progress until streaming began."""
+        since = datetime(2024, 5, 3, 12, tzinfo=UTC)
+        oldest = datetime(2024, 5, 1, 6, tzinfo=UTC)
+        state = {'until': None}
+        counted = []
+        
+        class FakeResult:
+            def __init__(self, rows):
+                self._rows = rows
+            
+            def one_or_none(self):
+                return self._rows[0] if self._rows else None
+            
+            def scalar(self):
+                return self._rows[0][0]
+        
+        class FakeConnection:
+            async def execute(self, stmt, params=None):
+                if stmt is fairness.LOCK_STATE:
+                    return FakeResult([(since, state['until'])])
+                if stmt is fairness.OLDEST_RESULT:
+                    return FakeResult([(oldest,)])
+                if stmt is fairness.BACKFILL_COUNTS:
+                    counted.append((params['lower'], params['upper']))
+                elif stmt is fairness.ADVANCE_BACKFILL:
+                    state['until'] = params['until']
+                return FakeResult([])
+        
+        class FakeEngine:
+            def begin(self):
+                class Transaction:
+                    async def __aenter__(self):
+                        return FakeConnection()
+                    
+                    async def __aexit__(self, *exc):
+                        return False
+                return Transaction()
+        
+        monkeypatch.setattr(fairness.rollup_watermark, "advance", AsyncMock())
+        assert await backfill(FakeEngine(), timedelta(days=1)) == 3
+        assert counted == [
+            (oldest, oldest + timedelta(days=1)),
+            (oldest + timedelta(days=1), oldest + timedelta(days=2)),
+            (oldest + timedelta(days=2), since),
+        ]
+        assert state['until'] == since
+        assert await backfill(FakeEngine(), timedelta(days=1)) == 0
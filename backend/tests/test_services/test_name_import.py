@@ -0,0 +1,105 @@
+"""Tests for bulk name import parsing and validation."""
+
+import pytest
+
+from app.services.name_import import (
+    ImportFileError,
+    ImportRow,
+    detect_format,
+    parse_csv,
+    parse_json,
+    upsert_sql,
+    validate_rows,
+)
+
+
+class TestParsing:
+    """Test CSV and JSON upload parsing."""
+    
+    def test_parse_csv_normalizes_header(self):
+        """Test that header names are case and space insensitive."""
+        data = "﻿Name , Weight,notes\nAlice,3,x\nBob,,y\n".encode()
+        rows, fields = parse_csv(data)
+        assert rows == [
+            {'name': 'Alice', 'weight': '3', 'notes': 'x'},
+            {'name': 'Bob', 'weight': '', 'notes': 'y'},
+        ]
+        assert fields == {'name', 'weight'}
+    
+    def test_parse_csv_requires_name_column(self):
+        """Test that a CSV without a name column is rejected as a whole."""
+        with pytest.raises(ImportFileError, match="'name' column"):
+            parse_csv(b"title,weight\nAlice,1\n")
+    
+    def test_parse_json_accepts_strings_and_objects(self):
+        """Test that bare strings are treated as names."""
+        rows, fields = parse_json(b'["Alice", {"name": "Bob", "is_active": false}]')
+        assert rows == [{'name': 'Alice'}, {'name': 'Bob', 'is_active': False}]
+        assert fields == {'name', 'is_active'}
+        with pytest.raises(ImportFileError, match="array"):
+            parse_json(b'{"name": "Alice"}')
+    
+    def test_detect_format(self):
+        """Test format detection by extension and content type."""
+        assert detect_format("names.CSV", None) == "csv"
+        assert detect_format("upload", "application/json") == "json"
+        with pytest.raises(ImportFileError):
+            detect_format("names.xlsx", "application/octet-stream")
+
+
+class TestValidation:
+    """Test batch validation with per-row errors."""
+    
+    def test_collects_errors_without_stopping(self):
+        """Test that invalid rows are reported and valid ones kept."""
+        batch = validate_rows([
+            {'name': ' Alice ', 'weight': '2', 'is_active': 'no'},
+            {'name': '   '},
+            {'name': 'Bob', 'weight': '0'},
+            {'name': 'Carol', 'weight': 'heavy'},
+            {'name': 'Dan', 'is_active': 'maybe'},
+            'Eve',
+        ], frozenset({'name', 'weight', 'is_active'}))
+        
+        assert batch.received == 6
+        assert batch.rows == [ImportRow('Alice', None, False, 2)]
+        assert [(error.row, error.error) for error in batch.errors] == [
+            (2, "Name cannot be empty"),
+            (3, "Weight must be at least 1"),
+            (4, "Invalid weight: 'heavy'"),
+            (5, "Invalid is_active value: 'maybe'"),
+            (6, "Row must be an object"),
+        ]
+        assert batch.errors[1].name == 'Bob'
+    
+    def test_deduplicates_ignoring_case_last_wins(self):
+        """Test that the last row for a name is kept."""
+        batch = validate_rows([
+            {'name': 'Alice', 'weight': 1},
+            {'name': 'Bob'},
+            {'name': 'ALICE', 'weight': 5},
+        ], frozenset({'name', 'weight'}))
+        
+        assert batch.duplicates == 1
+        assert batch.rows == [ImportRow('Bob'), ImportRow('ALICE', weight=5)]
+    
+    def test_blank_description_becomes_none(self):
+        """Test that model description rules apply to imports."""
+        batch = validate_rows([{'name': 'Alice', 'description': '  '}], frozenset())
+        assert batch.rows[0].description is None
+
+
+class TestUpsertSql:
+    """Test the generated upsert statement."""
+    
+    def test_update_only_touches_uploaded_columns(self):
+        """Test that absent columns keep their current values."""
+        sql = upsert_sql(frozenset({'name', 'weight'}), "update")
+        assert "ON CONFLICT (lower(name)) DO UPDATE SET weight = EXCLUDED.weight," in sql
+        assert "description = EXCLUDED" not in sql
+        assert "IS DISTINCT FROM" in sql
+    
+    def test_skip_and_name_only_do_nothing(self):
+        """Test that nothing is overwritten in skip mode or without columns."""
+        assert "DO NOTHING" in upsert_sql(frozenset({'name', 'weight'}), "skip")
+        assert "DO NOTHING" in upsert_sql(frozenset({'name'}), "update")
@@ -0,0 +1,65 @@
+"""Tests for game_results partition management."""
+
+from datetime import UTC, date, datetime
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from app.models.game_result import GameResult
+from app.services.partitions import (
+    add_months,
+    create_partition_sql,
+    expired_months,
+    month_start,
+    parse_partition_name,
+    partition_name,
+)
+
+
+class TestPartitionNaming:
+    """Test month arithmetic and partition names."""
+    
+    def test_month_start_uses_utc(self):
+        """Test that datetimes are bucketed by their UTC month."""
+        moment = datetime(2024, 5, 31, 23, 30, tzinfo=UTC)
+        assert month_start(moment) == date(2024, 5, 1)
+        assert month_start(date(2024, 5, 17)) == date(2024, 5, 1)
+    
+    def test_add_months_crosses_years(self):
+        """Test month shifting across year boundaries."""
+        assert add_months(date(2024, 11, 1), 2) == date(2025, 1, 1)
+        assert add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+    
+    def test_partition_name_round_trip(self):
+        """Test that partition names parse back to their month."""
+        name = partition_name(date(2024, 3, 1))
+        assert name == "game_results_p202403"
+        assert parse_partition_name(name) == date(2024, 3, 1)
+        assert parse_partition_name("game_results_default") is None
+    
+    def test_create_partition_sql_bounds(self):
+        """Test that a partition covers exactly one UTC month."""
+        sql = create_partition_sql(date(2024, 12, 1))
+        assert 'PARTITION OF "game_results"' in sql
+        assert "FROM ('2024-12-01T00:00:00+00:00') TO ('2025-01-01T00:00:00+00:00')" in sql
+
+
+class TestRetention:
+    """Test selection of expired partitions."""
+    
+    def test_expired_months(self):
+        """Test that only months entirely before the window are expired."""
+        months = [date(2023, m, 1) for m in range(1, 13)] + [date(2024, 1, 1)]
+        now = datetime(2024, 1, 15, tzinfo=UTC)
+        expired = expired_months(months, now, retention_months=6)
+        assert expired == [date(2023, m, 1) for m in range(1, 7)]
+
+
+class TestPartitionedModel:
+    """Test the partitioned table definition."""
+    
+    def test_game_results_is_range_partitioned(self):
+        """Test that the DDL partitions by created_at with it in the key."""
+        ddl = str(CreateTable(GameResult.__table__).compile(dialect=postgresql.dialect()))
+        assert "PARTITION BY RANGE (created_at)" in ddl
+        assert {c.name for c in GameResult.__table__.primary_key.columns} == {"id", "created_at"}
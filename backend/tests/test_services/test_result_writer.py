@@ -0,0 +1,167 @@
+"""Tests for the write-behind result buffer."""
+
+import asyncio
+import json
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+
+from app.services.result_writer import RESULT_COLUMNS, ResultWriter, build_result_record
+
+
+class RecordingSink:
+    """Sink that records every flushed batch."""
+    
+    def __init__(self, failures: int = 0) -> None:
+        self.batches: list[list] = []
+        self.failures = failures
+    
+    async def __call__(self, records) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database unavailable")
+        self.batches.append(list(records))
+
+
+def make_record(index: int = 0) -> tuple:
+    """Build a record with a recognizable duration."""
+    return build_result_record(
+        session_id=uuid.uuid4(),
+        selected_name_id=uuid.uuid4(),
+        selected_name_snapshot={'id': 'test', 'name': 'Test Name'},
+        roster_snapshot_key='a' * 64,
+        spin_duration_ms=index,
+        created_at=datetime.now(UTC),
+    )
+
+
+class TestBuildResultRecord:
+    """Test COPY record construction."""
+    
+    def test_record_matches_column_order(self):
+        """Test that records line up with RESULT_COLUMNS."""
+        record = make_record(7)
+        assert len(record) == len(RESULT_COLUMNS)
+        row = dict(zip(RESULT_COLUMNS, record))
+        assert isinstance(row["id"], uuid.UUID)
+        assert json.loads(row["selected_name_snapshot"]) == {'id': 'test', 'name': 'Test Name'}
+        assert row["spin_duration_ms"] == 7
+        assert row["created_at"] == row["updated_at"]
+
+
+class TestResultWriter:
+    """Test batching, flushing and shutdown behaviour."""
+    
+    @pytest.mark.asyncio
+    async def test_submit_requires_running_writer(self):
+        """Test that records are not silently queued before start."""
+        writer = ResultWriter(RecordingSink())
+        with pytest.raises(RuntimeError, match="not running"):
+            await writer.submit(make_record())
+    
+    @pytest.mark.asyncio
+    async def test_flushes_when_batch_is_full(self):
+        """Test that a full batch is written without waiting for the interval."""
+        sink = RecordingSink()
+        writer = ResultWriter(sink, max_size=100, batch_size=3, flush_interval=60)
+        await writer.start()
+        for i in range(3):
+            await writer.submit(make_record(i))
+        await asyncio.sleep(0.01)
+        
+        assert [len(batch) for batch in sink.batches] == [3]
+        await writer.stop()
+    
+    @pytest.mark.asyncio
+    async def test_flushes_after_interval(self):
+        """Test that a partial batch is written once the interval elapses."""
+        sink = RecordingSink()
+        writer = ResultWriter(sink, max_size=100, batch_size=100, flush_interval=0.01)
+        await writer.start()
+        await writer.submit(make_record())
+        await asyncio.sleep(0.05)
+        
+        assert [len(batch) for batch in sink.batches] == [1]
+        await writer.stop()
+    
+    @pytest.mark.asyncio
+    async def test_stop_drains_buffer(self):
+        """Test that shutdown writes every accepted record."""
+        sink = RecordingSink()
+        writer = ResultWriter(sink, max_size=100, batch_size=4, flush_interval=60)
+        await writer.start()
+        for i in range(10):
+            await writer.submit(make_record(i))
+        await writer.stop()
+        
+        written = [record for batch in sink.batches for record in batch]
+        assert sorted(r[5] for r in written) == list(range(10))
+        assert writer.backlog == 0
+        assert not writer.running
+    
+    @pytest.mark.asyncio
+    async def test_failed_drain_logs_discarded_records(self, caplog):
+        """Test that a failing shutdown drain reports how many records it lost."""
+        writer = ResultWriter(RecordingSink(failures=1), max_size=100, batch_size=4, flush_interval=60)
+        # Hold the flush loop so every record is left for the drain
+        writer._task = asyncio.create_task(asyncio.sleep(60))
+        for i in range(6):
+            await writer.submit(make_record(i))
+        writer._task.cancel()
+        
+        with pytest.raises(ConnectionError):
+            await writer.stop()
+        
+        assert "discarding 6 game results" in caplog.text
+        assert writer.backlog == 0
+    
+    @pytest.mark.asyncio
+    async def test_submit_applies_backpressure(self):
+        """Test that producers wait when the buffer is full."""
+        writer = ResultWriter(RecordingSink(), max_size=1, batch_size=10, flush_interval=60)
+        # Occupy the flush loop so nothing is consumed from the queue
+        writer._task = asyncio.create_task(asyncio.sleep(60))
+        await writer.submit(make_record())
+        
+        with pytest.raises(TimeoutError):
+            await asyncio.wait_for(writer.submit(make_record()), timeout=0.05)
+        
+        writer._task.cancel()
+        await writer.stop()
+    
+    @pytest.mark.asyncio
+    async def test_failed_flush_is_retried(self):
+        """Test that a failed flush keeps its records and retries."""
+        sink = RecordingSink(failures=1)
+        writer = ResultWriter(sink, max_size=100, batch_size=2, flush_interval=0.01)
+        await writer.start()
+        await writer.submit(make_record(1))
+        await writer.submit(make_record(2))
+        await asyncio.sleep(0.1)
+        
+        assert [len(batch) for batch in sink.batches] == [2]
+        await writer.stop()
+    
+    @pytest.mark.asyncio
+    async def test_stop_during_slow_flush_writes_each_record_once(self):
+        """Test that stopping mid-flush neither interrupts nor repeats the batch."""
+        committed = []
+        
+        async def slow_sink(records):
+            if any(record[0] in committed for record in records):
+                raise AssertionError("duplicate key")
+            committed.extend(record[0] for record in records)
+            # Work after the commit, like advancing the rollup watermark
+            await asyncio.sleep(0.05)
+        
+        writer = ResultWriter(slow_sink, max_size=100, batch_size=2, flush_interval=60)
+        await writer.start()
+        for i in range(5):
+            await writer.submit(make_record(i))
+        await asyncio.sleep(0.01)
+        await writer.stop()
+        
+        assert len(committed) == len(set(committed)) == 5
+        assert writer.backlog == 0
+        assert not writer.running
@@ -0,0 +1,121 @@
+"""Tests for rollup aggregation."""
+
+import uuid
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+
+from app.schemas.analytics import DurationSummary
+from app.services import rollups
+from app.services.result_writer import RESULT_COLUMNS, build_result_record
+from app.services.rollups import aggregate_results, hour_bucket
+
+
+def make_record(session_id, name_id, created_at, duration=None, user_agent_id=None) -> tuple:
+    """Build a result record for aggregation."""
+    return build_result_record(
+        session_id=session_id,
+        selected_name_id=name_id,
+        selected_name_snapshot={'id': str(name_id), 'name': 'Test Name'},
+        roster_snapshot_key='a' * 64,
+        spin_duration_ms=duration,
+        user_agent_id=user_agent_id,
+        created_at=created_at,
+    )
+
+
+class TestAggregateResults:
+    """Test collapsing records into rollup deltas."""
+    
+    def test_record_positions_match_result_columns(self):
+        """Test that rollups read the right record fields."""
+        assert RESULT_COLUMNS[rollups.RECORD_SESSION_ID] == "session_id"
+        assert RESULT_COLUMNS[rollups.RECORD_NAME_ID] == "selected_name_id"
+        assert RESULT_COLUMNS[rollups.RECORD_DURATION] == "spin_duration_ms"
+        assert RESULT_COLUMNS[rollups.RECORD_CREATED_AT] == "created_at"
+        assert RESULT_COLUMNS[rollups.RECORD_SNAPSHOT_KEY] == "roster_snapshot_key"
+        assert RESULT_COLUMNS[rollups.RECORD_SPIN_MODE] == "spin_mode"
+        assert RESULT_COLUMNS[rollups.RECORD_USER_AGENT_ID] == "user_agent_id"
+    
+    def test_hour_bucket_truncates_to_utc_hour(self):
+        """Test that buckets start on the UTC hour."""
+        moment = datetime(2024, 5, 1, 13, 45, 12, tzinfo=UTC)
+        assert hour_bucket(moment) == datetime(2024, 5, 1, 13, tzinfo=UTC)
+    
+    def test_aggregates_per_name_hour_day_and_session(self):
+        """Test that records are grouped into every rollup level."""
+        session_id = uuid.uuid4()
+        alice, bob = uuid.uuid4(), uuid.uuid4()
+        base = datetime(2024, 5, 1, 10, 5, tzinfo=UTC)
+        records = [
+            make_record(session_id, alice, base, 1000),
+            make_record(session_id, alice, base + timedelta(minutes=10), 3000),
+            make_record(session_id, alice, base + timedelta(hours=1), None),
+            make_record(session_id, bob, base, 2000),
+        ]
+        batch = aggregate_results(records)
+        
+        first_hour = hour_bucket(base)
+        alice_hour = batch.hourly[(first_hour, alice)]
+        assert alice_hour.spin_count == 2
+        assert alice_hour.duration_count == 2
+        assert alice_hour.duration_sum == 4000
+        assert alice_hour.duration_sq_sum == 10_000_000
+        assert (alice_hour.duration_min, alice_hour.duration_max) == (1000, 3000)
+        
+        assert batch.hourly[(first_hour + timedelta(hours=1), alice)].spin_count == 1
+        assert batch.daily[(date(2024, 5, 1), alice)].spin_count == 3
+        assert batch.daily[(date(2024, 5, 1), bob)].spin_count == 1
+        
+        session = batch.sessions[session_id]
+        assert session.spin_count == 4
+        assert session.first_spin_at == base
+        assert session.last_spin_at == base + timedelta(hours=1)
+    
+    def test_results_without_name_only_count_toward_session(self):
+        """Test that a missing name id is skipped for name rollups."""
+        session_id = uuid.uuid4()
+        batch = aggregate_results([make_record(session_id, None, datetime.now(UTC))])
+        assert batch.hourly == {}
+        assert batch.daily == {}
+        assert batch.sessions[session_id].spin_count == 1
+    
+    def test_counts_spins_per_user_agent(self):
+        """Test hourly and daily client counts, with unidentified agents under 0."""
+        session_id, name_id = uuid.uuid4(), uuid.uuid4()
+        base = datetime(2024, 5, 1, 10, 5, tzinfo=UTC)
+        records = [
+            make_record(session_id, name_id, base, user_agent_id=7),
+            make_record(session_id, name_id, base + timedelta(minutes=5), user_agent_id=7),
+            make_record(session_id, None, base + timedelta(hours=1), user_agent_id=7),
+            make_record(session_id, name_id, base),
+        ]
+        batch = aggregate_results(records)
+        first_hour = hour_bucket(base)
+        assert batch.clients_hourly == {
+            (first_hour, 7): 2,
+            (first_hour + timedelta(hours=1), 7): 1,
+            (first_hour, rollups.NO_USER_AGENT): 1,
+        }
+        assert batch.clients_daily == {
+            (date(2024, 5, 1), 7): 3,
+            (date(2024, 5, 1), rollups.NO_USER_AGENT): 1,
+        }
+
+
+class TestDurationSummary:
+    """Test statistics derived from rollup sums."""
+    
+    def test_from_sums(self):
+        """Test mean and standard deviation from sums."""
+        summary = DurationSummary.from_sums(3, 2, 4000, 10_000_000.0, 1000, 3000)
+        assert summary.spin_count == 3
+        assert summary.avg_duration_ms == 2000
+        assert summary.stddev_duration_ms == pytest.approx(1000)
+        assert summary.min_duration_ms == 1000
+    
+    def test_from_sums_without_durations(self):
+        """Test that missing durations leave statistics empty."""
+        summary = DurationSummary.from_sums(5, 0, 0, 0.0, None, None)
+        assert summary.avg_duration_ms is None
+        assert summary.stddev_duration_ms is None
@@ -0,0 +1,249 @@
+"""Tests for the in-memory roster cache."""
+
+import random
+import uuid
+
+import numpy as np
+import pytest
+
+from app.services import roster as roster_module
+from app.services.cache import MemoryCacheBackend
+from app.services.roster import PackedEntries, Roster, RosterCache, RosterEntry
+from app.services.roster_store import SharedRosterStore
+
+
+def make_entries(*weights: int) -> list[RosterEntry]:
+    """Build roster entries with the given weights."""
+    return [
+        RosterEntry(id=uuid.uuid4(), name=f"Name {i}", weight=w)
+        for i, w in enumerate(weights)
+    ]
+
+
+class TestRoster:
+    """Test Roster sampling and snapshots."""
+    
+    def test_roster_spin_returns_entry(self):
+        """Test that spinning returns one of the roster entries."""
+        entries = make_entries(1, 2, 3)
+        roster = Roster(entries, version=0)
+        assert roster.spin(random.Random(0)) in entries
+    
+    def test_empty_roster_cannot_spin(self):
+        """Test that an empty roster raises on spin."""
+        roster = Roster([], version=0)
+        assert len(roster) == 0
+        with pytest.raises(LookupError, match="No active names"):
+            roster.spin()
+    
+    def test_roster_snapshot_is_cached(self):
+        """Test that the snapshot is built once per roster."""
+        entries = make_entries(1, 1)
+        roster = Roster(entries, version=0)
+        snapshot = roster.snapshot()
+        assert snapshot is roster.snapshot()
+        assert snapshot[0] == {'id': str(entries[0].id), 'name': 'Name 0', 'weight': 1}
+    
+    
+    def test_roster_payload_round_trip(self):
+        """Test that a published roster restores without rebuilding."""
+        entries = make_entries(1, 5, 10)
+        roster = Roster(entries, version=3)
+        restored = Roster.from_payload(roster.to_payload(), version=3)
+        assert restored.entries == entries
+        assert restored.snapshot_key == roster.snapshot_key
+        assert restored.spin(random.Random(9)) == roster.spin(random.Random(9))
+    
+    def test_roster_snapshot_key_is_content_addressed(self):
+        """Test that equal rosters share a key regardless of order."""
+        entries = make_entries(1, 2, 3)
+        key = Roster(entries, version=0).snapshot_key
+        assert len(key) == 64
+        assert Roster(list(reversed(entries)), version=5).snapshot_key == key
+        assert Roster(entries[:2], version=0).snapshot_key != key
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Replace database access with an in-memory roster source."""
+    calls = []
+    
+    async def fake_load(db):
+        calls.append(db)
+        return make_entries(1, 2)
+    
+    async def fake_save(roster):
+        pass
+    
+    monkeypatch.setattr(roster_module, "load_active_entries", fake_load)
+    monkeypatch.setattr(roster_module, "save_snapshot", fake_save)
+    return calls
+
+
+class TestRosterCache:
+    """Test RosterCache versioning and cross-worker sharing."""
+    
+    @pytest.mark.asyncio
+    async def test_roster_cache_loads_once_per_version(self, loads):
+        """Test that the roster is only reloaded after a version bump."""
+        cache = RosterCache(MemoryCacheBackend(), check_interval=0)
+        
+        first = await cache.get(None)
+        assert await cache.get(None) is first
+        assert len(loads) == 1
+        
+        await cache.bump()
+        second = await cache.get(None)
+        assert second is not first
+        assert second.version == cache.version == 1
+        assert len(loads) == 2
+    
+    @pytest.mark.asyncio
+    async def test_workers_share_published_roster(self, loads):
+        """Test that a second worker reuses the published payload."""
+        backend = MemoryCacheBackend()
+        worker_a = RosterCache(backend, check_interval=0)
+        worker_b = RosterCache(backend, check_interval=0)
+        
+        roster_a = await worker_a.get(None)
+        roster_b = await worker_b.get(None)
+        assert len(loads) == 1
+        assert roster_b.entries == roster_a.entries
+        assert roster_b.snapshot_key == roster_a.snapshot_key
+        assert roster_b.spin(random.Random(3)) == roster_a.spin(random.Random(3))
+    
+    @pytest.mark.asyncio
+    async def test_stale_worker_reloads_after_bump(self, loads):
+        """Test that a bump in one worker is observed by the other."""
+        backend = MemoryCacheBackend()
+        worker_a = RosterCache(backend, check_interval=0)
+        worker_b = RosterCache(backend, check_interval=0)
+        await worker_b.get(None)
+        
+        await worker_a.bump()
+        roster = await worker_b.get(None)
+        assert roster.version == 1
+    
+    @pytest.mark.asyncio
+    async def test_version_checks_are_throttled(self, loads):
+        """Test that the shared version is not read on every call."""
+        backend = MemoryCacheBackend()
+        worker_a = RosterCache(backend, check_interval=0)
+        worker_b = RosterCache(backend, check_interval=60)
+        first = await worker_b.get(None)
+        
+        await worker_a.bump()
+        assert await worker_b.get(None) is first
+        
+        worker_b.invalidate()
+        assert (await worker_b.get(None)).version == 1
+    
+    @pytest.mark.asyncio
+    async def test_fresh_version_ignores_the_throttle(self):
+        """Test that validators see a bump made within the check interval."""
+        backend = MemoryCacheBackend()
+        worker_a = RosterCache(backend, check_interval=0)
+        worker_b = RosterCache(backend, check_interval=60)
+        assert await worker_b.current_version() == 0
+        
+        await worker_a.bump()
+        assert await worker_b.current_version() == 0
+        assert await worker_b.current_version(fresh=True) == 1
+
+
+class TestSharedRoster:
+    """Test the host-wide memory-mapped roster."""
+    
+    def test_packed_roster_round_trip(self, tmp_path):
+        """Test that a published roster samples and snapshots like the original."""
+        entries = make_entries(1, 5, 1000)
+        entries.append(RosterEntry(id=uuid.uuid4(), name="Zoë 😀", weight=7))
+        roster = Roster(entries, version=4)
+        shared = roster.publish(SharedRosterStore(tmp_path))
+        
+        assert isinstance(shared.entries, PackedEntries)
+        assert list(shared.entries) == entries
+        assert shared.entries[-1] == entries[-1]
+        assert shared.entries[1:3] == entries[1:3]
+        assert shared.version == 4
+        assert shared.snapshot_key == roster.snapshot_key
+        assert shared.spin(random.Random(5)) == roster.spin(random.Random(5))
+        rng_a, rng_b = np.random.default_rng(1), np.random.default_rng(1)
+        assert shared.spin_many(50, rng_a).tolist() == roster.spin_many(50, rng_b).tolist()
+        assert Roster.from_payload(shared.to_payload(), 4).entries == entries
+    
+    def test_empty_roster_can_be_published(self, tmp_path):
+        """Test that an empty roster publishes and still refuses to spin."""
+        shared = Roster([], version=1).publish(SharedRosterStore(tmp_path))
+        assert len(shared) == 0
+        with pytest.raises(LookupError):
+            shared.spin()
+    
+    def test_version_is_published_once_per_host(self, tmp_path):
+        """Test that a second publisher maps the existing file."""
+        store_a, store_b = SharedRosterStore(tmp_path), SharedRosterStore(tmp_path)
+        Roster(make_entries(1, 2), version=1).publish(store_a)
+        assert store_b.generation() == 1
+        Roster(make_entries(3), version=1).publish(store_b)
+        assert store_a.generation() == 1
+        assert [e.weight for e in Roster.from_packed(store_b.read()).entries] == [1, 2]
+        
+        Roster(make_entries(3), version=2).publish(store_b)
+        Roster(make_entries(4), version=3).publish(store_b)
+        assert store_a.read().version == 3
+        assert sorted(p.name for p in tmp_path.glob("roster-*.bin")) == [
+            "roster-2.bin", "roster-3.bin"
+        ]
+    
+    def test_stale_version_does_not_replace_newer_one(self, tmp_path):
+        """Test that a slow loader of an older version is not published."""
+        store = SharedRosterStore(tmp_path)
+        Roster(make_entries(1, 2), version=2).publish(store)
+        stale = Roster(make_entries(3), version=1)
+        assert stale.publish(store) is stale
+        assert store.generation() == 1
+        assert store.read().version == 2
+    
+    def test_missing_file_is_retried_on_next_read(self, tmp_path):
+        """Test that a generation whose file could not be opened is not remembered."""
+        Roster(make_entries(1), version=1).publish(SharedRosterStore(tmp_path))
+        store = SharedRosterStore(tmp_path)
+        path = tmp_path / "roster-1.bin"
+        path.rename(tmp_path / "held.bin")
+        assert store.read() is None
+        
+        (tmp_path / "held.bin").rename(path)
+        assert store.read().version == 1
+    
+    @pytest.mark.asyncio
+    async def test_unreadable_shared_store_falls_back_to_loading(self, loads, tmp_path):
+        """Test that a failing host-wide store does not fail spins."""
+        store = SharedRosterStore(tmp_path)
+        
+        def broken_read():
+            raise PermissionError("shared directory is not readable")
+        
+        store.read = broken_read
+        cache = RosterCache(MemoryCacheBackend(), check_interval=0, shared=store)
+        roster = await cache.get(None)
+        assert len(loads) == 1
+        assert roster.version == 0
+    
+    @pytest.mark.asyncio
+    async def test_workers_on_one_host_build_once(self, loads, tmp_path):
+        """Test that a sibling worker maps the roster instead of decoding it."""
+        backend = MemoryCacheBackend()
+        worker_a = RosterCache(backend, check_interval=0, shared=SharedRosterStore(tmp_path))
+        worker_b = RosterCache(backend, check_interval=0, shared=SharedRosterStore(tmp_path))
+        
+        roster_a = await worker_a.get(None)
+        await backend.delete(RosterCache.PAYLOAD_KEY.format(version=0))
+        roster_b = await worker_b.get(None)
+        assert len(loads) == 1
+        assert isinstance(roster_b.entries, PackedEntries)
+        assert list(roster_b.entries) == list(roster_a.entries)
+        
+        await worker_a.bump()
+        await worker_a.get(None)
+        assert (await worker_b.get(None)).version == 1
+        assert len(loads) == 2
@@ -0,0 +1,126 @@
+"""Tests for alias table and Fenwick tree sampling."""
+
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from app.services.sampler import AliasTable, FenwickTree
+
+
+class TestAliasTable:
+    """Test AliasTable construction and sampling."""
+    
+    def test_alias_table_rejects_empty_weights(self):
+        """Test that an empty weight list is rejected."""
+        with pytest.raises(ValueError, match="at least one weight"):
+            AliasTable([])
+    
+    def test_alias_table_rejects_non_positive_total(self):
+        """Test that all-zero weights are rejected."""
+        with pytest.raises(ValueError, match="must be positive"):
+            AliasTable([0, 0])
+    
+    def test_alias_table_single_weight(self):
+        """Test that a single outcome is always selected."""
+        table = AliasTable([7])
+        rng = random.Random(1)
+        assert all(table.sample(rng) == 0 for _ in range(100))
+    
+    def test_alias_table_columns_preserve_total_probability(self):
+        """Test that the table encodes exactly the normalized weights."""
+        weights = [1, 5, 100, 3, 1000, 42]
+        table = AliasTable(weights)
+        size = len(weights)
+        total = sum(weights)
+        
+        recovered = [0.0] * size
+        for column in range(size):
+            recovered[column] += table.prob[column] / size
+            recovered[table.alias[column]] += (1.0 - table.prob[column]) / size
+        
+        for index, weight in enumerate(weights):
+            assert recovered[index] == pytest.approx(weight / total)
+    
+    def test_alias_table_sampling_follows_weights(self):
+        """Test that empirical frequencies match the weights."""
+        weights = [1, 2, 7]
+        table = AliasTable(weights)
+        rng = random.Random(42)
+        draws = 100_000
+        counts = Counter(table.sample(rng) for _ in range(draws))
+        
+        for index, weight in enumerate(weights):
+            assert counts[index] / draws == pytest.approx(weight / 10, abs=0.01)
+    
+    def test_alias_table_sample_many_follows_weights(self):
+        """Test that vectorized draws match the weights."""
+        weights = [1, 2, 7]
+        table = AliasTable(weights)
+        picks = table.sample_many(100_000, np.random.default_rng(42))
+        
+        assert picks.shape == (100_000,)
+        assert picks.min() >= 0 and picks.max() < len(weights)
+        frequencies = np.bincount(picks, minlength=len(weights)) / len(picks)
+        for index, weight in enumerate(weights):
+            assert frequencies[index] == pytest.approx(weight / 10, abs=0.01)
+    
+    def test_alias_table_sample_many_rejects_negative_count(self):
+        """Test that a negative sample count is rejected."""
+        with pytest.raises(ValueError, match="cannot be negative"):
+            AliasTable([1]).sample_many(-1)
+    
+    def test_alias_table_from_arrays(self):
+        """Test that a table restored from its columns samples identically."""
+        table = AliasTable([3, 1, 4, 1, 5])
+        restored = AliasTable.from_arrays(table.prob, table.alias)
+        assert len(restored) == len(table)
+        assert [restored.sample(random.Random(i)) for i in range(50)] == [
+            table.sample(random.Random(i)) for i in range(50)
+        ]
+        
+        with pytest.raises(ValueError, match="equal length"):
+            AliasTable.from_arrays([1.0], [0, 1])
+
+
+class TestFenwickTree:
+    """Test FenwickTree prefix search and sampling without replacement."""
+    
+    def test_find_maps_values_to_weight_ranges(self):
+        """Test that each index owns a range as wide as its weight."""
+        tree = FenwickTree([1, 0, 3, 2, 5])
+        assert tree.total == 11
+        assert [tree.find(v) for v in range(tree.total)] == [0, 2, 2, 2, 3, 3, 4, 4, 4, 4, 4]
+        with pytest.raises(ValueError):
+            tree.find(11)
+    
+    def test_update_and_remove(self):
+        """Test that weight changes are reflected in later searches."""
+        tree = FenwickTree([1, 2, 3])
+        tree.remove(1)
+        tree.update(0, 4)
+        assert tree.total == 7
+        assert tree.weight(1) == 0
+        assert [tree.find(v) for v in range(tree.total)] == [0] * 4 + [2] * 3
+    
+    def test_draw_without_replacement_exhausts_all(self):
+        """Test that removing every pick returns each index exactly once."""
+        tree = FenwickTree([5, 1, 1, 3, 2, 8, 1])
+        rng = random.Random(3)
+        picks = []
+        while tree.total:
+            index = tree.sample(rng)
+            picks.append(index)
+            tree.remove(index)
+        assert sorted(picks) == list(range(7))
+        with pytest.raises(LookupError):
+            tree.sample(rng)
+    
+    def test_sampling_follows_weights(self):
+        """Test that draws are proportional to weight."""
+        tree = FenwickTree([1, 3, 6])
+        rng = random.Random(7)
+        counts = Counter(tree.sample(rng) for _ in range(30000))
+        assert counts[0] / 30000 == pytest.approx(0.1, abs=0.01)
+        assert counts[2] / 30000 == pytest.approx(0.6, abs=0.015)
@@ -0,0 +1,217 @@
+"""Tests for HyperLogLog and t-digest sketches."""
+
+import uuid
+from datetime import UTC, date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.services.result_writer import build_result_record
+from app.services.rollups import aggregate_results
+from app.services.sketches import (
+    HOURLY_SKETCHES,
+    BucketSketches,
+    HyperLogLog,
+    TDigest,
+    apply_sketches,
+    compression_for_error,
+    daily_sketches,
+    merge_all,
+    precision_for_error,
+)
+
+
+@pytest.fixture(scope="module")
+def ids():
+    """Distinct values shared by the HyperLogLog tests."""
+    return [uuid.uuid4() for _ in range(50_000)]
+
+
+class TestHyperLogLog:
+    """Test distinct counting."""
+    
+    def test_count_within_error(self, ids):
+        """Test that large cardinalities are estimated within a few standard errors."""
+        sketch = HyperLogLog(14)
+        sketch.add(ids)
+        sketch.add(ids[:1000])  # duplicates do not count
+        assert abs(sketch.count() / len(ids) - 1) < 3 * sketch.standard_error
+    
+    def test_small_counts_are_nearly_exact(self, ids):
+        """Test the linear-counting range."""
+        sketch = HyperLogLog(14)
+        sketch.add([*ids[:100], None])
+        # Values sharing a register lose one each; more than five is vanishingly rare
+        assert abs(sketch.count() - 100) <= 5
+        assert HyperLogLog(14).count() == 0
+    
+    def test_merge_is_union(self, ids):
+        """Test that merging overlapping sketches counts each value once."""
+        left, right, union = HyperLogLog(12), HyperLogLog(12), HyperLogLog(12)
+        left.add(ids[:30_000])
+        right.add(ids[20_000:])
+        union.add(ids)
+        assert np.array_equal(left.merge(right).registers, union.registers)
+    
+    def test_fold_matches_sketch_built_at_lower_precision(self, ids):
+        """Test that folding loses nothing beyond the lower precision."""
+        high, low = HyperLogLog(14), HyperLogLog(10)
+        high.add(ids[:5000])
+        low.add(ids[:5000])
+        assert np.array_equal(high.fold(10).registers, low.registers)
+        assert high.merge(HyperLogLog(10)).precision == 10
+    
+    def test_round_trip_is_compact(self, ids):
+        """Test serialization, with sparse sketches compressing well."""
+        sketch = HyperLogLog(14)
+        sketch.add(ids[:20])
+        data = sketch.to_bytes()
+        assert len(data) < 500
+        restored = HyperLogLog.from_bytes(data)
+        assert restored.precision == 14
+        assert np.array_equal(restored.registers, sketch.registers)
+        with pytest.raises(ValueError):
+            HyperLogLog.from_bytes(TDigest().to_bytes())
+
+
+class TestTDigest:
+    """Test approximate quantiles."""
+    
+    @pytest.fixture
+    def values(self):
+        return np.random.default_rng(7).lognormal(8, 0.5, 100_000)
+    
+    def test_quantiles_of_merged_digests(self, values):
+        """Test that many merged chunks keep quantile rank error small."""
+        merged = TDigest(200)
+        for chunk in np.array_split(values, 100):
+            digest = TDigest(200)
+            digest.add(chunk)
+            merged = merged.merge(digest)
+        
+        assert merged.count == len(values)
+        assert len(merged.means) <= 200
+        qs = [0.001, 0.01, 0.5, 0.9, 0.99, 0.999]
+        for q, estimate in zip(qs, merged.quantiles(qs)):
+            assert abs((values < estimate).mean() - q) < 0.002
+        assert merged.quantiles([0, 1]) == [values.min(), values.max()]
+    
+    def test_round_trip(self, values):
+        """Test serialization of centroids and extremes."""
+        digest = TDigest(100)
+        digest.add(values[:1000])
+        restored = TDigest.from_bytes(digest.to_bytes())
+        assert restored.compression == 100
+        assert restored.quantiles([0.1, 0.5, 0.9]) == digest.quantiles([0.1, 0.5, 0.9])
+    
+    def test_empty_digest(self):
+        """Test that an empty digest has no quantiles."""
+        digest = TDigest()
+        digest.add([])
+        assert digest.count == 0
+        with pytest.raises(ValueError):
+            digest.quantiles([0.5])
+
+
+class TestAccuracy:
+    """Test the mapping from a requested error to sketch parameters."""
+    
+    def test_precision_for_error(self):
+        """Test that the chosen precision meets the error, capped at what is stored."""
+        assert precision_for_error(0.01, 14) == 14
+        assert precision_for_error(0.05, 14) == 9
+        assert 1.04 / (2 ** 9) ** 0.5 <= 0.05
+        assert precision_for_error(0.5, 14) == 4
+    
+    def test_compression_for_error(self):
+        """Test compression bounds."""
+        assert compression_for_error(0.001, 200) == 200
+        assert compression_for_error(0.02, 200) == 50
+        assert compression_for_error(0.5, 200) == 20
+    
+    def test_merge_all_at_lower_accuracy(self, ids):
+        """Test that stored rows are folded to the requested accuracy."""
+        bucket = BucketSketches()
+        bucket.users.add(ids[:1000])
+        bucket.durations.add([100, 200, 300])
+        rows = [bucket.to_row(), (None, None, None, None)]
+        merged = merge_all(rows, precision=10, compression=50)
+        assert merged.users.precision == 10
+        assert merged.durations.compression == 50
+        assert merged.durations.count == 3
+        assert merged.ips.count() == 0
+
+
+class TestSketchMaintenance:
+    """Test that written results feed the bucket sketches."""
+    
+    def test_aggregate_collects_sketch_inputs(self):
+        """Test raw values grouped per hour, including results without a name."""
+        base = datetime(2024, 5, 1, 10, 5, tzinfo=UTC)
+        user, session = uuid.uuid4(), uuid.uuid4()
+        records = [
+            build_result_record(
+                session_id=session,
+                selected_name_id=name_id,
+                selected_name_snapshot={},
+                roster_snapshot_key="a" * 64,
+                created_at=created_at,
+                spin_duration_ms=duration,
+                user_id=user_id,
+                user_ip=ip,
+            )
+            for name_id, created_at, duration, user_id, ip in [
+                (uuid.uuid4(), base, 1000, user, "10.0.0.1"),
+                (None, base + timedelta(minutes=1), None, None, "10.0.0.2"),
+                (uuid.uuid4(), base + timedelta(hours=1), 2000, user, None),
+            ]
+        ]
+        batch = aggregate_results(records)
+        hour = base.replace(minute=0)
+        assert sorted(batch.sketches) == [hour, hour + timedelta(hours=1)]
+        first = batch.sketches[hour]
+        assert first.users == [user, None]
+        assert first.ips == ["10.0.0.1", "10.0.0.2"]
+        assert first.sessions == [session, session]
+        assert first.durations == [1000]
+        
+        hourly = {key: values.sketch() for key, values in batch.sketches.items()}
+        daily = daily_sketches(hourly)
+        assert list(daily) == [date(2024, 5, 1)]
+        assert round(daily[date(2024, 5, 1)].users.count()) == 1
+        assert daily[date(2024, 5, 1)].durations.count == 2
+    
+    @pytest.mark.asyncio
+    async def test_apply_merges_into_stored_rows(self, ids):
+        """Test create, lock in key order, and rewrite of one shard's bucket rows."""
+        hours = [datetime(2024, 5, 1, h, tzinfo=UTC) for h in (11, 10)]
+        existing = BucketSketches()
+        existing.users.add(ids[:10])
+        
+        class FakeDriver:
+            def __init__(self):
+                self.calls = []
+            
+            async def execute(self, sql, keys, shard):
+                self.calls.append(("execute", keys, shard))
+            
+            async def fetch(self, sql, keys, shard):
+                self.calls.append(("fetch", keys, shard))
+                return [(hours[1], *existing.to_row()), (hours[0], None, None, None, None)]
+            
+            async def executemany(self, sql, rows):
+                self.calls.append(("executemany", rows))
+        
+        new = {hour: BucketSketches() for hour in hours}
+        for sketches in new.values():
+            sketches.users.add(ids[5:15])
+        driver = FakeDriver()
+        await apply_sketches(driver, HOURLY_SKETCHES, new, shard=3)
+        
+        ordered = sorted(hours)
+        assert driver.calls[0] == ("execute", ordered, 3)
+        assert driver.calls[1] == ("fetch", ordered, 3)
+        rows = driver.calls[2][1]
+        assert [row[:2] for row in rows] == [(hour, 3) for hour in ordered]
+        counts = [round(BucketSketches.from_row(*row[2:]).users.count()) for row in rows]
+        assert counts == [15, 10]
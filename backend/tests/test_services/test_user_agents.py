@@ -0,0 +1,134 @@
+"""Tests for user agent interning."""
+
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.services.user_agents import (
+    ParsedUserAgent,
+    UserAgentCache,
+    normalize_user_agent,
+    parse_user_agent,
+)
+
+CHROME_WINDOWS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+EDGE_WINDOWS = CHROME_WINDOWS + " Edg/120.0.2210.91"
+SAFARI_IPHONE = (
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_1_2 like Mac OS X) AppleWebKit/605.1.15 "
+    "(KHTML, like Gecko) Version/17.1.2 Mobile/15E148 Safari/604.1"
+)
+SAFARI_IPAD = (
+    "Mozilla/5.0 (iPad; CPU OS 16_6 like Mac OS X) AppleWebKit/605.1.15 "
+    "(KHTML, like Gecko) Version/16.6 Mobile/15E148 Safari/604.1"
+)
+FIREFOX_MAC = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:121.0) Gecko/20100101 Firefox/121.0"
+)
+CHROME_ANDROID_TABLET = (
+    "Mozilla/5.0 (Linux; Android 13; SM-X700) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
+)
+GOOGLEBOT = "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)"
+
+
+class TestParseUserAgent:
+    """Test the browser, OS and device parse stored per agent."""
+    
+    @pytest.mark.parametrize("user_agent, expected", [
+        (CHROME_WINDOWS, ParsedUserAgent("Chrome", "120.0.0.0", "Windows", "10", "desktop")),
+        (EDGE_WINDOWS, ParsedUserAgent("Edge", "120.0.2210.91", "Windows", "10", "desktop")),
+        (SAFARI_IPHONE, ParsedUserAgent("Safari", "17.1.2", "iOS", "17.1.2", "mobile")),
+        (SAFARI_IPAD, ParsedUserAgent("Safari", "16.6", "iPadOS", "16.6", "tablet")),
+        (FIREFOX_MAC, ParsedUserAgent("Firefox", "121.0", "macOS", "10.15", "desktop")),
+        (CHROME_ANDROID_TABLET, ParsedUserAgent("Chrome", "119.0.0.0", "Android", "13", "tablet")),
+        (GOOGLEBOT, ParsedUserAgent("Googlebot", "2.1", None, None, "bot")),
+        ("curl/8.4.0", ParsedUserAgent("curl", "8.4.0", None, None, "bot")),
+        ("roulette-benchmark/1.0", ParsedUserAgent(None, None, None, None, "other")),
+    ])
+    def test_parse(self, user_agent, expected):
+        """Test common agents, including browsers that embed Chrome's token."""
+        assert parse_user_agent(user_agent) == expected
+    
+    def test_fields_fit_their_columns(self):
+        """Test that long versions are clipped."""
+        parsed = parse_user_agent("Firefox/" + "1" * 100)
+        assert parsed.browser_version == "1" * 32
+
+
+class TestNormalizeUserAgent:
+    """Test the cleanup applied before interning."""
+    
+    def test_whitespace_is_collapsed(self):
+        """Test that spellings differing only in whitespace are one agent."""
+        assert normalize_user_agent(" curl/8.4.0 \t ") == "curl/8.4.0"
+        assert normalize_user_agent(CHROME_WINDOWS.replace(" ", "  ")) == CHROME_WINDOWS
+        assert normalize_user_agent("   ") is None
+        assert normalize_user_agent(None) is None
+    
+    def test_length_is_capped(self):
+        """Test that oversized headers are cut to the configured length."""
+        normalized = normalize_user_agent("x" * (settings.user_agent_max_length + 100))
+        assert len(normalized) == settings.user_agent_max_length
+
+
+class TestUserAgentCache:
+    """Test the string to id LRU in front of the dimension table."""
+    
+    @pytest.fixture
+    def cache(self, monkeypatch):
+        cache = UserAgentCache(maxsize=2)
+        cache.resolved = []
+        
+        async def resolve(user_agent):
+            cache.resolved.append(user_agent)
+            await asyncio.sleep(0)
+            agent_id = len(cache.resolved)
+            cache.put(user_agent, agent_id)
+            return agent_id
+        
+        monkeypatch.setattr(cache, "_resolve", resolve)
+        return cache
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_lookup(self, cache):
+        """Test that one agent is resolved once and then served from memory."""
+        ids = await asyncio.gather(*(cache.intern(CHROME_WINDOWS) for _ in range(10)))
+        assert ids == [1] * 10
+        assert await cache.intern(CHROME_WINDOWS) == 1
+        assert cache.resolved == [CHROME_WINDOWS]
+        assert await cache.intern(None) is None
+        assert await cache.intern("") is None
+    
+    @pytest.mark.asyncio
+    async def test_agents_are_interned_normalized(self, cache):
+        """Test that spelling variants share one dimension row."""
+        assert await cache.intern(f"  {FIREFOX_MAC}") == await cache.intern(FIREFOX_MAC)
+        assert cache.resolved == [FIREFOX_MAC]
+    
+    @pytest.mark.asyncio
+    async def test_least_recently_used_is_evicted(self, cache):
+        """Test that the cache stays within its size."""
+        await cache.intern(CHROME_WINDOWS)
+        await cache.intern(FIREFOX_MAC)
+        await cache.intern(CHROME_WINDOWS)
+        await cache.intern(GOOGLEBOT)
+        assert len(cache) == 2
+        await cache.intern(CHROME_WINDOWS)
+        await cache.intern(FIREFOX_MAC)
+        assert cache.resolved == [CHROME_WINDOWS, FIREFOX_MAC, GOOGLEBOT, FIREFOX_MAC]
+    
+    @pytest.mark.asyncio
+    async def test_failed_lookup_records_no_agent(self, monkeypatch):
+        """Test that spins go ahead without an agent when the database fails."""
+        cache = UserAgentCache()
+        
+        async def fail(user_agent):
+            raise ConnectionError("database unavailable")
+        
+        monkeypatch.setattr(cache, "_resolve", fail)
+        assert await cache.intern(CHROME_WINDOWS) is None
+        assert len(cache) == 0
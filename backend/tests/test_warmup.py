@@ -0,0 +1,43 @@
+"""Tests for worker warm-up and readiness."""
+
+import asyncio
+
+from sqlalchemy.dialects import postgresql
+
+from app import warmup
+from app.warmup import Readiness, hot_queries
+
+
+class TestReadiness:
+    """Test background warm-up and readiness reporting."""
+    
+    async def test_ready_after_failed_attempts(self, monkeypatch):
+        """Test that failed warm-ups are retried until one succeeds."""
+        attempts = []
+        
+        async def flaky_warm_up():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise OSError("database not up yet")
+        
+        monkeypatch.setattr(warmup, "warm_up", flaky_warm_up)
+        readiness = Readiness(retry_interval=0)
+        await readiness.start()
+        assert not readiness.ready
+        for _ in range(20):
+            if readiness.ready:
+                break
+            await asyncio.sleep(0.01)
+        
+        assert readiness.ready
+        assert len(attempts) == 3
+        await readiness.stop()
+        assert not readiness.ready
+    
+    def test_hot_queries_bind_their_limits(self):
+        """Test that page sizes are parameters so warmed SQL matches requests."""
+        paged = [stmt for stmt in hot_queries() if stmt._limit_clause is not None]
+        assert paged
+        for stmt in paged:
+            sql = str(stmt.compile(dialect=postgresql.asyncpg.dialect()))
+            assert "LIMIT $" in sql